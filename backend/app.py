@@ -8,6 +8,9 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from config import Config
 from database import db
+from services.circuit_breaker import circuit_breakers
+from services.platform_clients import platform_clients
+from services.rate_limiter import rate_limiter
 import os
 
 # Import routes
@@ -16,6 +19,8 @@ from routes.user_routes import user_bp
 from routes.case_routes import case_bp
 from routes.report_routes import report_bp
 from routes.admin_routes import admin_bp
+from routes.job_routes import job_bp
+from routes.watchlist_routes import watchlist_bp
 
 def create_app():
     """Application factory pattern"""
@@ -33,6 +38,13 @@ def create_app():
     # Initialize database connection
     db.init_app(app)
     
+    # Configure shared scraping rate limits
+    rate_limiter.init_app(app)
+    circuit_breakers.init_app(app)
+    
+    # Build real-scraping API clients once per process
+    platform_clients.init_app(app)
+    
     # Create upload directories
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     os.makedirs(app.config['REPORT_FOLDER'], exist_ok=True)
@@ -43,6 +55,8 @@ def create_app():
     app.register_blueprint(case_bp, url_prefix='/api/cases')
     app.register_blueprint(report_bp, url_prefix='/api/reports')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
+    app.register_blueprint(job_bp, url_prefix='/api/jobs')
+    app.register_blueprint(watchlist_bp, url_prefix='/api/watchlist')
     
     # Health check endpoint
     @app.route('/api/health', methods=['GET'])
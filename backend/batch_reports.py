@@ -0,0 +1,77 @@
+"""
+Batch Report Script
+Generates encrypted reports for many cases in parallel, e.g. weekly report packs
+Reports are recorded for the given investigator; a manifest of file hashes is written to reports/manifests
+
+The password is read from REPORT_BATCH_PASSWORD or prompted for; it is never passed on the command line
+    python batch_reports.py --email investigator@agency.gov --status active --workers 8
+    python batch_reports.py --email investigator@agency.gov --cases <id>,<id>
+"""
+
+import argparse
+import getpass
+import json
+import os
+import sys
+from app import create_app
+from models.case import Case
+from models.user import User
+from services.batch_report_service import BatchReportService
+
+def read_password():
+    password = os.getenv('REPORT_BATCH_PASSWORD')
+    if password:
+        return password
+    password = getpass.getpass('Report encryption password: ')
+    if password != getpass.getpass('Repeat password: '):
+        sys.exit('❌ Passwords do not match')
+    return password
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate reports for many cases in parallel')
+    parser.add_argument('--email', required=True, help='Investigator the reports are generated for')
+    parser.add_argument('--cases', default=None, help='Comma-separated case IDs (default: all of the investigator\'s cases)')
+    parser.add_argument('--status', default=None, help='Only cases with this status, e.g. active')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: REPORT_BATCH_MAX_WORKERS)')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        user = User.find_by_email(args.email)
+        if not user:
+            sys.exit(f"❌ No user with email {args.email}")
+        user_id = str(user['_id'])
+
+        if args.cases:
+            cases = [Case.find_by_id(case_id.strip(), include_posts=False) for case_id in args.cases.split(',')]
+            if None in cases:
+                sys.exit('❌ Unknown case ID')
+            if user.get('role') != 'admin' and any(case['investigator_id'] != user_id for case in cases):
+                sys.exit(f"❌ Not all cases belong to {args.email}")
+        else:
+            cases = Case.find_by_investigator(user_id, include_posts=False)
+        if args.status:
+            cases = [case for case in cases if case.get('status') == args.status]
+        # Cases without collected data cannot be reported on
+        cases = [case for case in cases if case.get('data_collected')]
+        if not cases:
+            sys.exit('ℹ️  No cases with collected data to report on')
+
+        password = read_password()
+        service = BatchReportService(max_workers=args.workers)
+        print(f"📄 Generating {len(cases)} reports with up to {service.max_workers} worker processes...")
+
+        def progress(update):
+            print(f"   {update['completed']}/{update['total']}", end='\r', flush=True)
+
+        manifest, manifest_path, manifest_hash = service.generate(cases, user_id, password, progress=progress)
+
+    for entry in manifest['reports']:
+        if entry['status'] != 'ok':
+            print(f"⚠️  {entry['case_id']} ({entry.get('target_username')}): {entry['error']}")
+    print(json.dumps(manifest['totals'], indent=2))
+    print(f"✅ Manifest: {manifest_path}")
+    print(f"   SHA-256: {manifest_hash}")
+
+if __name__ == "__main__":
+    main()
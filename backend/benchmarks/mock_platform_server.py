@@ -0,0 +1,452 @@
+"""
+Mock Platform API Server
+Local stand-in for the Twitter v2, Reddit and Instagram endpoints the scraping SDKs call
+Serves synthetic posts with pagination, rate-limit headers, injected latency and errors
+
+Run from the backend folder:
+    python -m benchmarks.mock_platform_server --port 8089
+and point the app at it with SCRAPE_MOCK_BASE_URL=http://127.0.0.1:8089
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from services.synthetic_data import SyntheticDataGenerator
+
+# Instaloader fetches posts in pages of 12
+INSTAGRAM_PAGE_SIZE = 12
+
+
+def _stable_int(*parts):
+    digest = hashlib.sha256('|'.join(str(part) for part in parts).encode('utf-8')).digest()
+    return int.from_bytes(digest[:6], 'big')
+
+
+def _base36(number):
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    result = ''
+    while True:
+        number, remainder = divmod(number, 36)
+        result = digits[remainder] + result
+        if number == 0:
+            return result
+
+
+def _parse_time(value):
+    """Parse an API time parameter (ISO-8601, optionally with Z) as naive UTC"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class MockAccount:
+    """One synthetic account: profile numbers plus its posts, newest first"""
+
+    def __init__(self, platform, username, seed, num_posts):
+        self.platform = platform
+        self.username = username
+        self.user_id = str(10 ** 9 + _stable_int(seed, platform, username))
+
+        generator = SyntheticDataGenerator(
+            seed=_stable_int(seed, platform, username, 'posts'),
+            platform='reddit' if platform == 'reddit' else 'twitter',
+            timestamp_distribution='recent',
+            accounts=1
+        )
+        account = generator.accounts()[0]
+        self.followers = account['followers']
+        self.following = account['following']
+        self.verified = account['verified']
+        self.created_utc = int(datetime(2024, 1, 1).timestamp()) - account['account_age_days'] * 86400
+
+        posts = sorted(generator.iter_posts(num_posts), key=lambda post: post['timestamp'], reverse=True)
+        # Newer posts get larger numeric ids, as on the real platforms
+        for rank, post in enumerate(posts):
+            # Kept well inside int64, like real tweet ids
+            post['numeric_id'] = (int(self.user_id) % 10 ** 9) * 10 ** 6 + (len(posts) - rank)
+            post['created'] = datetime.fromisoformat(post['timestamp'])
+        self.posts = posts
+
+
+class MockPlatformServer:
+    """Threaded HTTP server holding the mock platform state"""
+
+    def __init__(self, host='127.0.0.1', port=0, seed=0, posts_per_user=500,
+                 latency_ms=0, latency_jitter_ms=0, error_rate=0.0,
+                 rate_limit=None, rate_window=60):
+        self.seed = seed
+        self.posts_per_user = posts_per_user
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+
+        self._accounts = {}
+        self._by_id = {}
+        self._windows = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.stats = {'requests': 0, 'errors_injected': 0, 'throttled': 0, 'by_route': {}}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve on a background thread; returns the base URL"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def account(self, platform, username):
+        key = (platform, username.lower())
+        with self._lock:
+            if key not in self._accounts:
+                account = MockAccount(platform, username.lower(), self.seed, self.posts_per_user)
+                self._accounts[key] = account
+                self._by_id[(platform, account.user_id)] = account
+            return self._accounts[key]
+
+    def account_by_id(self, platform, user_id):
+        """Accounts are looked up by id after the profile request created them"""
+        with self._lock:
+            return self._by_id.get((platform, user_id))
+
+    def admit(self, platform, route):
+        """
+        Apply rate limiting, latency and error injection to one request
+        Returns (status, headers); status is None when the request should be served
+        """
+        now = time.time()
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['by_route'][route] = self.stats['by_route'].get(route, 0) + 1
+
+            window_start, used = self._windows.get(platform, (now, 0))
+            if now - window_start >= self.rate_window:
+                window_start, used = now, 0
+            used += 1
+            self._windows[platform] = (window_start, used)
+            reset_in = max(0, window_start + self.rate_window - now)
+
+            inject_error = self.error_rate and self._random.random() < self.error_rate
+            delay = (self.latency_ms + self._random.uniform(0, self.latency_jitter_ms)) / 1000.0
+
+        headers = {}
+        if self.rate_limit:
+            remaining = max(0, self.rate_limit - used)
+            if platform == 'twitter':
+                headers.update({
+                    'x-rate-limit-limit': str(self.rate_limit),
+                    'x-rate-limit-remaining': str(remaining),
+                    'x-rate-limit-reset': str(int(window_start + self.rate_window))
+                })
+            else:
+                headers.update({
+                    'x-ratelimit-used': str(used),
+                    'x-ratelimit-remaining': str(remaining),
+                    'x-ratelimit-reset': str(int(reset_in))
+                })
+            if used > self.rate_limit:
+                with self._lock:
+                    self.stats['throttled'] += 1
+                headers['Retry-After'] = str(max(1, int(reset_in)))
+                return 429, headers
+
+        if delay:
+            time.sleep(delay)
+
+        if inject_error:
+            with self._lock:
+                self.stats['errors_injected'] += 1
+            return 503, headers
+
+        return None, headers
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(MockPlatformHandler):
+            mock = server
+
+        return Handler
+
+
+class MockPlatformHandler(BaseHTTPRequestHandler):
+    """Routes /<platform>/<api path> requests to the platform emulations"""
+
+    mock = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self._dispatch()
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _dispatch(self):
+        parsed = urlparse(self.path)
+        parts = [part for part in parsed.path.split('/') if part]
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        if not parts:
+            return self._send_json(404, {'error': 'Not found'})
+
+        platform, path = parts[0], parts[1:]
+        routes = {
+            'twitter': self._twitter,
+            'reddit': self._reddit,
+            'instagram': self._instagram
+        }
+        if platform not in routes:
+            return self._send_json(404, {'error': 'Unknown platform'})
+
+        route = f"{platform}:{'/'.join(path[:2])}"
+        status, headers = self.mock.admit(platform, route)
+        if status is not None:
+            return self._send_json(status, {'error': 'Too Many Requests' if status == 429 else 'Service Unavailable'}, headers)
+
+        try:
+            status, body = routes[platform](path, params)
+        except (KeyError, ValueError) as e:
+            status, body = 400, {'error': str(e)}
+        self._send_json(status, body, headers)
+
+    # Twitter API v2 (tweepy.Client)
+
+    def _twitter(self, path, params):
+        if path[:3] == ['2', 'users', 'by'] and len(path) == 5 and path[3] == 'username':
+            account = self.mock.account('twitter', path[4])
+            return 200, {'data': {
+                'id': account.user_id,
+                'username': account.username,
+                'name': account.username.title(),
+                'description': f"Synthetic account {account.username}",
+                'location': 'Unknown',
+                'verified': account.verified,
+                'created_at': datetime.utcfromtimestamp(account.created_utc).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                'public_metrics': {
+                    'followers_count': account.followers,
+                    'following_count': account.following,
+                    'tweet_count': len(account.posts),
+                    'listed_count': 0
+                }
+            }}
+
+        if path[:2] == ['2', 'users'] and len(path) == 4 and path[3] == 'tweets':
+            account = self.mock.account_by_id('twitter', path[2])
+            if account is None:
+                return 404, {'errors': [{'message': 'User not found'}]}
+
+            posts = account.posts
+            since_id = int(params['since_id']) if params.get('since_id') else None
+            start_time = _parse_time(params.get('start_time'))
+            end_time = _parse_time(params.get('end_time'))
+            if since_id or start_time or end_time:
+                posts = [
+                    post for post in posts
+                    if (since_id is None or post['numeric_id'] > since_id)
+                    and (start_time is None or post['created'] >= start_time)
+                    and (end_time is None or post['created'] <= end_time)
+                ]
+
+            offset = int(params.get('pagination_token') or 0)
+            limit = max(5, min(100, int(params.get('max_results') or 10)))
+            page = posts[offset:offset + limit]
+            meta = {'result_count': len(page)}
+            if offset + limit < len(posts):
+                meta['next_token'] = str(offset + limit)
+            if page:
+                meta['newest_id'] = str(page[0]['numeric_id'])
+                meta['oldest_id'] = str(page[-1]['numeric_id'])
+
+            body = {'meta': meta}
+            if page:
+                body['data'] = [{
+                    'id': str(post['numeric_id']),
+                    'text': post['content'],
+                    'created_at': post['created'].strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                    'public_metrics': {
+                        'like_count': post['likes'],
+                        'reply_count': post['comments'],
+                        'retweet_count': post['shares'],
+                        'quote_count': 0
+                    },
+                    'entities': {'hashtags': [{'tag': tag.lstrip('#')} for tag in post['hashtags']]}
+                } for post in page]
+            return 200, body
+
+        return 404, {'errors': [{'message': 'Unsupported endpoint'}]}
+
+    # Reddit (praw / prawcore)
+
+    def _reddit(self, path, params):
+        if path == ['api', 'v1', 'access_token']:
+            return 200, {'access_token': 'mock-token', 'token_type': 'bearer', 'expires_in': 86400, 'scope': '*'}
+
+        if len(path) >= 3 and path[0] == 'user':
+            account = self.mock.account('reddit', path[1])
+            if path[2] == 'about':
+                return 200, {'kind': 't2', 'data': {
+                    'id': _base36(int(account.user_id)),
+                    'name': account.username,
+                    'created_utc': float(account.created_utc),
+                    'link_karma': account.followers,
+                    'comment_karma': account.following,
+                    'total_karma': account.followers + account.following,
+                    'is_gold': account.verified,
+                    'is_mod': False,
+                    'verified': account.verified,
+                    'has_verified_email': True,
+                    'icon_img': ''
+                }}
+
+            if path[2] == 'submitted':
+                posts = account.posts
+                offset = 0
+                after = params.get('after')
+                if after:
+                    ids = [f"t3_{_base36(post['numeric_id'])}" for post in posts]
+                    offset = ids.index(after) + 1 if after in ids else len(posts)
+                limit = max(1, min(100, int(params.get('limit') or 25)))
+                page = posts[offset:offset + limit]
+
+                children = [{'kind': 't3', 'data': {
+                    'id': _base36(post['numeric_id']),
+                    'name': f"t3_{_base36(post['numeric_id'])}",
+                    'title': post['content'],
+                    'selftext': '',
+                    'created_utc': post['created'].replace(tzinfo=timezone.utc).timestamp(),
+                    'subreddit': post['subreddit'][2:],
+                    'author': account.username,
+                    'score': post['likes'],
+                    'num_comments': post['comments'],
+                    'total_awards_received': post['awards'] or 0,
+                    'url': f"https://www.reddit.com/{post['subreddit']}/comments/{_base36(post['numeric_id'])}/",
+                    'permalink': f"/{post['subreddit']}/comments/{_base36(post['numeric_id'])}/"
+                }} for post in page]
+                next_after = children[-1]['data']['name'] if children and offset + limit < len(posts) else None
+                return 200, {'kind': 'Listing', 'data': {
+                    'after': next_after, 'before': None, 'dist': len(children), 'children': children
+                }}
+
+        return 404, {'message': 'Not Found', 'error': 404}
+
+    # Instagram (instaloader)
+
+    def _instagram_node(self, account, post):
+        return {
+            '__typename': 'GraphImage',
+            'id': str(post['numeric_id']),
+            'shortcode': _base36(post['numeric_id']),
+            'is_video': False,
+            'taken_at_timestamp': int(post['created'].replace(tzinfo=timezone.utc).timestamp()),
+            'edge_media_to_caption': {'edges': [{'node': {'text': post['content']}}]},
+            'edge_media_preview_like': {'count': post['likes']},
+            'edge_liked_by': {'count': post['likes']},
+            'edge_media_to_comment': {'count': post['comments']},
+            'display_url': '',
+            'owner': {'id': account.user_id, 'username': account.username}
+        }
+
+    def _instagram_media(self, account, offset):
+        page = account.posts[offset:offset + INSTAGRAM_PAGE_SIZE]
+        has_next = offset + INSTAGRAM_PAGE_SIZE < len(account.posts)
+        return {
+            'count': len(account.posts),
+            'page_info': {
+                'has_next_page': has_next,
+                'end_cursor': str(offset + INSTAGRAM_PAGE_SIZE) if has_next else None
+            },
+            'edges': [{'node': self._instagram_node(account, post)} for post in page]
+        }
+
+    def _instagram(self, path, params):
+        if path[:4] == ['api', 'v1', 'users', 'web_profile_info']:
+            account = self.mock.account('instagram', params['username'])
+            return 200, {'status': 'ok', 'data': {'user': {
+                'id': account.user_id,
+                'username': account.username,
+                'full_name': account.username.title(),
+                'biography': f"Synthetic account {account.username}",
+                'is_verified': account.verified,
+                'is_private': False,
+                'edge_followed_by': {'count': account.followers},
+                'edge_follow': {'count': account.following},
+                'edge_owner_to_timeline_media': self._instagram_media(account, 0)
+            }}}
+
+        if path[:2] == ['graphql', 'query']:
+            variables = json.loads(params.get('variables') or '{}')
+            account = self.mock.account_by_id('instagram', str(variables.get('id')))
+            if account is None:
+                return 404, {'status': 'fail', 'message': 'User not found'}
+            offset = int(variables.get('after') or 0)
+            return 200, {'status': 'ok', 'data': {'user': {
+                'edge_owner_to_timeline_media': self._instagram_media(account, offset)
+            }}}
+
+        return 404, {'status': 'fail', 'message': 'Unsupported endpoint'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock social platform API server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--posts-per-user', type=int, default=500)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--latency-jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=None, help='Requests per window per platform')
+    parser.add_argument('--rate-window', type=float, default=60)
+    args = parser.parse_args()
+
+    server = MockPlatformServer(
+        host=args.host, port=args.port, seed=args.seed, posts_per_user=args.posts_per_user,
+        latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate, rate_limit=args.rate_limit, rate_window=args.rate_window
+    )
+    print(f"✅ Mock platform API listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nℹ️  Served {server.stats['requests']} requests")
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Report Benchmark
+Measures encrypted report generation throughput with a per-report theme (the old behaviour)
+against the process-wide cached theme, both with the rendering cache off,
+charts drawn for every report against cached chart drawings,
+and regeneration of an unchanged report served from the rendering cache
+Needs no MongoDB; reports are written to a temporary folder
+
+Run from the backend folder:
+    python -m benchmarks.report_benchmark --reports 200
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime
+from app import create_app
+from services.report_cache import ReportCache
+from services.report_charts import ChartCache, get_chart_cache
+from services.report_service import ReportService
+from services.report_theme import ReportTheme, get_theme
+
+SAMPLE_CASE = {
+    '_id': 'benchmark',
+    'target_username': 'bench_user',
+    'platform': 'twitter',
+    'status': 'active',
+    'created_at': datetime(2024, 1, 1),
+    'risk_level': 'high',
+    'risk_score': 62.5,
+    'evidence_hash': '0' * 64,
+    'analysis_results': {
+        'sentiment': {'overall': 'negative', 'positive_percentage': 12, 'negative_percentage': 61, 'neutral_percentage': 27},
+        'cyberbullying': {'detected': True, 'confidence': 71, 'incidents_count': 9, 'total_flags': 14},
+        'fraud_detection': {'detected': False, 'confidence': 8, 'suspicious_count': 1, 'total_flags': 1},
+        'fake_profile': {
+            'is_potentially_fake': True, 'fake_score': 55, 'account_age_days': 40,
+            'risk_factors': ['Account is very new', 'Low follower count', 'High posting frequency']
+        }
+    }
+}
+
+def run(reports, service_factory):
+    started = time.perf_counter()
+    for _ in range(reports):
+        service_factory().generate_pdf_report(SAMPLE_CASE, 'benchmark-password')
+    elapsed = time.perf_counter() - started
+    return {
+        'reports': reports,
+        'elapsed_seconds': round(elapsed, 3),
+        'reports_per_second': round(reports / elapsed, 2),
+        'ms_per_report': round(elapsed / reports * 1000, 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark report generation with and without the cached theme and rendering')
+    parser.add_argument('--reports', type=int, default=100)
+    args = parser.parse_args()
+
+    app = create_app()
+    with tempfile.TemporaryDirectory() as folder, app.app_context():
+        app.config['REPORT_FOLDER'] = folder
+
+        no_cache = ReportCache(max_bytes=0)
+        rendering_cache = ReportCache()
+
+        setup_started = time.perf_counter()
+        for _ in range(50):
+            ReportTheme()
+        theme_setup_ms = (time.perf_counter() - setup_started) / 50 * 1000
+
+        # Warm up imports and font metrics before timing
+        ReportService(cache=rendering_cache).generate_pdf_report(SAMPLE_CASE, 'benchmark-password')
+        get_theme()
+
+        result = {
+            'theme_setup_ms': round(theme_setup_ms, 3),
+            'per_report_theme': run(args.reports, lambda: ReportService(theme=ReportTheme(), cache=no_cache)),
+            'uncached_charts': run(args.reports, lambda: ReportService(cache=no_cache, chart_cache=ChartCache(max_entries=0))),
+            'cached_theme': run(args.reports, lambda: ReportService(cache=no_cache)),
+            'cached_rendering': run(args.reports, lambda: ReportService(cache=rendering_cache))
+        }
+        result['speedup'] = round(
+            result['cached_theme']['reports_per_second'] / result['per_report_theme']['reports_per_second'], 3
+        )
+        result['chart_cache_speedup'] = round(
+            result['cached_theme']['reports_per_second'] / result['uncached_charts']['reports_per_second'], 3
+        )
+        result['rendering_cache_speedup'] = round(
+            result['cached_rendering']['reports_per_second'] / result['cached_theme']['reports_per_second'], 3
+        )
+        result['rendering_cache'] = rendering_cache.stats()
+        result['chart_cache'] = get_chart_cache().stats()
+
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
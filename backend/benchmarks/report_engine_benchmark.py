@@ -0,0 +1,90 @@
+"""
+Report Engine Benchmark
+Page throughput and peak Python heap of reports with a full evidence appendix
+Compares the streamed story with a fully materialized one
+Throughput is timed without tracemalloc; --memory adds a second, traced run for the heap peak
+Needs numpy (synthetic posts) but no MongoDB
+
+Run from the backend folder:
+    python -m benchmarks.report_engine_benchmark --posts 1000,10000,50000 --memory
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from PyPDF2 import PdfReader
+from app import create_app
+from benchmarks.report_benchmark import SAMPLE_CASE
+from services import report_service
+from services.report_engine import LazyStory
+from services.report_service import ReportService
+from services.synthetic_data import SyntheticDataGenerator
+
+PASSWORD = 'benchmark-password'
+
+class MaterializedStory(list):
+    """The old approach: every flowable is created before the build starts"""
+
+    def __init__(self, flowables, lookahead=None):
+        super().__init__(flowables)
+
+def generate(posts, materialize, trace=False):
+    """Returns (report data, elapsed seconds, traced heap peak in bytes or None)"""
+    generator = SyntheticDataGenerator(seed=posts, platform='twitter')
+    report_service.LazyStory = MaterializedStory if materialize else LazyStory
+    peak = None
+    try:
+        if trace:
+            tracemalloc.start()
+        started = time.perf_counter()
+        result = ReportService().generate_pdf_report(
+            SAMPLE_CASE, PASSWORD, posts=generator.iter_posts(posts, chunk_size=2000)
+        )
+        elapsed = time.perf_counter() - started
+        if trace:
+            _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if trace:
+            tracemalloc.stop()
+        report_service.LazyStory = LazyStory
+    return result, elapsed, peak
+
+def run(posts, materialize, memory):
+    result, elapsed, _ = generate(posts, materialize)
+    reader = PdfReader(result['file_path'])
+    reader.decrypt(PASSWORD)
+    pages = len(reader.pages)
+    row = {
+        'posts': posts,
+        'story': 'materialized' if materialize else 'streamed',
+        'pages': pages,
+        'elapsed_seconds': round(elapsed, 3),
+        'pages_per_second': round(pages / elapsed, 2)
+    }
+    if memory:
+        _, _, peak = generate(posts, materialize, trace=True)
+        row['peak_heap_mb'] = round(peak / 1024 / 1024, 2)
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streamed report generation')
+    parser.add_argument('--posts', default='1000,10000,50000', help='Comma-separated post counts')
+    parser.add_argument('--materialized', action='store_true', help='Also run with a fully materialized story')
+    parser.add_argument('--memory', action='store_true', help='Measure the peak Python heap (slow)')
+    args = parser.parse_args()
+
+    app = create_app()
+    results = []
+    with tempfile.TemporaryDirectory() as folder, app.app_context():
+        app.config['REPORT_FOLDER'] = folder
+        for posts in [int(value) for value in args.posts.split(',')]:
+            for materialize in ([False, True] if args.materialized else [False]):
+                results.append(run(posts, materialize, args.memory))
+                print(json.dumps(results[-1]))
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Report Size Benchmark
+File size and generation time of encrypted reports across evidence appendix sizes and
+compression levels (REPORT_COMPRESSION_LEVEL), plus the previous layout for comparison:
+every table cell a paragraph and an inline resource dictionary on every page
+Needs numpy (synthetic posts) but no MongoDB
+
+Run from the backend folder:
+    python -m benchmarks.report_size_benchmark --posts 100,1000,10000 --levels 1,6,9
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from PyPDF2 import PdfReader
+from app import create_app
+from benchmarks.report_benchmark import SAMPLE_CASE
+from services import report_engine
+from services.report_cache import ReportCache
+from services.report_service import ReportService
+from services.synthetic_data import SyntheticDataGenerator
+
+PASSWORD = 'benchmark-password'
+
+def previous_layout():
+    """Switch the engine to paragraph-only cells and per-page inline resources; returns the originals"""
+    originals = report_engine.cell, report_engine.StreamingCanvas._share_resources
+    cell = originals[0]
+    report_engine.cell = lambda text, style, width=None: cell(text, style)
+    report_engine.StreamingCanvas._share_resources = lambda self, page: None
+    return originals
+
+def restore_layout(originals):
+    report_engine.cell, report_engine.StreamingCanvas._share_resources = originals
+
+def generate(app, posts, level, previous=False):
+    app.config['REPORT_COMPRESSION_LEVEL'] = level
+    originals = previous_layout() if previous else None
+    try:
+        generator = SyntheticDataGenerator(seed=posts, platform='twitter')
+        started = time.perf_counter()
+        result = ReportService(cache=ReportCache(max_bytes=0)).generate_pdf_report(
+            SAMPLE_CASE, PASSWORD, posts=generator.iter_posts(posts, chunk_size=2000)
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        if originals:
+            restore_layout(originals)
+
+    reader = PdfReader(result['file_path'])
+    reader.decrypt(PASSWORD)
+    pages = len(reader.pages)
+    size = os.path.getsize(result['file_path'])
+    os.remove(result['file_path'])
+    return {
+        'posts': posts,
+        'compression_level': level,
+        'layout': 'previous' if previous else 'current',
+        'pages': pages,
+        'bytes': size,
+        'bytes_per_page': round(size / pages),
+        'seconds': round(elapsed, 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark report size and generation time')
+    parser.add_argument('--posts', default='100,1000,10000', help='Comma-separated appendix sizes')
+    parser.add_argument('--levels', default='1,6,9', help='Comma-separated zlib compression levels')
+    args = parser.parse_args()
+    sizes = [int(value) for value in args.posts.split(',')]
+    levels = [int(value) for value in args.levels.split(',')]
+
+    app = create_app()
+    default_level = app.config.get('REPORT_COMPRESSION_LEVEL', report_engine.DEFAULT_COMPRESSION_LEVEL)
+    rows = []
+    with tempfile.TemporaryDirectory() as folder, app.app_context():
+        app.config['REPORT_FOLDER'] = folder
+        # Warm up imports and font metrics before timing
+        generate(app, 10, default_level)
+
+        for posts in sizes:
+            previous = generate(app, posts, default_level, previous=True)
+            rows.append(previous)
+            for level in levels:
+                row = generate(app, posts, level)
+                row['size_vs_previous'] = round(row['bytes'] / previous['bytes'], 3)
+                row['time_vs_previous'] = round(row['seconds'] / previous['seconds'], 3)
+                rows.append(row)
+        app.config['REPORT_COMPRESSION_LEVEL'] = default_level
+
+    print(json.dumps(rows, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Scrape Benchmark
+Measures real-scrape throughput, concurrency limits and retry behavior against the mock platform server
+Needs the platform SDKs (tweepy, instaloader, praw) and MongoDB, like the app itself
+
+Run from the backend folder:
+    python -m benchmarks.scrape_benchmark --targets 200 --latency-ms 50 --error-rate 0.05
+"""
+
+import argparse
+import json
+import statistics
+import time
+from app import create_app
+from benchmarks.mock_platform_server import MockPlatformServer
+from services.circuit_breaker import circuit_breakers
+from services.platform_clients import platform_clients
+from services.rate_limiter import rate_limiter
+from services.scrape_engine import AsyncScrapeEngine
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark real scraping against the mock platform server')
+    parser.add_argument('--targets', type=int, default=100, help='Targets per platform')
+    parser.add_argument('--platforms', default='twitter,reddit,instagram')
+    parser.add_argument('--base-url', help='Use an already running mock server')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--posts-per-user', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--latency-jitter-ms', type=float, default=10)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=None)
+    parser.add_argument('--rate-window', type=float, default=60)
+    parser.add_argument('--concurrency', type=int, default=None, help='Override per-platform concurrency')
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = MockPlatformServer(
+            seed=args.seed, posts_per_user=args.posts_per_user,
+            latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms,
+            error_rate=args.error_rate, rate_limit=args.rate_limit, rate_window=args.rate_window
+        )
+        base_url = server.start()
+
+    app = create_app()
+    app.config.update(
+        USE_REAL_SCRAPING=True,
+        SCRAPE_MOCK_BASE_URL=base_url,
+        SCRAPE_CACHE_ENABLED=False,
+        TWITTER_BEARER_TOKEN=app.config.get('TWITTER_BEARER_TOKEN') or 'mock-bearer-token',
+        INSTAGRAM_ACCESS_TOKEN=app.config.get('INSTAGRAM_ACCESS_TOKEN') or 'mock-access-token',
+        REDDIT_CLIENT_ID=app.config.get('REDDIT_CLIENT_ID') or 'mock-client-id',
+        REDDIT_CLIENT_SECRET=app.config.get('REDDIT_CLIENT_SECRET') or 'mock-client-secret'
+    )
+    if args.rate_limit:
+        # Let the token buckets start with the mock server's budget
+        app.config['SCRAPE_RATE_LIMITS'] = {
+            platform: {'requests': args.rate_limit, 'period': args.rate_window}
+            for platform in ('twitter', 'instagram', 'reddit')
+        }
+    rate_limiter.init_app(app)
+    circuit_breakers.init_app(app)
+    platform_clients.init_app(app)
+
+    platforms = [platform.strip() for platform in args.platforms.split(',') if platform.strip()]
+    targets = [
+        {'platform': platform, 'username': f"bench_{platform}_{i}"}
+        for platform in platforms
+        for i in range(args.targets)
+    ]
+    limits = {platform: args.concurrency for platform in platforms} if args.concurrency else None
+
+    print(f"ℹ️  Scraping {len(targets)} targets through {base_url}")
+    started = time.perf_counter()
+    engine = AsyncScrapeEngine(platform_limits=limits, app=app)
+    results = list(engine.iter_results(targets))
+    elapsed = time.perf_counter() - started
+
+    report = {'elapsed_seconds': round(elapsed, 3), 'targets_per_second': round(len(results) / elapsed, 2), 'platforms': {}}
+    for platform in platforms:
+        rows = [result for result in results if result['platform'] == platform]
+        latencies = [row['elapsed_ms'] for row in rows]
+        sources = {}
+        for row in rows:
+            provenance = (row.get('data') or {}).get('provenance') or {}
+            source = provenance.get('fallback_decision') or provenance.get('fetch_source') or row['status']
+            sources[source] = sources.get(source, 0) + 1
+        report['platforms'][platform] = {
+            'targets': len(rows),
+            'errors': len([row for row in rows if row['status'] != 'ok']),
+            'sources': sources,
+            'latency_ms': {
+                'mean': round(statistics.mean(latencies), 2) if latencies else None,
+                'p50': percentile(latencies, 0.5),
+                'p95': percentile(latencies, 0.95),
+                'max': max(latencies) if latencies else None
+            }
+        }
+
+    report['rate_limits'] = rate_limiter.stats()
+    report['circuit_breakers'] = circuit_breakers.stats()
+    report['api_clients'] = platform_clients.stats()
+    if server is not None:
+        report['mock_server'] = server.stats
+        server.stop()
+
+    print(json.dumps(report, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
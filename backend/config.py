@@ -29,6 +29,52 @@ class Config:
     REPORT_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'reports')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     
+    # Report PDF encryption: 128 (RC4) or 256 (AES, needs pyaes)
+    REPORT_ENCRYPTION_STRENGTH = int(os.getenv('REPORT_ENCRYPTION_STRENGTH', 128))
+    
+    # Optional TrueType fonts for reports (e.g. DejaVuSans.ttf for non-Latin usernames)
+    REPORT_FONT_PATH = os.getenv('REPORT_FONT_PATH', None)
+    REPORT_FONT_BOLD_PATH = os.getenv('REPORT_FONT_BOLD_PATH', None)
+    
+    # In-memory cache of rendered (unencrypted) reports, in bytes; 0 disables it
+    REPORT_CACHE_MAX_BYTES = int(os.getenv('REPORT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    
+    # Report chart drawings cached per process by a hash of their data (0 disables it)
+    REPORT_CHART_CACHE_ENTRIES = int(os.getenv('REPORT_CHART_CACHE_ENTRIES', 256))
+    
+    # Worker processes and case limit of batch report generation (1 renders in the calling process)
+    REPORT_BATCH_MAX_WORKERS = int(os.getenv('REPORT_BATCH_MAX_WORKERS', os.cpu_count() or 1))
+    REPORT_BATCH_MAX_CASES = int(os.getenv('REPORT_BATCH_MAX_CASES', 200))
+    # Larger batches requested over HTTP always run as background jobs; smaller ones render in the request
+    REPORT_BATCH_SYNC_MAX_CASES = int(os.getenv('REPORT_BATCH_SYNC_MAX_CASES', 3))
+    
+    # How report downloads are sent: verify (read and check chunk hashes), sendfile (WSGI file wrapper),
+    # x-accel-redirect (nginx internal location at REPORT_ACCEL_REDIRECT_PREFIX mapped to REPORT_FOLDER) or x-sendfile
+    # The last three are only used while a report file is unchanged since it was written
+    REPORT_DOWNLOAD_MODE = os.getenv('REPORT_DOWNLOAD_MODE', 'verify')
+    REPORT_ACCEL_REDIRECT_PREFIX = os.getenv('REPORT_ACCEL_REDIRECT_PREFIX', '/protected-reports')
+    # Seconds a download link issued after the password check stays valid (resumes need a fresh one after that)
+    REPORT_DOWNLOAD_TOKEN_TTL = int(os.getenv('REPORT_DOWNLOAD_TOKEN_TTL', 900))
+    
+    # Evidence export ZIPs: deflate level and the HMAC key signing their manifests
+    # (derived from SECRET_KEY when unset; set a separate key and key ID to rotate it independently)
+    EXPORT_COMPRESS_LEVEL = int(os.getenv('EXPORT_COMPRESS_LEVEL', 6))
+    EXPORT_SIGNING_KEY = os.getenv('EXPORT_SIGNING_KEY', None)
+    EXPORT_SIGNING_KEY_ID = os.getenv('EXPORT_SIGNING_KEY_ID', 'default')
+    
+    # Analytics exports (JSONL/Parquet): rows held and written per row group, and Parquet compression
+    EXPORT_ROW_GROUP_ROWS = int(os.getenv('EXPORT_ROW_GROUP_ROWS', 10000))
+    EXPORT_PARQUET_COMPRESSION = os.getenv('EXPORT_PARQUET_COMPRESSION', 'snappy')
+    
+    # zlib level of report page streams: 1 is fastest, 9 smallest (see benchmarks/report_size_benchmark.py)
+    REPORT_COMPRESSION_LEVEL = int(os.getenv('REPORT_COMPRESSION_LEVEL', 9))
+    
+    # Rows per table chunk in the streamed evidence appendix
+    REPORT_TABLE_CHUNK_ROWS = int(os.getenv('REPORT_TABLE_CHUNK_ROWS', 200))
+    
+    # Columnar post cache used for repeated analytics on a case
+    POST_CACHE_FOLDER = os.getenv('POST_CACHE_FOLDER', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'posts'))
+    
     # Social Media API Keys (Optional - falls back to simulated mode if not set)
     TWITTER_API_KEY = os.getenv('TWITTER_API_KEY', None)
     TWITTER_API_SECRET = os.getenv('TWITTER_API_SECRET', None)
@@ -51,6 +97,74 @@ class Config:
     # Feature Flags
     USE_REAL_SCRAPING = os.getenv('USE_REAL_SCRAPING', 'False') == 'True'
     
+    # Concurrent batch scraping (per-platform worker limits)
+    SCRAPE_CONCURRENCY_DEFAULT = int(os.getenv('SCRAPE_CONCURRENCY_DEFAULT', 4))
+    SCRAPE_CONCURRENCY = {
+        'twitter': int(os.getenv('SCRAPE_CONCURRENCY_TWITTER', 4)),
+        'instagram': int(os.getenv('SCRAPE_CONCURRENCY_INSTAGRAM', 2)),
+        'reddit': int(os.getenv('SCRAPE_CONCURRENCY_REDDIT', 4))
+    }
+    SCRAPE_BATCH_MAX_TARGETS = int(os.getenv('SCRAPE_BATCH_MAX_TARGETS', 100))
+    
+    # Scrape result cache shared by all workers on this host
+    SCRAPE_CACHE_ENABLED = os.getenv('SCRAPE_CACHE_ENABLED', 'True') == 'True'
+    SCRAPE_CACHE_TTL = int(os.getenv('SCRAPE_CACHE_TTL', 900))
+    SCRAPE_CACHE_FOLDER = os.getenv('SCRAPE_CACHE_FOLDER', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'scrapes'))
+    
+    # Full-history (paginated) scraping
+    SCRAPE_PAGE_SIZE = int(os.getenv('SCRAPE_PAGE_SIZE', 100))
+    SCRAPE_MAX_POSTS = int(os.getenv('SCRAPE_MAX_POSTS', 10000))
+    
+    # Reddit submission counts beyond this are reported as an estimate ("≥N"); profile scrapes report
+    # a partial "≥N" while the count is finished on a background thread
+    REDDIT_COUNT_CAP = int(os.getenv('REDDIT_COUNT_CAP', 1000))
+    
+    # Shared API clients (built once per process) and their HTTP connection pools
+    SCRAPE_HTTP_POOL_SIZE = int(os.getenv('SCRAPE_HTTP_POOL_SIZE', 10))
+    SCRAPE_CLIENT_REBUILD_INTERVAL = float(os.getenv('SCRAPE_CLIENT_REBUILD_INTERVAL', 30))
+    # Route real-scraping API calls to a local mock server (benchmarks/mock_platform_server.py)
+    SCRAPE_MOCK_BASE_URL = os.getenv('SCRAPE_MOCK_BASE_URL', None)
+    
+    # Circuit breaker per platform: trip after N consecutive failures, probe again after the timeout
+    SCRAPE_BREAKER_FAILURE_THRESHOLD = int(os.getenv('SCRAPE_BREAKER_FAILURE_THRESHOLD', 5))
+    SCRAPE_BREAKER_RESET_TIMEOUT = float(os.getenv('SCRAPE_BREAKER_RESET_TIMEOUT', 30))
+    SCRAPE_BREAKER_HALF_OPEN_PROBES = int(os.getenv('SCRAPE_BREAKER_HALF_OPEN_PROBES', 1))
+    # Seconds a single real profile scrape may take before falling back (rate-limit waits count against it)
+    SCRAPE_LATENCY_BUDGET = float(os.getenv('SCRAPE_LATENCY_BUDGET', 10))
+    SCRAPE_BREAKER_WORKERS = int(os.getenv('SCRAPE_BREAKER_WORKERS', 16))
+    
+    # Real scraping rate limits (token bucket per platform and credential)
+    SCRAPE_RATE_LIMITS = {
+        'twitter': {'requests': int(os.getenv('TWITTER_RATE_LIMIT', 900)), 'period': 900},
+        'instagram': {'requests': int(os.getenv('INSTAGRAM_RATE_LIMIT', 200)), 'period': 3600},
+        'reddit': {'requests': int(os.getenv('REDDIT_RATE_LIMIT', 100)), 'period': 60}
+    }
+    SCRAPE_RETRY_MAX_ATTEMPTS = int(os.getenv('SCRAPE_RETRY_MAX_ATTEMPTS', 4))
+    SCRAPE_RETRY_BASE_DELAY = float(os.getenv('SCRAPE_RETRY_BASE_DELAY', 1.0))
+    SCRAPE_RETRY_MAX_DELAY = float(os.getenv('SCRAPE_RETRY_MAX_DELAY', 60.0))
+    SCRAPE_DEADLINE_SECONDS = float(os.getenv('SCRAPE_DEADLINE_SECONDS', 60.0))
+    
+    # Background jobs (job_worker.py)
+    JOB_WORKER_CONCURRENCY = int(os.getenv('JOB_WORKER_CONCURRENCY', 2))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', 60))
+    JOB_HEARTBEAT_SECONDS = int(os.getenv('JOB_HEARTBEAT_SECONDS', 15))
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 2.0))
+    JOB_RETRY_BASE_DELAY = int(os.getenv('JOB_RETRY_BASE_DELAY', 30))
+    
+    # Watchlist rescrape scheduler (watchlist_scheduler.py)
+    WATCHLIST_DEFAULT_INTERVAL_MINUTES = float(os.getenv('WATCHLIST_DEFAULT_INTERVAL_MINUTES', 360))
+    WATCHLIST_MIN_INTERVAL_MINUTES = float(os.getenv('WATCHLIST_MIN_INTERVAL_MINUTES', 15))
+    WATCHLIST_JITTER = float(os.getenv('WATCHLIST_JITTER', 0.1))
+    WATCHLIST_SYNC_INTERVAL = float(os.getenv('WATCHLIST_SYNC_INTERVAL', 30))
+    WATCHLIST_TICK_SECONDS = float(os.getenv('WATCHLIST_TICK_SECONDS', 1.0))
+    WATCHLIST_MAX_DISPATCH_PER_TICK = int(os.getenv('WATCHLIST_MAX_DISPATCH_PER_TICK', 500))
+    WATCHLIST_RATE_SHARE = float(os.getenv('WATCHLIST_RATE_SHARE', 0.5))
+    WATCHLIST_CALLS_PER_RESCRAPE = int(os.getenv('WATCHLIST_CALLS_PER_RESCRAPE', 2))
+    
+    # Investigation pipeline event stream
+    INVESTIGATION_KEEPALIVE_SECONDS = float(os.getenv('INVESTIGATION_KEEPALIVE_SECONDS', 15))
+    
     # Security settings
     BCRYPT_LOG_ROUNDS = 12
     MAX_LOGIN_ATTEMPTS = 5
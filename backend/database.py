@@ -20,16 +20,19 @@ class Database:
     def connect(self):
         """Establish MongoDB connection"""
         if 'db' not in g:
-            self.client = MongoClient(current_app.config['MONGO_URI'])
+            # Each app context owns its client, so concurrent worker threads never close each other's
+            g.db_client = MongoClient(current_app.config['MONGO_URI'])
+            self.client = g.db_client
             db_name = current_app.config['MONGO_URI'].split('/')[-1]
-            g.db = self.client[db_name]
+            g.db = g.db_client[db_name]
         return g.db
     
     def teardown(self, exception):
         """Close database connection"""
-        db = g.pop('db', None)
-        if db is not None and self.client is not None:
-            self.client.close()
+        g.pop('db', None)
+        client = g.pop('db_client', None)
+        if client is not None:
+            client.close()
     
     def get_collection(self, collection_name):
         """Get a specific collection from database"""
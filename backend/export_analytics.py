@@ -0,0 +1,117 @@
+"""
+Analytics Export Script
+Exports cases' latest posts with per-post analysis for notebooks and other analytics tools
+JSONL goes to one file (or stdout); Parquet writes a dataset partitioned by platform
+
+    python export_analytics.py --email investigator@agency.gov --format parquet --out exports/q3
+    python export_analytics.py --email investigator@agency.gov --cases <id>,<id> --flags fraud --out - > fraud.jsonl
+    python export_analytics.py --email admin@agency.gov --all --since 2024-01-01 --format parquet --out exports/all
+"""
+
+import argparse
+import json
+import sys
+from app import create_app
+from database import db
+from models.audit_log import AuditLog
+from models.case import Case
+from models.user import User
+from services.analytics_export import FLAGS, FORMAT_JSONL, FORMAT_PARQUET, FORMATS, AnalyticsExport, ParquetDataset, parquet_available
+
+def select_cases(user, args):
+    user_id = str(user['_id'])
+    is_admin = user.get('role') == 'admin'
+    if args.cases:
+        cases = [Case.find_by_id(case_id.strip(), include_posts=False) for case_id in args.cases.split(',')]
+        if None in cases:
+            sys.exit('❌ Unknown case ID')
+        if not is_admin and any(case['investigator_id'] != user_id for case in cases):
+            sys.exit(f"❌ Not all cases belong to {args.email}")
+    elif args.all:
+        if not is_admin:
+            sys.exit('❌ --all is only available to admins')
+        collection = db.get_collection(Case.COLLECTION)
+        cases = list(collection.find({}, {'data_collected.posts': 0}))
+        for case in cases:
+            case['_id'] = str(case['_id'])
+    else:
+        cases = Case.find_by_investigator(user_id, include_posts=False)
+    if args.status:
+        cases = [case for case in cases if case.get('status') == args.status]
+    if args.platform:
+        cases = [case for case in cases if case.get('platform') == args.platform]
+    return [case for case in cases if case.get('data_collected')]
+
+def main():
+    parser = argparse.ArgumentParser(description='Export case posts and per-post analysis as JSONL or Parquet')
+    parser.add_argument('--email', required=True, help='User the export is run as (ownership and audit trail)')
+    parser.add_argument('--cases', default=None, help='Comma-separated case IDs (default: all of the user\'s cases)')
+    parser.add_argument('--all', action='store_true', help='Every case in the system (admins only)')
+    parser.add_argument('--status', default=None, help='Only cases with this status, e.g. active')
+    parser.add_argument('--platform', default=None, help='Only cases on this platform')
+    parser.add_argument('--format', choices=FORMATS, default=FORMAT_JSONL)
+    parser.add_argument('--since', default=None, help='Only posts at or after this ISO-8601 time')
+    parser.add_argument('--until', default=None, help='Only posts at or before this ISO-8601 time')
+    parser.add_argument('--flags', default='', help=f"Only posts with any of these flags ({','.join(FLAGS)})")
+    parser.add_argument('--out', required=True, help='JSONL file (- for stdout) or Parquet dataset directory')
+    args = parser.parse_args()
+
+    if args.format == FORMAT_PARQUET and not parquet_available():
+        sys.exit('❌ Parquet export needs the optional pyarrow package (pip install pyarrow)')
+    if args.format == FORMAT_PARQUET and args.out == '-':
+        sys.exit('❌ Parquet exports are written to a directory')
+    flags = [flag.strip() for flag in args.flags.split(',') if flag.strip()]
+    # Progress goes to stderr so JSONL can be piped from stdout
+    log = sys.stderr
+
+    app = create_app()
+    with app.app_context():
+        user = User.find_by_email(args.email)
+        if not user:
+            sys.exit(f"❌ No user with email {args.email}")
+        cases = select_cases(user, args)
+        if not cases:
+            sys.exit('ℹ️  No cases with collected data to export')
+
+        try:
+            exports = [AnalyticsExport(case, since=args.since, until=args.until, flags=flags) for case in cases]
+        except ValueError as e:
+            sys.exit(f"❌ {e}")
+        print(f"📦 Exporting {len(cases)} case(s) as {args.format}...", file=log)
+
+        rows = {}
+        if args.format == FORMAT_PARQUET:
+            dataset = ParquetDataset(args.out)
+            try:
+                for export in exports:
+                    rows[export.case['_id']] = dataset.add(export)
+            except BaseException:
+                dataset.abort()
+                raise
+            paths = dataset.close()
+        else:
+            out = sys.stdout.buffer if args.out == '-' else open(args.out, 'wb')
+            try:
+                for export in exports:
+                    rows[export.case['_id']] = 0
+                    for chunk in export.iter_jsonl():
+                        out.write(chunk)
+                        rows[export.case['_id']] += chunk.count(b'\n')
+            finally:
+                if out is not sys.stdout.buffer:
+                    out.close()
+            paths = [args.out]
+
+        for case_id, count in rows.items():
+            AuditLog.log(
+                user_id=str(user['_id']),
+                action=AuditLog.ACTION_EXPORT_ANALYTICS,
+                details={'case_id': case_id, 'format': args.format, 'flags': flags,
+                         'since': args.since, 'until': args.until, 'rows': count, 'source': 'cli'}
+            )
+
+    print(json.dumps({'cases': len(rows), 'rows': sum(rows.values()), 'files': paths}, indent=2), file=log)
+    print('✅ Export complete', file=log)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Synthetic Data Script
+Generates a reproducible synthetic post corpus for load tests and benchmarks
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from services.synthetic_data import SyntheticDataGenerator, TIMESTAMP_DISTRIBUTIONS
+
+def parse_mix(value):
+    """Parse 'safe=0.7,fraud=0.2,cyberbullying=0.1'"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight)
+    return mix
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic post corpus')
+    parser.add_argument('--posts', type=int, default=1000000, help='Number of posts')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--platform', default='twitter', choices=['twitter', 'instagram', 'facebook', 'linkedin', 'reddit'])
+    parser.add_argument('--mix', type=parse_mix, default=None, help='e.g. safe=0.7,fraud=0.2,cyberbullying=0.1')
+    parser.add_argument('--duplicate-rate', type=float, default=0.0)
+    parser.add_argument('--timestamps', default='uniform', choices=TIMESTAMP_DISTRIBUTIONS)
+    parser.add_argument('--span-days', type=int, default=90)
+    parser.add_argument('--end', type=datetime.fromisoformat, default=None, help='Newest timestamp (ISO-8601)')
+    parser.add_argument('--accounts', type=int, default=1000, help='Number of synthetic authors')
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--format', default='jsonl', choices=['jsonl', 'columnar'])
+    parser.add_argument('--output', required=True, help='JSONL file, or folder for columnar output')
+    parser.add_argument('--accounts-output', help='Optional JSON file for author follower metadata')
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator(
+        seed=args.seed,
+        platform=args.platform,
+        mix=args.mix,
+        duplicate_rate=args.duplicate_rate,
+        timestamp_distribution=args.timestamps,
+        span_days=args.span_days,
+        end=args.end,
+        accounts=args.accounts
+    )
+
+    started = time.perf_counter()
+    if args.format == 'jsonl':
+        generator.write_jsonl(args.output, args.posts, args.chunk_size)
+        path = args.output
+    else:
+        path = generator.write_columnar(args.output, f"synthetic_{args.platform}_{args.seed}", args.posts, args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    if args.accounts_output:
+        with open(args.accounts_output, 'w', encoding='utf-8') as f:
+            json.dump(generator.accounts(), f)
+
+    print(f"✅ {args.posts} posts written to {path} in {elapsed:.2f}s ({args.posts / max(elapsed, 1e-9):,.0f} posts/s)")
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (ImportError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,21 @@
+"""
+Job Worker Script
+Runs background scrape, analysis and report jobs from the jobs collection
+Start one per node (or several per node); workers share the queue through leases
+"""
+
+import argparse
+from app import create_app
+from services.job_service import JobWorker
+
+def main():
+    parser = argparse.ArgumentParser(description='Run background job workers')
+    parser.add_argument('--concurrency', type=int, default=None, help='Worker threads (default: JOB_WORKER_CONCURRENCY)')
+    parser.add_argument('--types', default=None, help='Comma-separated job types to run, e.g. scrape,analyze')
+    args = parser.parse_args()
+
+    job_types = [job_type.strip() for job_type in args.types.split(',')] if args.types else None
+    JobWorker(create_app(), concurrency=args.concurrency, job_types=job_types).run()
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Tracks all system actions for security monitoring
 from datetime import datetime, timedelta
 from database import db
 from bson.objectid import ObjectId
+from pymongo import ASCENDING
 
 class AuditLog:
     """Audit log model for tracking system actions"""
@@ -23,8 +24,24 @@ class AuditLog:
     ACTION_UPDATE_CASE = 'update_case'
     ACTION_GENERATE_REPORT = 'generate_report'
     ACTION_DOWNLOAD_REPORT = 'download_report'
+    ACTION_INTEGRITY_FAILURE = 'integrity_failure'
     ACTION_DATA_SCRAPE = 'data_scrape'
     ACTION_ANALYSIS = 'analysis'
+    ACTION_INVESTIGATION = 'investigation'
+    ACTION_EXPORT_EVIDENCE = 'export_evidence'
+    ACTION_EXPORT_ANALYTICS = 'export_analytics'
+    
+    _indexes_created = False
+    
+    @staticmethod
+    def ensure_indexes():
+        """Create the per-case lookup indexes once per process"""
+        if AuditLog._indexes_created:
+            return
+        collection = db.get_collection(AuditLog.COLLECTION)
+        collection.create_index([('details.case_id', ASCENDING), ('timestamp', ASCENDING)])
+        collection.create_index([('details.report_id', ASCENDING), ('timestamp', ASCENDING)])
+        AuditLog._indexes_created = True
     
     @staticmethod
     def log(user_id, action, details=None, ip_address=None):
@@ -59,6 +76,18 @@ class AuditLog:
             log['_id'] = str(log['_id'])
         return logs
     
+    @staticmethod
+    def iter_case_logs(case_id, report_ids=()):
+        """Stream every audit entry about a case or one of its reports, oldest first"""
+        AuditLog.ensure_indexes()
+        collection = db.get_collection(AuditLog.COLLECTION)
+        query = {'details.case_id': case_id}
+        if report_ids:
+            query = {'$or': [query, {'details.report_id': {'$in': list(report_ids)}}]}
+        for log in collection.find(query).sort('timestamp', ASCENDING).batch_size(1000):
+            log['_id'] = str(log['_id'])
+            yield log
+    
     @staticmethod
     def get_failed_login_attempts(email, minutes=30):
         """Get failed login attempts in last N minutes"""
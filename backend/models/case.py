@@ -48,23 +48,37 @@ class Case:
         return str(result.inserted_id)
     
     @staticmethod
-    def find_by_id(case_id):
-        """Find case by ID"""
+    def find_by_id(case_id, include_posts=True):
+        """
+        Find case by ID
+        With include_posts=False the snapshot posts are left out of the query
+        """
         collection = db.get_collection(Case.COLLECTION)
-        case = collection.find_one({'_id': ObjectId(case_id)})
+        projection = None if include_posts else {'data_collected.posts': 0}
+        case = collection.find_one({'_id': ObjectId(case_id)}, projection)
         if case:
             case['_id'] = str(case['_id'])
         return case
     
     @staticmethod
-    def find_by_investigator(investigator_id):
+    def find_by_investigator(investigator_id, include_posts=True):
         """Find all cases by investigator"""
         collection = db.get_collection(Case.COLLECTION)
-        cases = list(collection.find({'investigator_id': investigator_id}))
+        projection = None if include_posts else {'data_collected.posts': 0}
+        cases = list(collection.find({'investigator_id': investigator_id}, projection))
         for case in cases:
             case['_id'] = str(case['_id'])
         return cases
     
+    @staticmethod
+    def find_snapshot(case_id, index):
+        """One collected-data snapshot of a case, including inline posts, without loading the others"""
+        collection = db.get_collection(Case.COLLECTION)
+        case = collection.find_one({'_id': ObjectId(case_id)}, {'data_collected': {'$slice': [index, 1]}})
+        if case and case.get('data_collected'):
+            return case['data_collected'][0]
+        return None
+    
     @staticmethod
     def update_analysis(case_id, analysis_data, risk_score, risk_level):
         """Update case with analysis results"""
@@ -103,6 +117,27 @@ class Case:
             }}
         )
     
+    @staticmethod
+    def save_scrape_checkpoint(case_id, checkpoint):
+        """Save the pagination cursor of an in-progress history scrape"""
+        collection = db.get_collection(Case.COLLECTION)
+        collection.update_one(
+            {'_id': ObjectId(case_id)},
+            {'$set': {
+                'scrape_checkpoint': checkpoint,
+                'updated_at': datetime.utcnow()
+            }}
+        )
+    
+    @staticmethod
+    def clear_scrape_checkpoint(case_id):
+        """Remove the checkpoint once a history scrape has completed"""
+        collection = db.get_collection(Case.COLLECTION)
+        collection.update_one(
+            {'_id': ObjectId(case_id)},
+            {'$unset': {'scrape_checkpoint': ''}}
+        )
+    
     @staticmethod
     def update_status(case_id, status):
         """Update case status"""
@@ -0,0 +1,68 @@
+"""
+Case Post Model
+Stores the posts of paginated (full-history) scrapes outside the case document
+"""
+
+from database import db
+from pymongo import ASCENDING, UpdateOne
+
+class CasePost:
+    """Posts collected page by page for a case snapshot"""
+
+    COLLECTION = 'case_posts'
+
+    _indexes_created = False
+
+    @staticmethod
+    def ensure_indexes():
+        """Create the lookup index once per process"""
+        if CasePost._indexes_created:
+            return
+        collection = db.get_collection(CasePost.COLLECTION)
+        collection.create_index(
+            [('case_id', ASCENDING), ('snapshot_id', ASCENDING), ('seq', ASCENDING)],
+            unique=True
+        )
+        CasePost._indexes_created = True
+
+    @staticmethod
+    def store_page(case_id, snapshot_id, start_seq, posts):
+        """
+        Store one page of posts
+        Upserts by sequence number so re-storing a page after a resume is harmless
+        """
+        if not posts:
+            return 0
+        CasePost.ensure_indexes()
+        collection = db.get_collection(CasePost.COLLECTION)
+
+        operations = []
+        for offset, post in enumerate(posts):
+            key = {'case_id': case_id, 'snapshot_id': snapshot_id, 'seq': start_seq + offset}
+            operations.append(UpdateOne(key, {'$set': {'post': post}}, upsert=True))
+
+        collection.bulk_write(operations, ordered=False)
+        return len(posts)
+
+    @staticmethod
+    def iter_snapshot_posts(case_id, snapshot_id, batch_size=1000):
+        """Yield a snapshot's posts in collection order using a server-side cursor"""
+        collection = db.get_collection(CasePost.COLLECTION)
+        cursor = collection.find(
+            {'case_id': case_id, 'snapshot_id': snapshot_id},
+            {'_id': 0, 'post': 1}
+        ).sort('seq', ASCENDING).batch_size(batch_size)
+        for document in cursor:
+            yield document['post']
+
+    @staticmethod
+    def count_snapshot_posts(case_id, snapshot_id):
+        """Count stored posts for a snapshot"""
+        collection = db.get_collection(CasePost.COLLECTION)
+        return collection.count_documents({'case_id': case_id, 'snapshot_id': snapshot_id})
+
+    @staticmethod
+    def delete_by_case(case_id):
+        """Delete all stored posts of a case"""
+        collection = db.get_collection(CasePost.COLLECTION)
+        collection.delete_many({'case_id': case_id})
@@ -0,0 +1,232 @@
+"""
+Job Model
+Persistent queue of background scrape, analysis and report jobs
+Workers on any node compete for jobs by taking time-limited leases
+"""
+
+from datetime import datetime, timedelta
+from database import db
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, ReturnDocument
+
+class Job:
+    """Background job with lease, heartbeat and retry bookkeeping"""
+
+    COLLECTION = 'jobs'
+
+    # Job types
+    TYPE_SCRAPE = 'scrape'
+    TYPE_ANALYZE = 'analyze'
+    TYPE_REPORT = 'report'
+    # Spans several cases: case_id is None, payload['case_ids'] lists them
+    TYPE_REPORT_BATCH = 'report_batch'
+
+    # Job status
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+
+    _indexes_created = False
+
+    @staticmethod
+    def ensure_indexes():
+        """Create the claim indexes once per process"""
+        if Job._indexes_created:
+            return
+        collection = db.get_collection(Job.COLLECTION)
+        collection.create_index([('status', ASCENDING), ('run_at', ASCENDING)])
+        collection.create_index([('status', ASCENDING), ('lease_expires_at', ASCENDING)])
+        collection.create_index([('case_id', ASCENDING), ('created_at', ASCENDING)])
+        Job._indexes_created = True
+
+    @staticmethod
+    def create(job_type, case_id, user_id, payload=None, max_attempts=3, secret=None, ip_address=None):
+        """
+        Queue a new job
+        secret holds sensitive input (e.g. a report password); it is removed once the job finishes
+        """
+        Job.ensure_indexes()
+        collection = db.get_collection(Job.COLLECTION)
+
+        now = datetime.utcnow()
+        job_data = {
+            'type': job_type,
+            'case_id': case_id,
+            'user_id': user_id,
+            'ip_address': ip_address,
+            'payload': payload or {},
+            'status': Job.STATUS_QUEUED,
+            'attempts': 0,
+            'max_attempts': max_attempts,
+            'run_at': now,
+            'worker_id': None,
+            'lease_expires_at': None,
+            'heartbeat_at': None,
+            'progress': {},
+            'result': None,
+            'last_error': None,
+            'created_at': now,
+            'started_at': None,
+            'finished_at': None
+        }
+        if secret is not None:
+            job_data['secret'] = secret
+
+        result = collection.insert_one(job_data)
+        return str(result.inserted_id)
+
+    @staticmethod
+    def _public(job):
+        if job:
+            job['_id'] = str(job['_id'])
+            job.pop('secret', None)
+        return job
+
+    @staticmethod
+    def find_by_id(job_id, include_secret=False):
+        """Find job by ID"""
+        collection = db.get_collection(Job.COLLECTION)
+        job = collection.find_one({'_id': ObjectId(job_id)})
+        if job and include_secret:
+            job['_id'] = str(job['_id'])
+            return job
+        return Job._public(job)
+
+    @staticmethod
+    def find_by_user(user_id, case_id=None, limit=50):
+        """Most recent jobs of a user, optionally for one case"""
+        collection = db.get_collection(Job.COLLECTION)
+        query = {'user_id': user_id}
+        if case_id:
+            query['case_id'] = case_id
+        jobs = collection.find(query, {'secret': 0}).sort('created_at', -1).limit(limit)
+        return [Job._public(job) for job in jobs]
+
+    @staticmethod
+    def find_unfinished(job_ids):
+        """Subset of job_ids that are still queued or running"""
+        if not job_ids:
+            return set()
+        collection = db.get_collection(Job.COLLECTION)
+        jobs = collection.find(
+            {
+                '_id': {'$in': [ObjectId(job_id) for job_id in job_ids]},
+                'status': {'$in': [Job.STATUS_QUEUED, Job.STATUS_RUNNING]}
+            },
+            {'_id': 1}
+        )
+        return {str(job['_id']) for job in jobs}
+
+    @staticmethod
+    def claim(worker_id, lease_seconds, job_types=None):
+        """
+        Atomically lease the oldest runnable job
+        Runnable: queued and due, or running with an expired lease (its worker died)
+        """
+        Job.ensure_indexes()
+        collection = db.get_collection(Job.COLLECTION)
+
+        now = datetime.utcnow()
+        query = {'$or': [
+            {'status': Job.STATUS_QUEUED, 'run_at': {'$lte': now}},
+            {'status': Job.STATUS_RUNNING, 'lease_expires_at': {'$lt': now}}
+        ]}
+        if job_types:
+            query['type'] = {'$in': list(job_types)}
+
+        job = collection.find_one_and_update(
+            query,
+            {
+                '$set': {
+                    'status': Job.STATUS_RUNNING,
+                    'worker_id': worker_id,
+                    'lease_expires_at': now + timedelta(seconds=lease_seconds),
+                    'heartbeat_at': now,
+                    'started_at': now
+                },
+                '$inc': {'attempts': 1}
+            },
+            sort=[('run_at', ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+        if job:
+            job['_id'] = str(job['_id'])
+        return job
+
+    @staticmethod
+    def heartbeat(job_id, worker_id, lease_seconds, progress=None):
+        """
+        Extend the lease of a running job
+        Returns False when the lease was lost to another worker
+        """
+        collection = db.get_collection(Job.COLLECTION)
+        now = datetime.utcnow()
+        update = {
+            'lease_expires_at': now + timedelta(seconds=lease_seconds),
+            'heartbeat_at': now
+        }
+        if progress is not None:
+            update['progress'] = progress
+
+        result = collection.update_one(
+            {'_id': ObjectId(job_id), 'worker_id': worker_id, 'status': Job.STATUS_RUNNING},
+            {'$set': update}
+        )
+        return result.matched_count == 1
+
+    @staticmethod
+    def complete(job_id, worker_id, result):
+        """Mark a job as succeeded"""
+        collection = db.get_collection(Job.COLLECTION)
+        collection.update_one(
+            {'_id': ObjectId(job_id), 'worker_id': worker_id},
+            {
+                '$set': {
+                    'status': Job.STATUS_SUCCEEDED,
+                    'result': result,
+                    'lease_expires_at': None,
+                    'finished_at': datetime.utcnow()
+                },
+                '$unset': {'secret': ''}
+            }
+        )
+
+    @staticmethod
+    def fail(job_id, worker_id, error, retry_in=None):
+        """
+        Record a failed attempt
+        With retry_in (seconds) the job is queued again, otherwise it fails for good
+        """
+        collection = db.get_collection(Job.COLLECTION)
+        now = datetime.utcnow()
+
+        if retry_in is not None:
+            update = {
+                '$set': {
+                    'status': Job.STATUS_QUEUED,
+                    'run_at': now + timedelta(seconds=retry_in),
+                    'worker_id': None,
+                    'lease_expires_at': None,
+                    'last_error': error
+                }
+            }
+        else:
+            update = {
+                '$set': {
+                    'status': Job.STATUS_FAILED,
+                    'lease_expires_at': None,
+                    'last_error': error,
+                    'finished_at': now
+                },
+                '$unset': {'secret': ''}
+            }
+
+        collection.update_one({'_id': ObjectId(job_id), 'worker_id': worker_id}, update)
+
+    @staticmethod
+    def count_by_status():
+        """Number of jobs per status"""
+        collection = db.get_collection(Job.COLLECTION)
+        counts = collection.aggregate([{'$group': {'_id': '$status', 'count': {'$sum': 1}}}])
+        return {entry['_id']: entry['count'] for entry in counts}
@@ -0,0 +1,36 @@
+"""
+Post Count Model
+Caches per-account post counts so they can be updated incrementally
+"""
+
+from datetime import datetime
+from database import db
+
+class PostCount:
+    """Cached post count for a platform account"""
+    
+    COLLECTION = 'post_counts'
+    
+    @staticmethod
+    def find(platform, username):
+        """Find the cached count for an account"""
+        collection = db.get_collection(PostCount.COLLECTION)
+        return collection.find_one(
+            {'platform': platform, 'username': username.lower()},
+            {'_id': 0}
+        )
+    
+    @staticmethod
+    def save(platform, username, count, newest_id, capped):
+        """Store the latest count and the newest post it covers"""
+        collection = db.get_collection(PostCount.COLLECTION)
+        collection.update_one(
+            {'platform': platform, 'username': username.lower()},
+            {'$set': {
+                'count': count,
+                'newest_id': newest_id,
+                'capped': capped,
+                'updated_at': datetime.utcnow()
+            }},
+            upsert=True
+        )
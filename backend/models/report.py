@@ -6,15 +6,32 @@ Handles forensic report generation and storage
 from datetime import datetime
 from database import db
 from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING
 
 class Report:
     """Report model for forensic investigation reports"""
     
     COLLECTION = 'reports'
     
+    _indexes_created = False
+    
+    @staticmethod
+    def ensure_indexes():
+        """Create the report lookup index once per process"""
+        if Report._indexes_created:
+            return
+        collection = db.get_collection(Report.COLLECTION)
+        collection.create_index([('case_id', ASCENDING), ('content_key', ASCENDING)])
+        Report._indexes_created = True
+    
     @staticmethod
-    def create(case_id, investigator_id, file_path, file_hash, encryption_hash):
-        """Create a new report record"""
+    def create(case_id, investigator_id, file_path, file_hash, encryption_hash, content_key=None, integrity=None, rendered_at=None):
+        """
+        Create a new report record
+        integrity: per-chunk hashes, size and mtime of the file, used to verify downloads
+        rendered_at: the render time printed in the PDF (earlier than created_at for cached renderings)
+        """
+        Report.ensure_indexes()
         collection = db.get_collection(Report.COLLECTION)
         
         report_data = {
@@ -23,6 +40,9 @@ class Report:
             'file_path': file_path,
             'file_hash': file_hash,
             'encryption_hash': encryption_hash,
+            'content_key': content_key,
+            'integrity': integrity,
+            'rendered_at': rendered_at,
             'is_encrypted': True,
             'download_count': 0,
             'created_at': datetime.utcnow(),
@@ -50,6 +70,24 @@ class Report:
             report['_id'] = str(report['_id'])
         return reports
     
+    @staticmethod
+    def find_by_content(case_id, investigator_id, content_key, encryption_hash):
+        """Latest report of an investigator with the same content and password, if any"""
+        Report.ensure_indexes()
+        collection = db.get_collection(Report.COLLECTION)
+        report = collection.find_one(
+            {
+                'case_id': case_id,
+                'content_key': content_key,
+                'investigator_id': investigator_id,
+                'encryption_hash': encryption_hash
+            },
+            sort=[('created_at', DESCENDING)]
+        )
+        if report:
+            report['_id'] = str(report['_id'])
+        return report
+    
     @staticmethod
     def increment_download_count(report_id):
         """Increment download counter"""
@@ -0,0 +1,136 @@
+"""
+Watchlist Model
+Cases kept under continuous observation with a per-target rescrape interval
+"""
+
+from datetime import datetime, timedelta
+from database import db
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+
+class Watchlist:
+    """Watched case with its rescrape interval and schedule"""
+
+    COLLECTION = 'watchlist'
+
+    # Fields the scheduler needs; keeps full reloads cheap
+    SCHEDULE_FIELDS = {
+        'case_id': 1, 'user_id': 1, 'platform': 1, 'interval_seconds': 1, 'next_due_at': 1,
+        'risk_level': 1, 'active': 1, 'last_job_id': 1
+    }
+
+    _indexes_created = False
+
+    @staticmethod
+    def ensure_indexes():
+        """Create the watchlist indexes once per process"""
+        if Watchlist._indexes_created:
+            return
+        collection = db.get_collection(Watchlist.COLLECTION)
+        collection.create_index([('case_id', ASCENDING)], unique=True)
+        collection.create_index([('user_id', ASCENDING)])
+        collection.create_index([('updated_at', ASCENDING)])
+        Watchlist._indexes_created = True
+
+    @staticmethod
+    def _public(entry):
+        if entry:
+            entry['_id'] = str(entry['_id'])
+        return entry
+
+    @staticmethod
+    def watch(case, user_id, interval_seconds):
+        """Add a case to the watchlist or change its interval; the first rescrape is due after one interval"""
+        Watchlist.ensure_indexes()
+        collection = db.get_collection(Watchlist.COLLECTION)
+
+        now = datetime.utcnow()
+        entry = collection.find_one_and_update(
+            {'case_id': case['_id']},
+            {
+                '$set': {
+                    'user_id': user_id,
+                    'platform': case['platform'],
+                    'target_username': case['target_username'],
+                    'risk_level': case.get('risk_level'),
+                    'interval_seconds': interval_seconds,
+                    'next_due_at': now + timedelta(seconds=interval_seconds),
+                    'active': True,
+                    'updated_at': now
+                },
+                '$setOnInsert': {
+                    'last_run_at': None,
+                    'last_job_id': None,
+                    'runs': 0,
+                    'created_at': now
+                }
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return Watchlist._public(entry)
+
+    @staticmethod
+    def unwatch(case_id):
+        """
+        Stop watching a case
+        Entries are deactivated rather than deleted so the scheduler sees the change on its next sync
+        """
+        collection = db.get_collection(Watchlist.COLLECTION)
+        result = collection.update_one(
+            {'case_id': case_id, 'active': True},
+            {'$set': {'active': False, 'updated_at': datetime.utcnow()}}
+        )
+        return result.modified_count == 1
+
+    @staticmethod
+    def find_by_case(case_id):
+        """Find the watchlist entry of a case"""
+        collection = db.get_collection(Watchlist.COLLECTION)
+        return Watchlist._public(collection.find_one({'case_id': case_id}))
+
+    @staticmethod
+    def find_by_user(user_id):
+        """Active watchlist entries of a user"""
+        collection = db.get_collection(Watchlist.COLLECTION)
+        entries = collection.find({'user_id': user_id, 'active': True}).sort('next_due_at', ASCENDING)
+        return [Watchlist._public(entry) for entry in entries]
+
+    @staticmethod
+    def iter_schedule(changed_since=None):
+        """
+        Stream the scheduling fields of watchlist entries
+        Without changed_since only active entries are returned (full load);
+        with it, every entry changed since then, including deactivated ones
+        """
+        Watchlist.ensure_indexes()
+        collection = db.get_collection(Watchlist.COLLECTION)
+        query = {'active': True} if changed_since is None else {'updated_at': {'$gt': changed_since}}
+        for entry in collection.find(query, Watchlist.SCHEDULE_FIELDS).batch_size(1000):
+            yield Watchlist._public(entry)
+
+    @staticmethod
+    def update_risk(case_id, risk_level):
+        """Keep the entry's risk level in step with the case so the scheduler can prioritize it"""
+        collection = db.get_collection(Watchlist.COLLECTION)
+        collection.update_one(
+            {'case_id': case_id, 'risk_level': {'$ne': risk_level}},
+            {'$set': {'risk_level': risk_level, 'updated_at': datetime.utcnow()}}
+        )
+
+    @staticmethod
+    def mark_scheduled(schedule):
+        """
+        Record next due times (and jobs just queued) for many entries in one bulk write
+        schedule: iterable of (case_id, next_due_at, job_id or None)
+        updated_at is left alone: the scheduler already knows about its own changes
+        """
+        now = datetime.utcnow()
+        operations = []
+        for case_id, next_due_at, job_id in schedule:
+            update = {'$set': {'next_due_at': next_due_at}}
+            if job_id:
+                update['$set'].update(last_job_id=job_id, last_run_at=now)
+                update['$inc'] = {'runs': 1}
+            operations.append(UpdateOne({'case_id': case_id}, update))
+        if operations:
+            db.get_collection(Watchlist.COLLECTION).bulk_write(operations, ordered=False)
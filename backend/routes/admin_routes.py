@@ -8,6 +8,11 @@ from middleware.auth import admin_required
 from models.user import User
 from models.case import Case
 from models.audit_log import AuditLog
+from services.circuit_breaker import circuit_breakers
+from services.platform_clients import platform_clients
+from services.rate_limiter import rate_limiter
+from services.report_cache import get_report_cache
+from services.report_charts import get_chart_cache
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -183,3 +188,29 @@ def get_statistics():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/scraper-status', methods=['GET'])
+@admin_required
+def get_scraper_status():
+    """Get real-scraping rate limits, API client health and circuit breaker state per platform"""
+    try:
+        return jsonify({
+            'rate_limits': rate_limiter.stats(),
+            'api_clients': platform_clients.stats(),
+            'circuit_breakers': circuit_breakers.stats()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/report-cache', methods=['GET'])
+@admin_required
+def get_report_cache_stats():
+    """Hit/miss counters and size of this process's report rendering and chart caches"""
+    try:
+        stats = get_report_cache().stats()
+        stats['chart_cache'] = get_chart_cache().stats()
+        return jsonify(stats), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -3,14 +3,26 @@ Case Routes
 Investigation case management endpoints
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from middleware.auth import jwt_required_custom, investigator_required
 from middleware.validation import validate_request
 from models.case import Case
 from models.audit_log import AuditLog
-from services.scraper_service import ScraperService
-from services.analysis_service import AnalysisService
-from utils.hash_utils import generate_evidence_hash
+from models.case_post import CasePost
+from models.job import Job
+from models.watchlist import Watchlist
+from routes.job_routes import wants_async, job_accepted
+from services.analytics_export import FORMAT_JSONL, FORMAT_PARQUET, FORMATS, AnalyticsExport, parquet_available
+from services.case_pipeline import CasePipeline
+from services.evidence_export import EvidenceExport, verify_manifest
+from services.job_service import JobService
+from services.post_cache import PostCache
+from services.snapshot_service import SnapshotService
+from services.scrape_engine import AsyncScrapeEngine
+from services.rate_limiter import RateLimitTimeout
+import json
+import queue
+import threading
 
 case_bp = Blueprint('case', __name__)
 
@@ -92,9 +104,15 @@ def get_case(case_id):
 @case_bp.route('/<case_id>/scrape', methods=['POST'])
 @investigator_required
 def scrape_data(case_id):
-    """Scrape data for a case"""
+    """
+    Scrape data for a case
+    Optional body: {"full_history": true, "max_posts", "since", "until", "resume"}
+    or {"delta": true} to fetch only posts newer than the last snapshot.
+    With {"async": true} or "Prefer: respond-async" the scrape runs as a background job (202).
+    """
     try:
-        case = Case.find_by_id(case_id)
+        options = request.get_json(silent=True) or {}
+        case = Case.find_by_id(case_id, include_posts=False)
         
         if not case:
             return jsonify({'error': 'Case not found'}), 404
@@ -103,43 +121,126 @@ def scrape_data(case_id):
         if case['investigator_id'] != request.current_user['_id']:
             return jsonify({'error': 'Unauthorized access'}), 403
         
-        # Scrape data
-        scraper = ScraperService()
-        scraped_data = scraper.scrape_profile(
-            platform=case['platform'],
-            username=case['target_username']
-        )
+        try:
+            options = CasePipeline.parse_scrape_options(options)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Add to case
-        Case.add_collected_data(case_id, scraped_data)
+        if wants_async():
+            job_id = JobService.enqueue(
+                Job.TYPE_SCRAPE, case_id, request.current_user['_id'],
+                payload=options, ip_address=request.remote_addr
+            )
+            return job_accepted(job_id)
         
-        # Generate evidence hash
-        evidence_hash = generate_evidence_hash(scraped_data)
-        Case.update_evidence_hash(case_id, evidence_hash)
+        # Scrape data
+        scraped_data, evidence_hash, details = CasePipeline.scrape(case, options)
         
         # Log action
         AuditLog.log(
             user_id=request.current_user['_id'],
             action=AuditLog.ACTION_DATA_SCRAPE,
-            details={'case_id': case_id},
+            details=details,
             ip_address=request.remote_addr
         )
         
+        if options.get('full_history'):
+            message = 'Post history scraped successfully'
+        elif options.get('delta'):
+            message = 'Delta scrape completed'
+        else:
+            message = 'Data scraped successfully'
+        
         return jsonify({
-            'message': 'Data scraped successfully',
+            'message': message,
             'data': scraped_data,
             'evidence_hash': evidence_hash
         }), 200
         
+    except RateLimitTimeout as e:
+        response = jsonify({'error': str(e), 'retry_after': e.retry_after})
+        response.headers['Retry-After'] = str(int(e.retry_after) + 1)
+        return response, 429
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@case_bp.route('/batch-scrape', methods=['POST'])
+@investigator_required
+@validate_request('case_ids')
+def batch_scrape():
+    """
+    Scrape several cases concurrently
+    Streams one JSON line per case (application/x-ndjson) as each target finishes
+    """
+    try:
+        data = request.get_json()
+        case_ids = data['case_ids']
+        user_id = request.current_user['_id']
+        
+        if not isinstance(case_ids, list) or not case_ids:
+            return jsonify({'error': 'case_ids must be a non-empty list'}), 400
+        
+        max_targets = current_app.config.get('SCRAPE_BATCH_MAX_TARGETS', 100)
+        if len(case_ids) > max_targets:
+            return jsonify({'error': f'At most {max_targets} cases per batch'}), 400
+        
+        targets = []
+        for case_id in dict.fromkeys(case_ids):
+            case = Case.find_by_id(case_id, include_posts=False)
+            
+            # Verify ownership
+            if not case or case['investigator_id'] != user_id:
+                return jsonify({'error': f'Case not found or unauthorized: {case_id}'}), 404
+            
+            targets.append({
+                'case_id': case_id,
+                'platform': case['platform'],
+                'username': case['target_username']
+            })
+        
+        engine = AsyncScrapeEngine()
+        ip_address = request.remote_addr
+        
+        def generate():
+            for result in engine.iter_results(targets):
+                line = {
+                    'case_id': result['case_id'],
+                    'platform': result['platform'],
+                    'username': result['username'],
+                    'status': result['status'],
+                    'elapsed_ms': result['elapsed_ms']
+                }
+                
+                if result['status'] == 'ok':
+                    try:
+                        line['evidence_hash'] = SnapshotService.store(result['case_id'], result['data'])
+                        line['posts_collected'] = len(result['data'].get('posts', []))
+                        
+                        AuditLog.log(
+                            user_id=user_id,
+                            action=AuditLog.ACTION_DATA_SCRAPE,
+                            details={'case_id': result['case_id'], 'batch': True},
+                            ip_address=ip_address
+                        )
+                    except Exception as e:
+                        line['status'] = 'error'
+                        line['error'] = str(e)
+                else:
+                    line['error'] = result['error']
+                
+                yield json.dumps(line, default=str) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @case_bp.route('/<case_id>/analyze', methods=['POST'])
 @investigator_required
 def analyze_case(case_id):
-    """Analyze case data for fraud and cyberbullying"""
+    """Analyze case data for fraud and cyberbullying (202 + job with {"async": true})"""
     try:
-        case = Case.find_by_id(case_id)
+        case = Case.find_by_id(case_id, include_posts=False)
         
         if not case:
             return jsonify({'error': 'Case not found'}), 404
@@ -152,22 +253,14 @@ def analyze_case(case_id):
         if not case.get('data_collected'):
             return jsonify({'error': 'No data collected yet'}), 400
         
-        # Perform analysis
-        analyzer = AnalysisService()
-        analysis_results = analyzer.analyze_all(case['data_collected'])
-        
-        # Calculate risk score and level
-        risk_score = analysis_results['risk_score']
-        risk_level = Case.RISK_LOW
-        if risk_score >= 75:
-            risk_level = Case.RISK_CRITICAL
-        elif risk_score >= 50:
-            risk_level = Case.RISK_HIGH
-        elif risk_score >= 25:
-            risk_level = Case.RISK_MEDIUM
+        if wants_async():
+            job_id = JobService.enqueue(
+                Job.TYPE_ANALYZE, case_id, request.current_user['_id'], ip_address=request.remote_addr
+            )
+            return job_accepted(job_id)
         
-        # Update case with analysis
-        Case.update_analysis(case_id, analysis_results, risk_score, risk_level)
+        # Perform analysis and update the case risk score and level
+        analysis_results, risk_score, risk_level = CasePipeline.analyze(case)
         
         # Log action
         AuditLog.log(
@@ -187,6 +280,214 @@ def analyze_case(case_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _sse(event, data):
+    """Format one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@case_bp.route('/<case_id>/investigate', methods=['POST'])
+@investigator_required
+def investigate_case(case_id):
+    """
+    Run scrape -> evidence hash -> analyze -> optional report and stream progress (text/event-stream)
+    Body takes the scrape options plus {"report": true, "encryption_password"} to end with a report.
+    Events: stage_started, progress, stage_completed, result, error.
+    """
+    try:
+        options = request.get_json(silent=True) or {}
+        case = Case.find_by_id(case_id, include_posts=False)
+        
+        if not case:
+            return jsonify({'error': 'Case not found'}), 404
+        
+        # Verify ownership
+        if case['investigator_id'] != request.current_user['_id']:
+            return jsonify({'error': 'Unauthorized access'}), 403
+        
+        try:
+            scrape_options = CasePipeline.parse_scrape_options(options)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        encryption_password = None
+        if options.get('report'):
+            encryption_password = options.get('encryption_password')
+            if not encryption_password:
+                return jsonify({'error': 'encryption_password is required for a report'}), 400
+        
+        app = current_app._get_current_object()
+        user_id = request.current_user['_id']
+        ip_address = request.remote_addr
+        keepalive = app.config.get('INVESTIGATION_KEEPALIVE_SECONDS', 15)
+        events = queue.Queue()
+        
+        def run():
+            # The pipeline keeps running if the client disconnects; the audit log still records it
+            timings = {}
+            
+            def emit(event, data):
+                if event == 'stage_completed':
+                    timings[data['stage']] = data['elapsed_ms']
+                events.put((event, data))
+            
+            with app.app_context():
+                details = {'case_id': case_id, 'options': scrape_options, 'report': bool(encryption_password)}
+                try:
+                    summary = CasePipeline.investigate(
+                        case, user_id, scrape_options,
+                        encryption_password=encryption_password, emit=emit
+                    )
+                    details.update(
+                        evidence_hash=summary['evidence_hash'],
+                        risk_score=summary['risk_score'],
+                        report_id=summary['report_id'],
+                        timings_ms=timings,
+                        total_ms=summary['total_ms']
+                    )
+                    events.put(('result', summary))
+                except Exception as e:
+                    details.update(error=str(e), timings_ms=timings)
+                    error = {'error': str(e)}
+                    if isinstance(e, RateLimitTimeout):
+                        error['retry_after'] = e.retry_after
+                    events.put(('error', error))
+                finally:
+                    AuditLog.log(
+                        user_id=user_id,
+                        action=AuditLog.ACTION_INVESTIGATION,
+                        details=details,
+                        ip_address=ip_address
+                    )
+                    events.put(None)
+        
+        threading.Thread(target=run, name=f"investigate-{case_id}", daemon=True).start()
+        
+        def generate():
+            while True:
+                try:
+                    item = events.get(timeout=keepalive)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ': keepalive\n\n'
+                    continue
+                if item is None:
+                    return
+                yield _sse(*item)
+        
+        response = Response(generate(), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@case_bp.route('/<case_id>/export', methods=['POST'])
+@investigator_required
+def export_case(case_id):
+    """
+    Stream the case's raw evidence as a ZIP: snapshots, analysis, audit trail, reports
+    and a signed manifest of per-file SHA-256 hashes; optional {"encryption_password"} for AES
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        encryption_password = data.get('encryption_password')
+        
+        case = Case.find_by_id(case_id, include_posts=False)
+        
+        if not case:
+            return jsonify({'error': 'Case not found'}), 404
+        
+        # Verify ownership (unless admin)
+        if request.current_user['role'] != 'admin':
+            if case['investigator_id'] != request.current_user['_id']:
+                return jsonify({'error': 'Unauthorized access'}), 403
+        
+        if encryption_password and not EvidenceExport.encryption_available():
+            return jsonify({'error': 'Encrypted exports need the optional pyzipper package'}), 501
+        
+        export = EvidenceExport(case, request.current_user['_id'], encryption_password=encryption_password)
+        
+        # Log action (before streaming, so the export itself is part of the exported audit trail)
+        AuditLog.log(
+            user_id=request.current_user['_id'],
+            action=AuditLog.ACTION_EXPORT_EVIDENCE,
+            details={'case_id': case_id, 'encrypted': bool(encryption_password)},
+            ip_address=request.remote_addr
+        )
+        
+        response = Response(stream_with_context(export.iter_bytes()), mimetype='application/zip')
+        response.headers['Content-Disposition'] = f'attachment; filename="{export.filename}"'
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@case_bp.route('/export/verify', methods=['POST'])
+@jwt_required_custom
+@validate_request('manifest', 'signature')
+def verify_export():
+    """Check that an export manifest (manifest.json contents) was signed by this server"""
+    try:
+        data = request.get_json()
+        valid = verify_manifest(data['manifest'].encode('utf-8'), data['signature'])
+        
+        return jsonify({'valid': valid}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@case_bp.route('/<case_id>/export/analytics', methods=['GET'])
+@investigator_required
+def export_analytics(case_id):
+    """
+    Stream the latest posts with per-post analysis as rows for analytics tools
+    Query: format=jsonl|parquet, since/until (ISO-8601 post timestamps), flags=cyberbullying,fraud,negative
+    """
+    try:
+        export_format = request.args.get('format', FORMAT_JSONL)
+        if export_format not in FORMATS:
+            return jsonify({'error': f"format must be one of {', '.join(FORMATS)}"}), 400
+        if export_format == FORMAT_PARQUET and not parquet_available():
+            return jsonify({'error': 'Parquet export needs the optional pyarrow package'}), 501
+        
+        case = Case.find_by_id(case_id, include_posts=False)
+        
+        if not case:
+            return jsonify({'error': 'Case not found'}), 404
+        
+        # Verify ownership (unless admin)
+        if request.current_user['role'] != 'admin':
+            if case['investigator_id'] != request.current_user['_id']:
+                return jsonify({'error': 'Unauthorized access'}), 403
+        
+        flags = [flag.strip() for flag in request.args.get('flags', '').split(',') if flag.strip()]
+        try:
+            export = AnalyticsExport(case, since=request.args.get('since'), until=request.args.get('until'), flags=flags)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Log action
+        AuditLog.log(
+            user_id=request.current_user['_id'],
+            action=AuditLog.ACTION_EXPORT_ANALYTICS,
+            details={'case_id': case_id, 'format': export_format, 'flags': flags,
+                     'since': request.args.get('since'), 'until': request.args.get('until')},
+            ip_address=request.remote_addr
+        )
+        
+        if export_format == FORMAT_PARQUET:
+            body, mimetype = export.iter_parquet(), 'application/vnd.apache.parquet'
+        else:
+            body, mimetype = export.iter_jsonl(), 'application/x-ndjson'
+        response = Response(stream_with_context(body), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename="case_{case_id}.{export_format}"'
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @case_bp.route('/<case_id>/complete', methods=['POST'])
 @investigator_required
 def complete_case(case_id):
@@ -235,6 +536,9 @@ def delete_case(case_id):
         
         # Delete the case
         Case.delete(case_id)
+        PostCache().invalidate(case_id)
+        CasePost.delete_by_case(case_id)
+        Watchlist.unwatch(case_id)
         
         # Log action
         AuditLog.log(
@@ -0,0 +1,65 @@
+"""
+Job Routes
+Status polling for background scrape, analysis and report jobs
+"""
+
+from flask import Blueprint, request, jsonify
+from middleware.auth import jwt_required_custom
+from models.job import Job
+
+job_bp = Blueprint('job', __name__)
+
+def wants_async():
+    """Clients opt in to background jobs with 'Prefer: respond-async' or {"async": true}"""
+    if 'respond-async' in request.headers.get('Prefer', '').lower():
+        return True
+    return bool((request.get_json(silent=True) or {}).get('async'))
+
+def job_accepted(job_id):
+    """202 Accepted response pointing at the job status endpoint"""
+    status_url = f"/api/jobs/{job_id}"
+    response = jsonify({
+        'message': 'Job queued',
+        'job_id': job_id,
+        'status': Job.STATUS_QUEUED,
+        'status_url': status_url
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
+@job_bp.route('/<job_id>', methods=['GET'])
+@jwt_required_custom
+def get_job(job_id):
+    """Get job status, progress and result"""
+    try:
+        job = Job.find_by_id(job_id)
+
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+
+        # Verify ownership (unless admin)
+        if request.current_user['role'] != 'admin':
+            if job['user_id'] != request.current_user['_id']:
+                return jsonify({'error': 'Unauthorized access'}), 403
+
+        return jsonify({
+            'job': job
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@job_bp.route('/', methods=['GET'])
+@jwt_required_custom
+def get_my_jobs():
+    """Get the current user's recent jobs, optionally for one case (?case_id=)"""
+    try:
+        jobs = Job.find_by_user(request.current_user['_id'], case_id=request.args.get('case_id'))
+
+        return jsonify({
+            'jobs': jobs,
+            'count': len(jobs)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
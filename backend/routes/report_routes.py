@@ -3,13 +3,19 @@ Report Routes
 Forensic report generation and download endpoints
 """
 
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, current_app, url_for
 from middleware.auth import investigator_required
 from middleware.validation import validate_request
 from models.case import Case
 from models.report import Report
+from models.user import User
 from models.audit_log import AuditLog
-from services.report_service import ReportService
+from models.job import Job
+from routes.job_routes import wants_async, job_accepted
+from services.batch_report_service import BatchReportService
+from services.case_pipeline import CasePipeline
+from services.job_service import JobService
+from services.report_download import DownloadTokenError, IntegrityError, RangeNotSatisfiable, ReportDownload, issue_download_token, record_integrity_failure, verify_download_token
 import os
 
 report_bp = Blueprint('report', __name__)
@@ -18,13 +24,14 @@ report_bp = Blueprint('report', __name__)
 @investigator_required
 @validate_request('case_id', 'encryption_password')
 def generate_report():
-    """Generate encrypted forensic PDF report"""
+    """Generate encrypted forensic PDF report (202 + job with {"async": true})"""
     try:
         data = request.get_json()
         case_id = data['case_id']
         encryption_password = data['encryption_password']
         
-        case = Case.find_by_id(case_id)
+        # The report only needs snapshot summaries, not the posts themselves
+        case = Case.find_by_id(case_id, include_posts=False)
         
         if not case:
             return jsonify({'error': 'Case not found'}), 404
@@ -38,42 +45,113 @@ def generate_report():
         if not case.get('data_collected'):
             return jsonify({'error': 'No data collected yet. Please scrape data first.'}), 400
         
-        # Generate report
-        report_service = ReportService()
-        report_data = report_service.generate_pdf_report(case, encryption_password)
-        
-        # Save report record
-        report_id = Report.create(
-            case_id=case_id,
-            investigator_id=request.current_user['_id'],
-            file_path=report_data['file_path'],
-            file_hash=report_data['file_hash'],
-            encryption_hash=report_data['encryption_hash']
+        if wants_async():
+            # The password is kept on the job only until the job finishes
+            job_id = JobService.enqueue(
+                Job.TYPE_REPORT, case_id, request.current_user['_id'],
+                secret={'encryption_password': encryption_password},
+                ip_address=request.remote_addr
+            )
+            return job_accepted(job_id)
+        
+        # Generate report and save its record (or reuse an identical one)
+        report_id, report_data = CasePipeline.generate_report(
+            case, request.current_user['_id'], encryption_password
         )
         
         # Log action
         AuditLog.log(
             user_id=request.current_user['_id'],
             action=AuditLog.ACTION_GENERATE_REPORT,
-            details={'case_id': case_id, 'report_id': report_id},
+            details={'case_id': case_id, 'report_id': report_id, 'reused': report_data['reused']},
             ip_address=request.remote_addr
         )
         
+        if report_data['reused']:
+            return jsonify({
+                'message': 'Report is up to date',
+                'report_id': report_id,
+                'file_hash': report_data['file_hash'],
+                'reused': True
+            }), 200
+        
         return jsonify({
             'message': 'Report generated successfully',
             'report_id': report_id,
-            'file_hash': report_data['file_hash']
+            'file_hash': report_data['file_hash'],
+            'reused': False
         }), 201
         
     except Exception as e:
         print(f"Report generation error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@report_bp.route('/batch', methods=['POST'])
+@investigator_required
+@validate_request('case_ids', 'encryption_password')
+def generate_batch_reports():
+    """
+    Generate reports for several cases (202 + job with {"async": true}, or whenever the batch
+    is larger than REPORT_BATCH_SYNC_MAX_CASES; the job worker renders them in parallel processes)
+    Failed cases are listed in the manifest and do not stop the others
+    """
+    try:
+        data = request.get_json()
+        case_ids = data['case_ids']
+        encryption_password = data['encryption_password']
+        user_id = request.current_user['_id']
+        
+        if not isinstance(case_ids, list) or not case_ids:
+            return jsonify({'error': 'case_ids must be a non-empty list'}), 400
+        
+        max_cases = current_app.config.get('REPORT_BATCH_MAX_CASES', 200)
+        if len(case_ids) > max_cases:
+            return jsonify({'error': f'At most {max_cases} cases per batch'}), 400
+        
+        cases = []
+        for case_id in dict.fromkeys(case_ids):
+            case = Case.find_by_id(case_id, include_posts=False)
+            
+            # Verify ownership (unless admin)
+            if not case or (request.current_user['role'] != 'admin' and case['investigator_id'] != user_id):
+                return jsonify({'error': f'Case not found or unauthorized: {case_id}'}), 404
+            
+            cases.append(case)
+        
+        # Rendering many reports is CPU-bound work that must not hold a web worker
+        if wants_async() or len(cases) > current_app.config.get('REPORT_BATCH_SYNC_MAX_CASES', 3):
+            job_id = JobService.enqueue(
+                Job.TYPE_REPORT_BATCH, None, user_id,
+                payload={'case_ids': [case['_id'] for case in cases]},
+                secret={'encryption_password': encryption_password},
+                ip_address=request.remote_addr
+            )
+            return job_accepted(job_id)
+        
+        # A few reports render in this process; starting a worker pool would cost more than it saves
+        manifest, _, manifest_hash = BatchReportService(max_workers=1).generate(
+            cases, user_id, encryption_password, ip_address=request.remote_addr
+        )
+        
+        return jsonify({
+            'message': f"{manifest['totals']['succeeded']} of {manifest['totals']['requested']} reports generated",
+            'batch_id': manifest['batch_id'],
+            'manifest_hash': manifest_hash,
+            'manifest': manifest
+        }), 200
+        
+    except Exception as e:
+        print(f"Batch report error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @report_bp.route('/<report_id>/download', methods=['POST'])
 @investigator_required
 @validate_request('decryption_password')
-def download_report(report_id):
-    """Download encrypted report (requires password verification)"""
+def request_report_download(report_id):
+    """
+    Verify the report password and issue a short-lived download link
+    The file itself is fetched with GET from that link, so browsers and download managers can resume it
+    """
     try:
         data = request.get_json()
         decryption_password = data['decryption_password']
@@ -96,22 +174,82 @@ def download_report(report_id):
         if not os.path.exists(report['file_path']):
             return jsonify({'error': 'Report file not found'}), 404
         
-        # Increment download count
-        Report.increment_download_count(report_id)
+        token = issue_download_token(report_id, request.current_user['_id'])
+        return jsonify({
+            'download_url': url_for('report.download_report', report_id=report_id, token=token),
+            'expires_in': current_app.config.get('REPORT_DOWNLOAD_TOKEN_TTL', 900),
+            'file_hash': report['file_hash']
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@report_bp.route('/<report_id>/download', methods=['GET'])
+def download_report(report_id):
+    """
+    Download encrypted report, authorized by the token issued after the password check
+    Supports If-None-Match (ETag = file hash) and single-range Range/If-Range for resumed downloads
+    """
+    try:
+        try:
+            user_id = verify_download_token(request.args.get('token'), report_id)
+        except DownloadTokenError as e:
+            return jsonify({'error': str(e)}), 403
+        
+        # The account may have been locked since the link was issued
+        user = User.find_by_id(user_id)
+        if not user or user['status'] != User.STATUS_APPROVED or user.get('account_locked'):
+            return jsonify({'error': 'Unauthorized access'}), 403
+        request.current_user = user
+        
+        report = Report.find_by_id(report_id)
+        
+        if not report:
+            return jsonify({'error': 'Report not found'}), 404
+        
+        # Verify ownership
+        if report['investigator_id'] != user_id:
+            return jsonify({'error': 'Unauthorized access'}), 403
+        
+        # Check if file exists
+        if not os.path.exists(report['file_path']):
+            return jsonify({'error': 'Report file not found'}), 404
+        
+        download = ReportDownload(report)
+        if download.not_modified():
+            response = current_app.response_class(status=304)
+            response.set_etag(download.etag)
+            return response
+        
+        try:
+            byte_range = download.byte_range()
+        except RangeNotSatisfiable as e:
+            response = jsonify({'error': str(e)})
+            response.headers['Content-Range'] = f"bytes */{e.size}"
+            return response, 416
+        
+        try:
+            response = download.response(f"forensic_report_{report_id}.pdf", byte_range)
+        except IntegrityError as e:
+            record_integrity_failure(report, str(e))
+            return jsonify({'error': 'Report file failed integrity verification'}), 409
+        
+        # Resumed transfers are not new downloads
+        if not byte_range or byte_range[0] == 0:
+            Report.increment_download_count(report_id)
         
         # Log action
+        details = {'report_id': report_id}
+        if byte_range:
+            details['range'] = list(byte_range)
         AuditLog.log(
-            user_id=request.current_user['_id'],
+            user_id=user_id,
             action=AuditLog.ACTION_DOWNLOAD_REPORT,
-            details={'report_id': report_id},
+            details=details,
             ip_address=request.remote_addr
         )
         
-        return send_file(
-            report['file_path'],
-            as_attachment=True,
-            download_name=f"forensic_report_{report_id}.pdf"
-        )
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -132,9 +270,10 @@ def get_case_reports(case_id):
         
         reports = Report.find_by_case(case_id)
         
-        # Remove file paths for security
+        # Remove file paths for security (and the bulky chunk hashes)
         for report in reports:
             report.pop('file_path', None)
+            report.pop('integrity', None)
         
         return jsonify({
             'reports': reports,
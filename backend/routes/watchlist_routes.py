@@ -0,0 +1,100 @@
+"""
+Watchlist Routes
+Keep cases under continuous observation with scheduled rescrapes
+"""
+
+from flask import Blueprint, current_app, request, jsonify
+from middleware.auth import investigator_required
+from models.case import Case
+from models.audit_log import AuditLog
+from models.watchlist import Watchlist
+
+watchlist_bp = Blueprint('watchlist', __name__)
+
+def _owned_case(case_id):
+    """Return (case, error response)"""
+    case = Case.find_by_id(case_id, include_posts=False)
+    if not case:
+        return None, (jsonify({'error': 'Case not found'}), 404)
+    if case['investigator_id'] != request.current_user['_id']:
+        return None, (jsonify({'error': 'Unauthorized access'}), 403)
+    return case, None
+
+@watchlist_bp.route('/', methods=['GET'])
+@investigator_required
+def get_watchlist():
+    """Get the current user's watched cases"""
+    try:
+        entries = Watchlist.find_by_user(request.current_user['_id'])
+
+        return jsonify({
+            'watchlist': entries,
+            'count': len(entries)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@watchlist_bp.route('/<case_id>', methods=['PUT'])
+@investigator_required
+def watch_case(case_id):
+    """Watch a case or change its rescrape interval; body: {"interval_minutes"}"""
+    try:
+        case, error = _owned_case(case_id)
+        if error:
+            return error
+
+        data = request.get_json(silent=True) or {}
+        try:
+            interval_minutes = float(data.get('interval_minutes', current_app.config['WATCHLIST_DEFAULT_INTERVAL_MINUTES']))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'interval_minutes must be a number'}), 400
+
+        min_interval = current_app.config['WATCHLIST_MIN_INTERVAL_MINUTES']
+        if interval_minutes < min_interval:
+            return jsonify({'error': f'interval_minutes must be at least {min_interval}'}), 400
+
+        entry = Watchlist.watch(case, request.current_user['_id'], int(interval_minutes * 60))
+
+        # Log action
+        AuditLog.log(
+            user_id=request.current_user['_id'],
+            action=AuditLog.ACTION_UPDATE_CASE,
+            details={'case_id': case_id, 'watchlist': True, 'interval_minutes': interval_minutes},
+            ip_address=request.remote_addr
+        )
+
+        return jsonify({
+            'message': 'Case added to watchlist',
+            'watch': entry
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@watchlist_bp.route('/<case_id>', methods=['DELETE'])
+@investigator_required
+def unwatch_case(case_id):
+    """Stop watching a case"""
+    try:
+        case, error = _owned_case(case_id)
+        if error:
+            return error
+
+        if not Watchlist.unwatch(case_id):
+            return jsonify({'error': 'Case is not on the watchlist'}), 404
+
+        # Log action
+        AuditLog.log(
+            user_id=request.current_user['_id'],
+            action=AuditLog.ACTION_UPDATE_CASE,
+            details={'case_id': case_id, 'watchlist': False},
+            ip_address=request.remote_addr
+        )
+
+        return jsonify({
+            'message': 'Case removed from watchlist'
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -31,7 +31,10 @@ class AnalysisService:
         self.advanced_ai = None
     
     def analyze_all(self, data_collected):
-        """Perform comprehensive analysis on collected data"""
+        """
+        Perform comprehensive analysis on collected data
+        Snapshot posts may be a list of dicts or a PostBatch
+        """
         
         if not data_collected or len(data_collected) == 0:
             return {
@@ -47,6 +50,14 @@ class AnalysisService:
         posts = latest_data.get('posts', [])
         metadata = latest_data.get('metadata', {})
         
+        return self.analyze_posts(posts, metadata)
+    
+    def analyze_posts(self, posts, metadata):
+        """
+        Analyze one snapshot's posts and profile metadata
+        Lets callers pass posts straight from the columnar post cache
+        """
+        
         # Try advanced AI analysis first
         advanced_analysis = self._try_advanced_ai_analysis(posts)
         
@@ -68,19 +79,6 @@ class AnalysisService:
                     cyberbullying_results['ai_score'] = gpt4['cyberbullying_score']
                 if 'fraud_score' in gpt4:
                     fraud_results['ai_score'] = gpt4['fraud_score']
-    
-    def _try_advanced_ai_analysis(self, posts):
-        """Try to use advanced AI analysis if available"""
-        try:
-            # Lazy load advanced AI service
-            if self.advanced_ai is None:
-                from services.advanced_ai_service import AdvancedAIService
-                self.advanced_ai = AdvancedAIService()
-            
-            return self.advanced_ai.get_comprehensive_analysis(posts)
-        except Exception as e:
-            print(f"ℹ️  Advanced AI not available: {e}")
-            return None
         
         # Calculate overall risk score (0-100)
         risk_score = self._calculate_risk_score(
@@ -98,6 +96,19 @@ class AnalysisService:
             'risk_score': risk_score
         }
     
+    def _try_advanced_ai_analysis(self, posts):
+        """Try to use advanced AI analysis if available"""
+        try:
+            # Lazy load advanced AI service
+            if self.advanced_ai is None:
+                from services.advanced_ai_service import AdvancedAIService
+                self.advanced_ai = AdvancedAIService()
+            
+            return self.advanced_ai.get_comprehensive_analysis(posts)
+        except Exception as e:
+            print(f"ℹ️  Advanced AI not available: {e}")
+            return None
+    
     def analyze_sentiment(self, posts):
         """Analyze sentiment of posts"""
         if not posts:
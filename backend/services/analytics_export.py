@@ -0,0 +1,304 @@
+"""
+Analytics Export Service
+Streams a case's latest posts, with their per-post analysis and snapshot metadata, as newline-delimited
+JSON or Parquet with a fixed schema (one row per post)
+Posts are read from the post cache or a database cursor and written in row groups, so memory stays bounded
+Parquet needs the optional pyarrow package
+"""
+
+import json
+import os
+from flask import current_app
+from services.post_cache import PostCache
+from utils.post_batch import micros_to_isoformat, timestamp_to_micros
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+FORMAT_JSONL = 'jsonl'
+FORMAT_PARQUET = 'parquet'
+FORMATS = (FORMAT_JSONL, FORMAT_PARQUET)
+
+# Row filters: a post is kept when it carries any of the requested flags
+FLAGS = ('cyberbullying', 'fraud', 'negative')
+
+# Schema version, written to Parquet metadata; bump it when COLUMNS change
+SCHEMA_VERSION = '1'
+
+# (column, Parquet type) in schema order; timestamps are UTC (ISO-8601 strings in JSONL)
+COLUMNS = (
+    ('case_id', 'string'),
+    ('platform', 'string'),
+    ('target_username', 'string'),
+    ('evidence_hash', 'string'),
+    ('snapshot_id', 'string'),
+    ('scraped_at', 'timestamp'),
+    ('seq', 'int64'),
+    ('post_id', 'string'),
+    ('timestamp', 'timestamp'),
+    ('content', 'string'),
+    ('likes', 'int64'),
+    ('comments', 'int64'),
+    ('shares', 'int64'),
+    ('hashtags', 'list<string>'),
+    ('subreddit', 'string'),
+    ('awards', 'int64'),
+    ('sentiment', 'string'),
+    ('polarity', 'float64'),
+    ('subjectivity', 'float64'),
+    ('cyberbullying', 'bool'),
+    ('cyberbullying_severity', 'string'),
+    ('cyberbullying_keywords', 'list<string>'),
+    ('fraud', 'bool'),
+    ('fraud_risk_level', 'string'),
+    ('fraud_patterns', 'list<string>')
+)
+
+
+def parquet_available():
+    return pa is not None
+
+
+def parquet_schema(exclude=()):
+    """pyarrow schema of COLUMNS (partitioned datasets leave the partition column out of the files)"""
+    types = {
+        'string': pa.string(),
+        'int64': pa.int64(),
+        'float64': pa.float64(),
+        'bool': pa.bool_(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+        'list<string>': pa.list_(pa.string())
+    }
+    fields = [pa.field(name, types[kind]) for name, kind in COLUMNS if name not in exclude]
+    return pa.schema(fields, metadata={'sft.schema_version': SCHEMA_VERSION})
+
+
+def _micros(value):
+    if not value:
+        return None
+    try:
+        return timestamp_to_micros(value)[0]
+    except (TypeError, ValueError):
+        return None
+
+
+class _StreamSink:
+    """Write-only file for ParquetWriter; written bytes are drained after every row group"""
+
+    def __init__(self):
+        self._chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class AnalyticsExport:
+    """
+    Export rows of one case (case document, posts not needed)
+    since/until (ISO-8601) bound the post timestamp; flags keeps only posts with any of those flags
+    Only the latest snapshot is exported, since it is the one the stored analysis describes
+    """
+
+    def __init__(self, case, since=None, until=None, flags=None, row_group_rows=None):
+        try:
+            self.since = timestamp_to_micros(since)[0] if since else None
+            self.until = timestamp_to_micros(until)[0] if until else None
+        except (TypeError, ValueError):
+            raise ValueError('since/until must be ISO-8601 dates')
+        self.flags = tuple(flags or ())
+        unknown = [flag for flag in self.flags if flag not in FLAGS]
+        if unknown:
+            raise ValueError(f"Unknown flag {unknown[0]}; use {', '.join(FLAGS)}")
+        self.case = case
+        self.row_group_rows = row_group_rows or current_app.config.get('EXPORT_ROW_GROUP_ROWS', 10000)
+
+    def _post_analysis(self):
+        """Per-post results from the case analysis, keyed by post ID"""
+        analysis = self.case.get('analysis_results') or {}
+        sentiments = {
+            str(item.get('post_id')): item
+            for item in (analysis.get('sentiment') or {}).get('detailed_sentiments') or []
+        }
+        incidents = {
+            str(item.get('post_id')): item
+            for item in (analysis.get('cyberbullying') or {}).get('incidents') or []
+        }
+        suspicious = {
+            str(item.get('post_id')): item
+            for item in (analysis.get('fraud_detection') or {}).get('suspicious_posts') or []
+        }
+        return sentiments, incidents, suspicious
+
+    def iter_rows(self):
+        """Yield one dict per post in COLUMNS order; timestamps as UTC microseconds"""
+        case = self.case
+        snapshots = case.get('data_collected') or []
+        if not snapshots:
+            return
+        latest = snapshots[-1]
+        sentiments, incidents, suspicious = self._post_analysis()
+        shared = {
+            'case_id': case['_id'],
+            'platform': case.get('platform'),
+            'target_username': case.get('target_username'),
+            'evidence_hash': case.get('evidence_hash'),
+            'snapshot_id': latest.get('snapshot_id'),
+            'scraped_at': _micros(latest.get('scraped_at'))
+        }
+
+        for seq, post in enumerate(PostCache().iter_case_posts(case)):
+            timestamp = _micros(post.get('timestamp'))
+            if self.since is not None and (timestamp is None or timestamp < self.since):
+                continue
+            if self.until is not None and (timestamp is None or timestamp > self.until):
+                continue
+
+            post_id = str(post.get('post_id'))
+            sentiment = sentiments.get(post_id) or {}
+            incident = incidents.get(post_id)
+            fraud = suspicious.get(post_id)
+            if self.flags and not (
+                ('cyberbullying' in self.flags and incident)
+                or ('fraud' in self.flags and fraud)
+                or ('negative' in self.flags and sentiment.get('sentiment') == 'negative')
+            ):
+                continue
+
+            row = dict(shared)
+            row.update({
+                'seq': seq,
+                'post_id': post_id,
+                'timestamp': timestamp,
+                'content': post.get('content'),
+                'likes': post.get('likes'),
+                'comments': post.get('comments'),
+                'shares': post.get('shares'),
+                'hashtags': list(post.get('hashtags') or []),
+                'subreddit': post.get('subreddit'),
+                'awards': post.get('awards'),
+                'sentiment': sentiment.get('sentiment'),
+                'polarity': sentiment.get('polarity'),
+                'subjectivity': sentiment.get('subjectivity'),
+                'cyberbullying': incident is not None,
+                'cyberbullying_severity': incident.get('severity') if incident else None,
+                'cyberbullying_keywords': list(incident.get('matched_keywords') or []) if incident else [],
+                'fraud': fraud is not None,
+                'fraud_risk_level': fraud.get('risk_level') if fraud else None,
+                'fraud_patterns': list(fraud.get('patterns') or []) if fraud else []
+            })
+            yield row
+
+    def iter_batches(self):
+        """Rows grouped into lists of at most row_group_rows"""
+        batch = []
+        for row in self.iter_rows():
+            batch.append(row)
+            if len(batch) >= self.row_group_rows:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def iter_jsonl(self):
+        """Yield newline-delimited JSON, one encoded chunk per row group"""
+        for batch in self.iter_batches():
+            lines = []
+            for row in batch:
+                row['scraped_at'] = micros_to_isoformat(row['scraped_at'], True) if row['scraped_at'] is not None else None
+                row['timestamp'] = micros_to_isoformat(row['timestamp'], True) if row['timestamp'] is not None else None
+                lines.append(json.dumps(row, default=str) + '\n')
+            yield ''.join(lines).encode('utf-8')
+
+    def iter_parquet(self):
+        """Yield a Parquet file as it is written, one chunk per row group"""
+        if pa is None:
+            raise RuntimeError('Parquet export needs the optional pyarrow package')
+        schema = parquet_schema()
+        sink = _StreamSink()
+        writer = pq.ParquetWriter(sink, schema, compression=current_app.config.get('EXPORT_PARQUET_COMPRESSION', 'snappy'))
+        try:
+            for batch in self.iter_batches():
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                yield sink.drain()
+        finally:
+            # Closing writes the footer; a file without rows still carries the schema
+            writer.close()
+        yield sink.drain()
+
+
+class ParquetDataset:
+    """
+    Many cases exported into one Parquet dataset, hive-partitioned by platform:
+    <folder>/platform=<platform>/part-0.parquet with the platform column taken from the directory
+    One writer stays open per platform while cases are streamed into it
+    """
+
+    PARTITION = 'platform'
+
+    def __init__(self, folder):
+        if pa is None:
+            raise RuntimeError('Parquet export needs the optional pyarrow package')
+        self.folder = folder
+        self.schema = parquet_schema(exclude=(self.PARTITION,))
+        self._writers = {}
+        self.rows = {}
+
+    def _writer(self, platform):
+        if platform not in self._writers:
+            folder = os.path.join(self.folder, f"{self.PARTITION}={platform}")
+            os.makedirs(folder, exist_ok=True)
+            temp_path = os.path.join(folder, '.part-0.parquet.tmp')
+            writer = pq.ParquetWriter(
+                temp_path, self.schema,
+                compression=current_app.config.get('EXPORT_PARQUET_COMPRESSION', 'snappy')
+            )
+            self._writers[platform] = (writer, temp_path, os.path.join(folder, 'part-0.parquet'))
+            self.rows[platform] = 0
+        return self._writers[platform][0]
+
+    def add(self, export):
+        """Append the rows of one AnalyticsExport; returns the number of rows written"""
+        platform = export.case.get('platform') or 'unknown'
+        written = 0
+        for batch in export.iter_batches():
+            for row in batch:
+                del row[self.PARTITION]
+            self._writer(platform).write_table(pa.Table.from_pylist(batch, schema=self.schema))
+            written += len(batch)
+        self.rows[platform] = self.rows.get(platform, 0) + written
+        return written
+
+    def close(self):
+        """Finish every partition file; readers never see a partially written one"""
+        for writer, temp_path, final_path in self._writers.values():
+            writer.close()
+            os.replace(temp_path, final_path)
+        paths = [final_path for _, _, final_path in self._writers.values()]
+        self._writers = {}
+        return paths
+
+    def abort(self):
+        """Drop unfinished partition files"""
+        for writer, temp_path, _ in self._writers.values():
+            writer.close()
+            os.remove(temp_path)
+        self._writers = {}
@@ -0,0 +1,192 @@
+"""
+Batch Report Service
+Renders reports for many cases in a pool of worker processes and writes a manifest of their hashes
+Report rendering is CPU-bound in reportlab, so processes rather than threads give real parallelism
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from flask import current_app
+from models.audit_log import AuditLog
+from services.case_pipeline import CasePipeline
+
+# Set in each pool process by _init_worker
+_worker_app = None
+
+
+def _init_worker():
+    """Every pool process builds its own app: config, database clients and report theme"""
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app()
+
+
+def _generate(case, investigator_id, encryption_password, app=None):
+    """
+    Render one case's report; runs in a pool process (or inline with app given)
+    Errors are returned rather than raised so one case cannot fail the batch
+    """
+    started = time.perf_counter()
+    entry = {
+        'case_id': case['_id'],
+        'target_username': case.get('target_username'),
+        'platform': case.get('platform')
+    }
+    try:
+        with (app or _worker_app).app_context():
+            report_id, report_data = CasePipeline.generate_report(case, investigator_id, encryption_password)
+        entry.update(
+            status='ok',
+            report_id=report_id,
+            file_name=os.path.basename(report_data['file_path']),
+            file_hash=report_data['file_hash'],
+            reused=report_data['reused']
+        )
+    except Exception as e:
+        entry.update(status='error', error=str(e))
+    entry['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return entry
+
+
+class BatchReportService:
+    """Generates one report per case with a bounded number of worker processes"""
+
+    def __init__(self, max_workers=None):
+        config = current_app.config
+        self.max_workers = config.get('REPORT_BATCH_MAX_WORKERS', os.cpu_count() or 1) if max_workers is None else max_workers
+        self.report_folder = config.get('REPORT_FOLDER', 'reports')
+
+    @staticmethod
+    def _pool(workers):
+        # spawn: forked children would inherit the parent's MongoDB clients and locks
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker
+        )
+
+    @staticmethod
+    def _crashed(case):
+        return {
+            'case_id': case['_id'],
+            'target_username': case.get('target_username'),
+            'platform': case.get('platform'),
+            'status': 'error',
+            'error': 'Report worker process crashed'
+        }
+
+    def iter_results(self, cases, investigator_id, encryption_password):
+        """Yield one manifest entry per case as its report finishes (completion order)"""
+        workers = min(self.max_workers, len(cases))
+        if workers <= 1:
+            # Not worth starting processes; also the mode for deployments that forbid them
+            app = current_app._get_current_object()
+            for case in cases:
+                yield _generate(case, investigator_id, encryption_password, app=app)
+            return
+
+        broken = []
+        with self._pool(workers) as pool:
+            futures = {
+                pool.submit(_generate, case, investigator_id, encryption_password): case
+                for case in cases
+            }
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except BrokenProcessPool:
+                    broken.append(futures[future])
+        if not broken:
+            return
+
+        # A dead worker (e.g. killed for memory) fails every unfinished case of the pool.
+        # Retry those one at a time so only the case that kills its worker is reported as failed.
+        print(f"⚠️  Report worker process died; retrying {len(broken)} case(s) one at a time")
+        pool = None
+        try:
+            for case in broken:
+                pool = pool or self._pool(1)
+                try:
+                    yield pool.submit(_generate, case, investigator_id, encryption_password).result()
+                except BrokenProcessPool:
+                    pool.shutdown()
+                    pool = None
+                    yield self._crashed(case)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def generate(self, cases, investigator_id, encryption_password, progress=None, ip_address=None):
+        """
+        Render reports for cases (case documents, posts not needed) and write the batch manifest
+        progress(dict) is called after every case
+        Returns (manifest, manifest path, manifest SHA-256)
+        """
+        batch_id = f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        started = time.perf_counter()
+
+        results = {}
+        for entry in self.iter_results(cases, investigator_id, encryption_password):
+            results[entry['case_id']] = entry
+            if entry['status'] == 'ok':
+                AuditLog.log(
+                    user_id=investigator_id,
+                    action=AuditLog.ACTION_GENERATE_REPORT,
+                    details={
+                        'case_id': entry['case_id'], 'report_id': entry['report_id'],
+                        'batch_id': batch_id, 'reused': entry['reused']
+                    },
+                    ip_address=ip_address
+                )
+            if progress:
+                progress({'completed': len(results), 'total': len(cases)})
+
+        elapsed = time.perf_counter() - started
+        entries = [results[case['_id']] for case in cases]
+        succeeded = [entry for entry in entries if entry['status'] == 'ok']
+        manifest = {
+            'batch_id': batch_id,
+            'investigator_id': investigator_id,
+            'created_at': datetime.utcnow().isoformat(),
+            'hash_algorithm': 'sha256',
+            'reports': entries,
+            'totals': {
+                'requested': len(entries),
+                'succeeded': len(succeeded),
+                'failed': len(entries) - len(succeeded),
+                'reused': len([entry for entry in succeeded if entry['reused']]),
+                'workers': max(1, min(self.max_workers, len(cases))),
+                'elapsed_seconds': round(elapsed, 3),
+                'reports_per_second': round(len(succeeded) / elapsed, 2) if elapsed > 0 else None
+            }
+        }
+        manifest_path, manifest_hash = self._write_manifest(batch_id, manifest)
+        return manifest, manifest_path, manifest_hash
+
+    def _write_manifest(self, batch_id, manifest):
+        """Write the manifest atomically next to the reports; returns (path, SHA-256)"""
+        folder = os.path.join(self.report_folder, 'manifests')
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"report_batch_{batch_id}.json")
+        data = json.dumps(manifest, indent=2, default=str).encode('utf-8')
+
+        fd, temp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.json', dir=folder)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        return path, hashlib.sha256(data).hexdigest()
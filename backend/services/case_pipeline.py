@@ -0,0 +1,254 @@
+"""
+Case Pipeline Service
+Scrape, analyze and report steps shared by the HTTP routes and the job workers
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+from flask import current_app
+from models.case import Case
+from models.case_post import CasePost
+from models.report import Report
+from models.watchlist import Watchlist
+from services.scraper_service import ScraperService
+from services.analysis_service import AnalysisService
+from services.post_cache import PostCache
+from services.report_cache import report_content_key
+from services.report_service import ReportService
+from services.snapshot_service import SnapshotService
+from services.history_scrape_service import HistoryScrapeService
+from services.delta_scrape_service import DeltaScrapeService
+from utils.hash_utils import hash_password
+from utils.post_batch import PostBatch
+
+class CasePipeline:
+    """Heavy case operations, independent of the request that asked for them"""
+
+    @staticmethod
+    def parse_scrape_options(options):
+        """
+        Validate scrape options; raises ValueError on bad input
+        Returns a JSON-serializable copy that can be stored with a job
+        """
+        options = dict(options or {})
+        if not options.get('full_history'):
+            return {'delta': bool(options.get('delta'))}
+
+        bounds = {}
+        try:
+            max_posts = options.get('max_posts', current_app.config.get('SCRAPE_MAX_POSTS'))
+            max_posts = int(max_posts) if max_posts is not None else None
+            for key in ('since', 'until'):
+                bounds[key] = None
+                if options.get(key):
+                    # Post dates are naive UTC, so offsets (including a trailing Z) are converted away
+                    value = datetime.fromisoformat(str(options[key]).replace('Z', '+00:00'))
+                    if value.tzinfo is not None:
+                        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+                    bounds[key] = value.isoformat()
+        except (TypeError, ValueError):
+            raise ValueError('max_posts must be a number and since/until ISO-8601 dates')
+
+        return {
+            'full_history': True,
+            'max_posts': max_posts,
+            'since': bounds['since'],
+            'until': bounds['until'],
+            'resume': options.get('resume', True)
+        }
+
+    @staticmethod
+    def scrape(case, options=None, on_page=None, store=True):
+        """
+        Scrape a case target and store the snapshot
+        Returns (snapshot, evidence hash, audit log details)
+        With store=False the snapshot is left for store_evidence() and the hash is None
+        """
+        options = CasePipeline.parse_scrape_options(options)
+
+        if options.get('full_history'):
+            snapshot, evidence_hash = HistoryScrapeService().scrape_case_history(
+                case,
+                max_posts=options['max_posts'],
+                since=datetime.fromisoformat(options['since']) if options.get('since') else None,
+                until=datetime.fromisoformat(options['until']) if options.get('until') else None,
+                resume=options['resume'],
+                on_page=on_page,
+                store=store
+            )
+            details = {
+                'case_id': case['_id'],
+                'full_history': True,
+                'snapshot_id': snapshot['snapshot_id'],
+                'posts_stored': snapshot['posts_stored']
+            }
+            return snapshot, evidence_hash, details
+
+        if options.get('delta'):
+            snapshot, evidence_hash = DeltaScrapeService().scrape_case_delta(case, store=store)
+            details = {
+                'case_id': case['_id'],
+                'delta': True,
+                'new_posts': snapshot.get('delta', {}).get('new_posts')
+            }
+            return snapshot, evidence_hash, details
+
+        scraped_data = ScraperService().scrape_profile(
+            platform=case['platform'],
+            username=case['target_username']
+        )
+        evidence_hash = SnapshotService.store(case['_id'], scraped_data) if store else None
+        return scraped_data, evidence_hash, {'case_id': case['_id']}
+
+    @staticmethod
+    def store_evidence(case_id, snapshot):
+        """Add a snapshot scraped with store=False to the case; returns the evidence hash"""
+        if snapshot.get('snapshot_id') and not snapshot.get('delta'):
+            return HistoryScrapeService().finish(case_id, snapshot)
+        return SnapshotService.store_snapshot(case_id, snapshot)
+
+    @staticmethod
+    def risk_level(risk_score):
+        """Map a 0-100 risk score to a case risk level"""
+        if risk_score >= 75:
+            return Case.RISK_CRITICAL
+        if risk_score >= 50:
+            return Case.RISK_HIGH
+        if risk_score >= 25:
+            return Case.RISK_MEDIUM
+        return Case.RISK_LOW
+
+    @staticmethod
+    def analyze(case):
+        """
+        Analyze the latest snapshot and store the results on the case
+        Returns (analysis results, risk score, risk level)
+        """
+        if not case.get('data_collected'):
+            raise ValueError('No data collected yet')
+
+        posts = PostCache().get_case_posts(case)
+        metadata = case['data_collected'][-1].get('metadata', {})
+        analysis_results = AnalysisService().analyze_posts(posts, metadata)
+
+        risk_score, risk_level = CasePipeline.store_analysis(case['_id'], analysis_results)
+        return analysis_results, risk_score, risk_level
+
+    @staticmethod
+    def store_analysis(case_id, analysis_results):
+        """Save analysis results on the case (and its watchlist entry); returns (risk score, risk level)"""
+        risk_score = analysis_results['risk_score']
+        risk_level = CasePipeline.risk_level(risk_score)
+        Case.update_analysis(case_id, analysis_results, risk_score, risk_level)
+        Watchlist.update_risk(case_id, risk_level)
+        return risk_score, risk_level
+
+    @staticmethod
+    def investigate(case, investigator_id, options=None, encryption_password=None, emit=None):
+        """
+        Run scrape -> evidence -> analyze -> (report) as one pipeline
+        Each stage hands its output to the next in memory instead of re-reading the case.
+        emit(event, data) receives stage_started, progress and stage_completed events.
+        Returns a summary with per-stage timings in milliseconds.
+        """
+        options = CasePipeline.parse_scrape_options(options)
+        emit = emit or (lambda event, data: None)
+        case_id = case['_id']
+        timings = {}
+
+        def stage(name, fn):
+            emit('stage_started', {'stage': name})
+            started = time.perf_counter()
+            output, partial = fn()
+            timings[name] = round((time.perf_counter() - started) * 1000, 2)
+            emit('stage_completed', dict(partial, stage=name, elapsed_ms=timings[name]))
+            return output
+
+        def on_page(stored, cursor):
+            emit('progress', {'stage': 'scrape', 'posts_stored': stored, 'done': cursor is None})
+
+        def run_scrape():
+            snapshot, _, details = CasePipeline.scrape(case, options, on_page=on_page, store=False)
+            posts_collected = snapshot.get('posts_stored', len(snapshot.get('posts', [])))
+            return (snapshot, details), {'posts_collected': posts_collected, 'metadata': snapshot.get('metadata', {})}
+
+        snapshot, scrape_details = stage('scrape', run_scrape)
+
+        def run_evidence():
+            evidence_hash = CasePipeline.store_evidence(case_id, snapshot)
+            return evidence_hash, {'evidence_hash': evidence_hash}
+
+        evidence_hash = stage('evidence', run_evidence)
+
+        def run_analyze():
+            if snapshot.get('snapshot_id'):
+                # Paged snapshots were just written to the post cache by store_paged
+                posts = PostCache().load(case_id, evidence_hash)
+                if posts is None:
+                    posts = PostBatch.from_dicts(CasePost.iter_snapshot_posts(case_id, snapshot['snapshot_id']))
+            else:
+                posts = snapshot.get('posts', [])
+            analysis_results = AnalysisService().analyze_posts(posts, snapshot.get('metadata', {}))
+            risk_score, risk_level = CasePipeline.store_analysis(case_id, analysis_results)
+            return (analysis_results, risk_score, risk_level), {'risk_score': risk_score, 'risk_level': risk_level}
+
+        analysis_results, risk_score, risk_level = stage('analyze', run_analyze)
+
+        summary = {
+            'case_id': case_id,
+            'scrape': scrape_details,
+            'evidence_hash': evidence_hash,
+            'risk_score': risk_score,
+            'risk_level': risk_level,
+            'report_id': None,
+            'timings_ms': timings
+        }
+
+        if encryption_password:
+            def run_report():
+                # The report only needs the snapshot summary, not its posts
+                summary_snapshot = {key: value for key, value in snapshot.items() if key != 'posts'}
+                report_case = dict(
+                    case,
+                    data_collected=(case.get('data_collected') or []) + [summary_snapshot],
+                    analysis_results=analysis_results,
+                    risk_score=risk_score,
+                    risk_level=risk_level,
+                    evidence_hash=evidence_hash
+                )
+                report_id, report_data = CasePipeline.generate_report(report_case, investigator_id, encryption_password)
+                return report_id, {'report_id': report_id, 'file_hash': report_data['file_hash']}
+
+            summary['report_id'] = stage('report', run_report)
+
+        summary['total_ms'] = round(sum(timings.values()), 2)
+        return summary
+
+    @staticmethod
+    def generate_report(case, investigator_id, encryption_password):
+        """
+        Generate the encrypted PDF report and its record
+        An existing report with the same content and password is returned instead of a duplicate
+        Returns (report id, report data); report data['reused'] tells which happened
+        """
+        if not case.get('data_collected'):
+            raise ValueError('No data collected yet. Please scrape data first.')
+
+        content_key = report_content_key(case)
+        existing = Report.find_by_content(case['_id'], investigator_id, content_key, hash_password(encryption_password))
+        if existing and os.path.exists(existing['file_path']):
+            return existing['_id'], dict(existing, reused=True)
+
+        report_data = ReportService().generate_pdf_report(case, encryption_password)
+        report_id = Report.create(
+            case_id=case['_id'],
+            investigator_id=investigator_id,
+            file_path=report_data['file_path'],
+            file_hash=report_data['file_hash'],
+            encryption_hash=report_data['encryption_hash'],
+            content_key=report_data['content_key'],
+            integrity=report_data['integrity'],
+            rendered_at=report_data['rendered_at']
+        )
+        return report_id, dict(report_data, reused=False)
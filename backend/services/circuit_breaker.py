@@ -0,0 +1,228 @@
+"""
+Circuit Breaker Service
+Per-platform circuit breakers and latency budgets for real scraping calls
+While a platform is down, calls fail fast instead of waiting for SDK timeouts
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from flask import current_app, has_app_context
+from services.platform_clients import is_platform_failure
+from services.rate_limiter import rate_limiter, DeadlineScope, RateLimitTimeout
+
+
+class CircuitOpen(Exception):
+    """Raised without calling the platform while its breaker is open"""
+
+    def __init__(self, platform, retry_after):
+        self.platform = platform
+        self.retry_after = max(0, round(retry_after, 2))
+        super().__init__(f"{platform} circuit open, next probe in {self.retry_after}s")
+
+
+class LatencyBudgetExceeded(Exception):
+    """Raised when a platform call does not finish within its latency budget"""
+
+    def __init__(self, platform, budget):
+        self.platform = platform
+        self.budget = budget
+        super().__init__(f"{platform} call exceeded its {budget}s latency budget")
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one platform"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, platform, failure_threshold=5, reset_timeout=30.0, half_open_probes=1):
+        self.platform = platform
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.trips = 0
+        self.rejected = 0
+        self.last_tripped_at = None
+        self.last_error = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Admit a call or raise CircuitOpen"""
+        with self.lock:
+            if self.state == self.OPEN:
+                remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpen(self.platform, remaining)
+                self.state = self.HALF_OPEN
+                self.probes = 0
+
+            if self.state == self.HALF_OPEN:
+                # Only a few trial calls go through until one of them succeeds
+                if self.probes >= self.half_open_probes:
+                    self.rejected += 1
+                    raise CircuitOpen(self.platform, 0)
+                self.probes += 1
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probes = 0
+
+    def record_failure(self, error):
+        with self.lock:
+            self.failures += 1
+            self.last_error = str(error)
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._trip()
+
+    def release(self):
+        """Finish a call that says nothing about platform health (e.g. throttling)"""
+        with self.lock:
+            if self.state == self.HALF_OPEN and self.probes > 0:
+                self.probes -= 1
+
+    def _trip(self):
+        """Open the circuit (caller holds the lock)"""
+        if self.state != self.OPEN:
+            self.trips += 1
+            self.last_tripped_at = datetime.utcnow().isoformat()
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.probes = 0
+
+    def current_state(self):
+        """State as the next caller would see it"""
+        with self.lock:
+            if self.state == self.OPEN and time.monotonic() >= self.opened_at + self.reset_timeout:
+                return self.HALF_OPEN
+            return self.state
+
+    def stats(self):
+        state = self.current_state()
+        with self.lock:
+            return {
+                'state': state,
+                'consecutive_failures': self.failures,
+                'trips': self.trips,
+                'rejected': self.rejected,
+                'last_tripped_at': self.last_tripped_at,
+                'last_error': self.last_error
+            }
+
+
+class CircuitBreakerRegistry:
+    """Breakers keyed by platform plus a worker pool that enforces latency budgets"""
+
+    def __init__(self):
+        self.failure_threshold = 5
+        self.reset_timeout = 30.0
+        self.half_open_probes = 1
+        self.latency_budget = 10.0
+        self.max_workers = 16
+        self._breakers = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Load thresholds and budgets from the Flask config"""
+        self.failure_threshold = app.config.get('SCRAPE_BREAKER_FAILURE_THRESHOLD', self.failure_threshold)
+        self.reset_timeout = app.config.get('SCRAPE_BREAKER_RESET_TIMEOUT', self.reset_timeout)
+        self.half_open_probes = app.config.get('SCRAPE_BREAKER_HALF_OPEN_PROBES', self.half_open_probes)
+        self.latency_budget = app.config.get('SCRAPE_LATENCY_BUDGET', self.latency_budget)
+        self.max_workers = app.config.get('SCRAPE_BREAKER_WORKERS', self.max_workers)
+        with self._lock:
+            self._breakers = {}
+
+    def breaker(self, platform):
+        with self._lock:
+            if platform not in self._breakers:
+                self._breakers[platform] = CircuitBreaker(
+                    platform, self.failure_threshold, self.reset_timeout, self.half_open_probes
+                )
+            return self._breakers[platform]
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='scrape-budget'
+                )
+            return self._executor
+
+    def call(self, platform, fn, *args, budget=None, **kwargs):
+        """
+        Run fn through the platform's breaker
+        With a budget (seconds) the call runs on a worker thread and is abandoned on timeout;
+        budget=0 runs inline with no time limit
+        Rate-limit waits share the budget's deadline, so throttling surfaces as RateLimitTimeout
+        (which never counts against the breaker) instead of as a blown budget
+        Only platform-health failures (blown budgets, connection errors, timeouts, 5xx) count;
+        errors about one account or request, such as a missing user, leave the breaker alone
+        """
+        breaker = self.breaker(platform)
+        breaker.allow()
+
+        if budget is None:
+            budget = self.latency_budget
+
+        try:
+            if budget:
+                scope = DeadlineScope(time.monotonic() + budget)
+                future = self._pool().submit(self._bind_context(fn, scope), *args, **kwargs)
+                try:
+                    result = future.result(timeout=budget)
+                except FutureTimeout:
+                    future.cancel()
+                    if scope.waiting:
+                        # Out of time while queued for rate-limit budget: throttling, not a platform failure
+                        raise RateLimitTimeout(platform, 0)
+                    # The SDK call keeps running in the background until its own timeout
+                    raise LatencyBudgetExceeded(platform, budget)
+            else:
+                result = fn(*args, **kwargs)
+        except RateLimitTimeout:
+            breaker.release()
+            raise
+        except Exception as e:
+            if isinstance(e, LatencyBudgetExceeded) or is_platform_failure(e):
+                breaker.record_failure(e)
+            else:
+                breaker.release()
+            raise
+
+        breaker.record_success()
+        return result
+
+    @staticmethod
+    def _bind_context(fn, scope):
+        """
+        Run fn on the worker thread under the caller's app context, with its rate-limit waits
+        bounded by the scope's deadline; an abandoned call then fails instead of spending quota later
+        """
+        app = current_app._get_current_object() if has_app_context() else None
+
+        def run(*args, **kwargs):
+            with rate_limiter.deadline_scope(scope):
+                if app is None:
+                    return fn(*args, **kwargs)
+                with app.app_context():
+                    return fn(*args, **kwargs)
+        return run
+
+    def stats(self):
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {platform: breaker.stats() for platform, breaker in breakers.items()}
+
+
+# Shared by every scraper in this process
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,238 @@
+"""
+Evidence Export Service
+Streams a case's raw evidence as a ZIP archive: snapshots, analysis, audit trail and reports,
+closed by a manifest of per-file SHA-256 hashes signed with HMAC-SHA256
+Only a small write buffer is held at a time, so cases of any size export in constant memory
+AES encryption of the archive needs the optional pyzipper package
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import zipfile
+from datetime import datetime
+from flask import current_app
+from models.audit_log import AuditLog
+from models.case import Case
+from models.case_post import CasePost
+from models.report import Report
+
+try:
+    import pyzipper
+except ImportError:
+    pyzipper = None
+
+EXPORT_FORMAT = 'sft-evidence-export/1'
+FLUSH_BYTES = 256 * 1024
+READ_SIZE = 64 * 1024
+
+
+class _StreamSink:
+    """Write-only file for ZipFile; the export generator drains what was written after every chunk"""
+
+    def __init__(self):
+        self._chunks = []
+        self.pending = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self.pending += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        self.pending = 0
+        return data
+
+
+def _buffered(pieces):
+    """Join many small str/bytes pieces into chunks of about READ_SIZE bytes"""
+    buffer = []
+    size = 0
+    for piece in pieces:
+        if isinstance(piece, str):
+            piece = piece.encode('utf-8')
+        buffer.append(piece)
+        size += len(piece)
+        if size >= READ_SIZE:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _signing_key():
+    """EXPORT_SIGNING_KEY, or a key derived from SECRET_KEY so it never equals another secret"""
+    config = current_app.config
+    key = config.get('EXPORT_SIGNING_KEY')
+    if key:
+        return key.encode('utf-8')
+    return hmac.new(config['SECRET_KEY'].encode('utf-8'), b'evidence-export-manifest', hashlib.sha256).digest()
+
+
+def sign_manifest(manifest_bytes):
+    """Hex HMAC-SHA256 of the manifest bytes"""
+    return hmac.new(_signing_key(), manifest_bytes, hashlib.sha256).hexdigest()
+
+
+def verify_manifest(manifest_bytes, signature):
+    """True when signature is this server's signature of the manifest bytes"""
+    return hmac.compare_digest(sign_manifest(manifest_bytes), (signature or '').strip())
+
+
+class EvidenceExport:
+    """ZIP export of one case, produced as a stream of bytes"""
+
+    def __init__(self, case, exported_by, encryption_password=None):
+        if encryption_password and pyzipper is None:
+            raise RuntimeError('Encrypted exports need the optional pyzipper package')
+        self.case = case
+        self.exported_by = exported_by
+        self.encryption_password = encryption_password
+        self.compress_level = current_app.config.get('EXPORT_COMPRESS_LEVEL', 6)
+        self.filename = f"evidence_{case['_id']}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.zip"
+
+    @staticmethod
+    def encryption_available():
+        return pyzipper is not None
+
+    def _open_zip(self, sink):
+        if self.encryption_password:
+            archive = pyzipper.AESZipFile(
+                sink, 'w', compression=pyzipper.ZIP_DEFLATED, compresslevel=self.compress_level,
+                encryption=pyzipper.WZ_AES
+            )
+            archive.setpassword(self.encryption_password.encode('utf-8'))
+            return archive
+        return zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=self.compress_level)
+
+    def iter_bytes(self):
+        """Yield the archive in chunks; the manifest is written last, once every hash is known"""
+        sink = _StreamSink()
+        files = []
+        with self._open_zip(sink) as archive:
+            for name, chunks, extra in self._entries():
+                sha256 = hashlib.sha256()
+                size = 0
+                info = zipfile.ZipInfo(name, date_time=datetime.utcnow().timetuple()[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                # open(ZipInfo) does not copy the archive's compresslevel; the attribute is public from 3.12
+                if hasattr(info, 'compress_level'):
+                    info.compress_level = self.compress_level
+                else:
+                    info._compresslevel = self.compress_level
+                # force_zip64: entry sizes are unknown up front and snapshots can exceed 4 GB
+                with archive.open(info, 'w', force_zip64=True) as entry:
+                    for chunk in chunks:
+                        sha256.update(chunk)
+                        size += len(chunk)
+                        entry.write(chunk)
+                        if sink.pending >= FLUSH_BYTES:
+                            yield sink.drain()
+                files.append(dict({'name': name, 'sha256': sha256.hexdigest(), 'size': size}, **extra(sha256.hexdigest())))
+                if sink.pending:
+                    yield sink.drain()
+
+            manifest = json.dumps(self._manifest(files), indent=2, sort_keys=True, default=str).encode('utf-8')
+            archive.writestr('manifest.json', manifest)
+            archive.writestr('manifest.sig', sign_manifest(manifest) + '\n')
+        # Closing the archive writes the central directory
+        yield sink.drain()
+
+    def _manifest(self, files):
+        case = self.case
+        return {
+            'format': EXPORT_FORMAT,
+            'case_id': case['_id'],
+            'target_username': case.get('target_username'),
+            'platform': case.get('platform'),
+            'evidence_hash': case.get('evidence_hash'),
+            'exported_by': self.exported_by,
+            'exported_at': datetime.utcnow().isoformat(),
+            'encrypted': bool(self.encryption_password),
+            'files': files,
+            'signature': {
+                'algorithm': 'HMAC-SHA256',
+                'key_id': current_app.config.get('EXPORT_SIGNING_KEY_ID', 'default'),
+                'file': 'manifest.sig'
+            }
+        }
+
+    def _entries(self):
+        """(name, byte chunks, extra manifest fields given the file hash) for every file of the export"""
+        case = self.case
+        no_extra = lambda sha256: {}
+
+        details = {key: value for key, value in case.items() if key not in ('data_collected', 'analysis_results')}
+        details['snapshot_count'] = len(case.get('data_collected') or [])
+        yield 'case.json', _buffered([json.dumps(details, indent=2, sort_keys=True, default=str)]), no_extra
+
+        analysis = {
+            'analysis_results': case.get('analysis_results') or {},
+            'risk_score': case.get('risk_score'),
+            'risk_level': case.get('risk_level')
+        }
+        yield 'analysis.json', _buffered([json.dumps(analysis, indent=2, sort_keys=True, default=str)]), no_extra
+
+        snapshots = case.get('data_collected') or []
+        for index, summary in enumerate(snapshots):
+            latest = index == len(snapshots) - 1
+
+            def matches(sha256, latest=latest):
+                # Only the latest snapshot's hash is kept on the case
+                return {'evidence_hash_match': sha256 == case.get('evidence_hash')} if latest else {}
+
+            if summary.get('snapshot_id'):
+                name = f"snapshots/{index + 1:03d}_{summary['snapshot_id']}.jsonl"
+                yield name, _buffered(self._paged_snapshot(index)), matches
+            else:
+                name = f"snapshots/{index + 1:03d}.json"
+                yield name, _buffered(self._inline_snapshot(index)), matches
+
+        reports = Report.find_by_case(case['_id'])
+        yield 'audit_log.jsonl', _buffered(
+            json.dumps(log, sort_keys=True, default=str) + '\n'
+            for log in AuditLog.iter_case_logs(case['_id'], [report['_id'] for report in reports])
+        ), no_extra
+
+        for report in reports:
+            if not os.path.exists(report['file_path']):
+                continue
+
+            def recorded(sha256, report=report):
+                return {
+                    'report_id': report['_id'],
+                    'created_at': report.get('created_at'),
+                    'matches_recorded_hash': sha256 == report['file_hash']
+                }
+
+            yield f"reports/{os.path.basename(report['file_path'])}", self._read_file(report['file_path']), recorded
+
+    def _paged_snapshot(self, index):
+        """
+        Header line, then one post per line: the exact bytes the snapshot's evidence hash was computed over
+        (generate_stream_evidence_hash), so the file's SHA-256 can be checked against it
+        """
+        # Re-read the header: the case was loaded without snapshot posts, which drops the hashed empty list
+        header = Case.find_snapshot(self.case['_id'], index)
+        yield json.dumps(header, sort_keys=True)
+        for post in CasePost.iter_snapshot_posts(self.case['_id'], header['snapshot_id']):
+            yield '\n'
+            yield json.dumps(post, sort_keys=True)
+
+    def _inline_snapshot(self, index):
+        """The snapshot as hashed by generate_evidence_hash, encoded piece by piece"""
+        snapshot = Case.find_snapshot(self.case['_id'], index)
+        yield from json.JSONEncoder(sort_keys=True, default=str).iterencode(snapshot)
+
+    @staticmethod
+    def _read_file(path):
+        with open(path, 'rb') as f:
+            for data in iter(lambda: f.read(READ_SIZE), b''):
+                yield data
@@ -0,0 +1,102 @@
+"""
+History Scrape Service
+Runs paginated full-history scrapes straight into storage
+Memory stays bounded by one page and the cursor is checkpointed for resuming
+"""
+
+import uuid
+from datetime import datetime
+from models.case import Case
+from models.case_post import CasePost
+from services.scraper_service import ScraperService
+from services.snapshot_service import SnapshotService
+
+class HistoryScrapeService:
+    """Service for streaming a target's full post history into a case"""
+
+    def __init__(self, scraper=None):
+        self.scraper = scraper or ScraperService()
+
+    def scrape_case_history(self, case, max_posts=None, since=None, until=None, resume=True, on_page=None, store=True):
+        """
+        Scrape a case target's post history page by page
+        Returns (snapshot record, evidence hash); on_page(stored_count, cursor) reports progress.
+        With store=False the snapshot is not added to the case yet (hash is None); call finish() later.
+        """
+        case_id = case['_id']
+        checkpoint = case.get('scrape_checkpoint') if resume else None
+        if checkpoint and checkpoint.get('platform') != case['platform'].lower():
+            checkpoint = None
+
+        if checkpoint:
+            # Resume with the parameters the interrupted scrape was started with
+            snapshot_id = checkpoint['snapshot_id']
+            stored = checkpoint['posts_stored']
+            cursor = checkpoint['cursor']
+            max_posts = checkpoint.get('max_posts')
+            since = datetime.fromisoformat(checkpoint['since']) if checkpoint.get('since') else None
+            until = datetime.fromisoformat(checkpoint['until']) if checkpoint.get('until') else None
+        else:
+            snapshot_id = uuid.uuid4().hex
+            stored = 0
+            cursor = None
+
+        remaining = None if max_posts is None else max(0, max_posts - stored)
+        header, pages = self.scraper.scrape_history(
+            case['platform'], case['target_username'],
+            max_posts=remaining, since=since, until=until, cursor=cursor
+        )
+        fetch_source = header['provenance']['fetch_source']
+        if checkpoint and checkpoint.get('fetch_source', fetch_source) != fetch_source:
+            # Pages from another source would be stored and hashed with the ones already collected
+            raise RuntimeError(
+                f"Cannot resume a {checkpoint['fetch_source']} scrape from {fetch_source}; start over with resume=false"
+            )
+
+        high_water_mark = checkpoint.get('high_water_mark') if checkpoint else None
+        for posts, next_cursor in pages:
+            CasePost.store_page(case_id, snapshot_id, stored, posts)
+            stored += len(posts)
+            high_water_mark = SnapshotService.high_water_mark(posts, high_water_mark)
+
+            if next_cursor is not None:
+                Case.save_scrape_checkpoint(case_id, {
+                    'snapshot_id': snapshot_id,
+                    'platform': case['platform'].lower(),
+                    'fetch_source': fetch_source,
+                    'cursor': next_cursor,
+                    'posts_stored': stored,
+                    'max_posts': max_posts,
+                    'since': since.isoformat() if since else None,
+                    'until': until.isoformat() if until else None,
+                    'high_water_mark': high_water_mark,
+                    'saved_at': datetime.utcnow().isoformat()
+                })
+
+            if on_page:
+                on_page(stored, next_cursor)
+
+        snapshot = dict(header)
+        snapshot.update({
+            'snapshot_id': snapshot_id,
+            'posts': [],
+            'posts_collection': CasePost.COLLECTION,
+            'posts_stored': stored,
+            'high_water_mark': high_water_mark,
+            'history': {
+                'max_posts': max_posts,
+                'since': since.isoformat() if since else None,
+                'until': until.isoformat() if until else None,
+                'resumed': bool(checkpoint)
+            }
+        })
+
+        if not store:
+            return snapshot, None
+        return snapshot, self.finish(case_id, snapshot)
+
+    def finish(self, case_id, snapshot):
+        """Add a scraped history snapshot to the case; returns the evidence hash"""
+        evidence_hash = SnapshotService.store_paged(case_id, snapshot)
+        Case.clear_scrape_checkpoint(case_id)
+        return evidence_hash
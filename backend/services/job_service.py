@@ -0,0 +1,218 @@
+"""
+Job Service
+Queues case pipeline work and runs it in worker processes
+Workers hold a lease on each job and renew it with heartbeats while the job runs
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from flask import current_app
+from models.audit_log import AuditLog
+from models.case import Case
+from models.job import Job
+from services.batch_report_service import BatchReportService
+from services.case_pipeline import CasePipeline
+from services.rate_limiter import RateLimitTimeout
+
+
+class LeaseLost(Exception):
+    """Raised inside a job when another worker has taken over its lease"""
+
+
+class JobService:
+    """Enqueues jobs and executes claimed ones"""
+
+    @staticmethod
+    def enqueue(job_type, case_id, user_id, payload=None, secret=None, ip_address=None):
+        """Queue a job; returns its id"""
+        return Job.create(
+            job_type,
+            case_id,
+            user_id,
+            payload=payload,
+            max_attempts=current_app.config.get('JOB_MAX_ATTEMPTS', 3),
+            secret=secret,
+            ip_address=ip_address
+        )
+
+    @staticmethod
+    def run(job, progress=None):
+        """
+        Execute a claimed job; returns its result document
+        progress(dict) is called as long-running steps advance
+        """
+        if job['type'] == Job.TYPE_REPORT_BATCH:
+            return JobService._run_report_batch(job, progress)
+
+        case = Case.find_by_id(job['case_id'], include_posts=False)
+        if not case:
+            raise ValueError('Case not found')
+
+        if job['type'] == Job.TYPE_SCRAPE:
+            def on_page(stored, cursor):
+                if progress:
+                    progress({'posts_stored': stored, 'done': cursor is None})
+
+            snapshot, evidence_hash, details = CasePipeline.scrape(case, job['payload'], on_page=on_page)
+            AuditLog.log(
+                user_id=job['user_id'],
+                action=AuditLog.ACTION_DATA_SCRAPE,
+                details=dict(details, job_id=job['_id'], watchlist=job['payload'].get('watchlist', False)),
+                ip_address=job.get('ip_address')
+            )
+
+            # Follow-up jobs (e.g. analysis after a scheduled rescrape) run once the snapshot is stored
+            chained = [
+                JobService.enqueue(job_type, case['_id'], job['user_id'], ip_address=job.get('ip_address'))
+                for job_type in job['payload'].get('chain', [])
+                if job_type == Job.TYPE_ANALYZE
+            ]
+            return {
+                'evidence_hash': evidence_hash,
+                'snapshot_id': snapshot.get('snapshot_id'),
+                'posts_collected': snapshot.get('posts_stored', len(snapshot.get('posts', []))),
+                'chained_job_ids': chained
+            }
+
+        if job['type'] == Job.TYPE_ANALYZE:
+            _, risk_score, risk_level = CasePipeline.analyze(case)
+            AuditLog.log(
+                user_id=job['user_id'],
+                action=AuditLog.ACTION_ANALYSIS,
+                details={'case_id': case['_id'], 'risk_score': risk_score, 'risk_level': risk_level, 'job_id': job['_id']},
+                ip_address=job.get('ip_address')
+            )
+            return {'risk_score': risk_score, 'risk_level': risk_level}
+
+        if job['type'] == Job.TYPE_REPORT:
+            report_id, report_data = CasePipeline.generate_report(
+                case, job['user_id'], job['secret']['encryption_password']
+            )
+            AuditLog.log(
+                user_id=job['user_id'],
+                action=AuditLog.ACTION_GENERATE_REPORT,
+                details={'case_id': case['_id'], 'report_id': report_id, 'job_id': job['_id'], 'reused': report_data['reused']},
+                ip_address=job.get('ip_address')
+            )
+            return {'report_id': report_id, 'file_hash': report_data['file_hash'], 'reused': report_data['reused']}
+
+        raise ValueError(f"Unknown job type {job['type']}")
+
+    @staticmethod
+    def _run_report_batch(job, progress=None):
+        """Reports for several cases; cases reported by an earlier attempt are reused, not re-rendered"""
+        cases = []
+        for case_id in job['payload']['case_ids']:
+            case = Case.find_by_id(case_id, include_posts=False)
+            if not case:
+                raise ValueError(f'Case not found: {case_id}')
+            cases.append(case)
+
+        manifest, _, manifest_hash = BatchReportService().generate(
+            cases, job['user_id'], job['secret']['encryption_password'],
+            progress=progress, ip_address=job.get('ip_address')
+        )
+        return {'batch_id': manifest['batch_id'], 'manifest_hash': manifest_hash, 'manifest': manifest}
+
+
+class JobWorker:
+    """
+    Pool of worker threads polling the jobs collection
+    Run several of these processes (on any number of nodes) to scale out
+    """
+
+    def __init__(self, app, concurrency=None, job_types=None):
+        self.app = app
+        config = app.config
+        self.concurrency = concurrency or config.get('JOB_WORKER_CONCURRENCY', 2)
+        self.job_types = job_types
+        self.lease_seconds = config.get('JOB_LEASE_SECONDS', 60)
+        self.heartbeat_seconds = config.get('JOB_HEARTBEAT_SECONDS', 15)
+        self.poll_interval = config.get('JOB_POLL_INTERVAL', 2.0)
+        self.retry_base_delay = config.get('JOB_RETRY_BASE_DELAY', 30)
+        self.node_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stop_event = threading.Event()
+
+    def run(self):
+        """Run the worker threads until stop() is called"""
+        threads = [
+            threading.Thread(target=self._loop, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        print(f"✅ Job worker {self.node_id} started with {self.concurrency} threads")
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            self.stop()
+            for thread in threads:
+                thread.join()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _loop(self):
+        worker_id = f"{self.node_id}:{uuid.uuid4().hex[:8]}"
+        while not self.stop_event.is_set():
+            try:
+                with self.app.app_context():
+                    job = Job.claim(worker_id, self.lease_seconds, self.job_types)
+                    if job:
+                        self._process(job, worker_id)
+                        continue
+            except Exception as e:
+                print(f"⚠️  Job worker {worker_id} error: {e}")
+            self.stop_event.wait(self.poll_interval)
+
+    def _process(self, job, worker_id):
+        """Run one claimed job while a heartbeat thread keeps its lease alive"""
+        if job['attempts'] > job['max_attempts']:
+            # Workers kept dying on this job; do not pick it up again
+            Job.fail(job['_id'], worker_id, job.get('last_error') or 'Lease expired too many times')
+            return
+
+        state = {'progress': None, 'lost': False}
+        finished = threading.Event()
+
+        def beat():
+            with self.app.app_context():
+                while not finished.wait(self.heartbeat_seconds):
+                    if not Job.heartbeat(job['_id'], worker_id, self.lease_seconds, state['progress']):
+                        state['lost'] = True
+                        return
+
+        def progress(update):
+            state['progress'] = update
+            if state['lost']:
+                raise LeaseLost(job['_id'])
+
+        heartbeat = threading.Thread(target=beat, name=f"job-heartbeat-{job['_id']}", daemon=True)
+        heartbeat.start()
+        started = time.perf_counter()
+        try:
+            result = JobService.run(job, progress)
+            result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            Job.complete(job['_id'], worker_id, result)
+            print(f"✅ Job {job['_id']} ({job['type']}) succeeded")
+        except LeaseLost:
+            print(f"⚠️  Job {job['_id']} lease lost; another worker owns it now")
+        except RateLimitTimeout as e:
+            Job.fail(job['_id'], worker_id, str(e), retry_in=e.retry_after)
+        except ValueError as e:
+            # Bad input does not get better by retrying
+            Job.fail(job['_id'], worker_id, str(e))
+        except Exception as e:
+            retry_in = None
+            if job['attempts'] < job['max_attempts']:
+                retry_in = self.retry_base_delay * (2 ** (job['attempts'] - 1))
+            Job.fail(job['_id'], worker_id, str(e), retry_in=retry_in)
+            print(f"⚠️  Job {job['_id']} ({job['type']}) failed: {e}")
+        finally:
+            finished.set()
+            heartbeat.join()
@@ -0,0 +1,294 @@
+"""
+Platform Client Registry
+Process-wide API clients for real scraping, built once at app startup
+Clients share pooled HTTP sessions so keep-alive connections survive between scrapes
+"""
+
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+from services.rate_limiter import credential_key, rate_limiter
+
+# Config key of the credential each platform's rate limits are tracked by
+CREDENTIAL_KEYS = {
+    'twitter': 'TWITTER_BEARER_TOKEN',
+    'instagram': 'INSTAGRAM_ACCESS_TOKEN',
+    'reddit': 'REDDIT_CLIENT_ID'
+}
+
+# API hosts the SDKs call, mapped to path prefixes on the mock platform server
+MOCK_HOSTS = {
+    'api.twitter.com': 'twitter',
+    'api.x.com': 'twitter',
+    'www.reddit.com': 'reddit',
+    'oauth.reddit.com': 'reddit',
+    'ssl.reddit.com': 'reddit',
+    'www.instagram.com': 'instagram',
+    'i.instagram.com': 'instagram'
+}
+
+# SDK exceptions by type name; the SDKs are optional, so they are matched by name instead of imported
+CONNECTION_FAILURES = (
+    'ConnectionError', 'ConnectTimeout', 'ReadTimeout', 'Timeout', 'SSLError', 'ProxyError',
+    'ChunkedEncodingError',                                                 # requests
+    'RequestException',                                                     # prawcore (wraps network errors)
+    'ConnectionException'                                                   # instaloader
+)
+AUTH_FAILURES = (
+    'Unauthorized',                                                         # tweepy (401)
+    'OAuthException', 'InvalidToken',                                       # prawcore
+    'LoginRequiredException', 'BadCredentialsException'                     # instaloader
+)
+
+
+def _error_chain(error):
+    """An exception and the ones it was raised from (scrapers wrap SDK errors)"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def _status(error):
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) or getattr(response, 'status', None)
+
+
+def _is_connection_failure(error):
+    return isinstance(error, (ConnectionError, TimeoutError)) or type(error).__name__ in CONNECTION_FAILURES
+
+
+def is_client_failure(error):
+    """
+    Whether a failed call points at the client (credentials, connection or session) rather than
+    the request; a missing user or private account says nothing about the session
+    """
+    for item in _error_chain(error):
+        status = _status(item)
+        if status is not None:
+            if status == 401:
+                return True
+        elif _is_connection_failure(item) or type(item).__name__ in AUTH_FAILURES:
+            return True
+    return False
+
+
+def is_platform_failure(error):
+    """
+    Whether a failed call says the platform itself is unhealthy: connection errors, timeouts
+    and 5xx responses (what circuit breakers count), not errors about one account or request
+    """
+    for item in _error_chain(error):
+        status = _status(item)
+        if status is not None:
+            if 500 <= status < 600:
+                return True
+        elif _is_connection_failure(item):
+            return True
+    return False
+
+
+def _mock_adapter(base_url, pool_size):
+    """HTTP adapter that sends platform API requests to a mock server instead"""
+    from requests.adapters import HTTPAdapter
+
+    class MockPlatformAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            parts = urlsplit(request.url)
+            prefix = MOCK_HOSTS.get(parts.hostname)
+            if prefix:
+                query = f"?{parts.query}" if parts.query else ''
+                request.url = f"{base_url.rstrip('/')}/{prefix}{parts.path}{query}"
+            return super().send(request, **kwargs)
+
+    return MockPlatformAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+
+class PlatformClientRegistry:
+    """Thread-safe registry of tweepy / instaloader / praw clients"""
+
+    PLATFORMS = ('twitter', 'instagram', 'reddit')
+
+    def __init__(self):
+        self.enabled = False
+        self.pool_size = 10
+        self.rebuild_interval = 30.0
+        self.mock_base_url = None
+        self._config = {}
+        self._clients = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Read credentials from the Flask config and build the configured clients"""
+        self.enabled = app.config.get('USE_REAL_SCRAPING', False)
+        self.pool_size = app.config.get('SCRAPE_HTTP_POOL_SIZE', self.pool_size)
+        self.rebuild_interval = app.config.get('SCRAPE_CLIENT_REBUILD_INTERVAL', self.rebuild_interval)
+        self.mock_base_url = app.config.get('SCRAPE_MOCK_BASE_URL')
+        self._config = {key: app.config.get(key) for key in (
+            'TWITTER_BEARER_TOKEN', 'INSTAGRAM_ACCESS_TOKEN',
+            'REDDIT_CLIENT_ID', 'REDDIT_CLIENT_SECRET', 'REDDIT_USER_AGENT'
+        )}
+
+        with self._lock:
+            self._clients = {}
+            self._stats = {}
+            if self.enabled:
+                for platform in self.PLATFORMS:
+                    if self._configured(platform):
+                        self._build(platform)
+
+    def _configured(self, platform):
+        return bool(self._config.get(CREDENTIAL_KEYS[platform]))
+
+    def _observe_rate_limits(self, platform):
+        """
+        Response hook feeding the rate-limit headers of successful responses into the limiter,
+        so buckets shrink to the platform's remaining quota before a 429 happens
+        (failed calls are observed by RateLimiter.call when it retries them)
+        """
+        credential = credential_key(self._config.get(CREDENTIAL_KEYS[platform]))
+
+        def observe(response, *args, **kwargs):
+            if response.status_code < 400:
+                rate_limiter.observe_headers(platform, credential, response.headers)
+            return response
+        return observe
+
+    def _mount(self, session, platform):
+        """
+        Give a session a pool sized for concurrent scrapes (routed to the mock server if configured)
+        and report its rate-limit headers
+        """
+        from requests.adapters import HTTPAdapter
+        if self.mock_base_url:
+            adapter = _mock_adapter(self.mock_base_url, self.pool_size)
+        else:
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.hooks['response'].append(self._observe_rate_limits(platform))
+        return session
+
+    def _session(self, platform):
+        """Pooled requests session for SDKs that accept one"""
+        try:
+            import requests
+        except ImportError:
+            return None
+        return self._mount(requests.Session(), platform)
+
+    def _create_twitter(self):
+        import tweepy
+        client = tweepy.Client(bearer_token=self._config['TWITTER_BEARER_TOKEN'])
+        session = self._session('twitter')
+        if session is not None:
+            client.session = session
+        return client
+
+    def _create_instagram(self):
+        import instaloader
+        loader = instaloader.Instaloader()
+        # Instaloader keeps its own session; widen its pool for concurrent use
+        session = getattr(loader.context, '_session', None)
+        if session is not None:
+            self._mount(session, 'instagram')
+        return loader
+
+    def _create_reddit(self):
+        import praw
+        kwargs = {}
+        session = self._session('reddit')
+        if session is not None:
+            kwargs['requestor_kwargs'] = {'session': session}
+        return praw.Reddit(
+            client_id=self._config['REDDIT_CLIENT_ID'],
+            client_secret=self._config['REDDIT_CLIENT_SECRET'],
+            user_agent=self._config.get('REDDIT_USER_AGENT') or 'ForensicTool/1.0',
+            **kwargs
+        )
+
+    def _build(self, platform):
+        """Create a platform client (caller holds the lock)"""
+        stats = self._stats.setdefault(platform, {
+            'initialized_at': None,
+            'init_ms': None,
+            'reuse_count': 0,
+            'builds': 0,
+            'healthy': False,
+            'last_error': None,
+            'failed_at': None
+        })
+        factories = {
+            'twitter': (self._create_twitter, 'tweepy'),
+            'instagram': (self._create_instagram, 'instaloader'),
+            'reddit': (self._create_reddit, 'praw')
+        }
+        factory, package = factories[platform]
+
+        started = time.perf_counter()
+        stats['builds'] += 1
+        try:
+            self._clients[platform] = factory()
+            stats.update({
+                'initialized_at': datetime.utcnow().isoformat(),
+                'init_ms': round((time.perf_counter() - started) * 1000, 2),
+                'healthy': True,
+                'last_error': None,
+                'failed_at': None
+            })
+            print(f"✅ {platform.capitalize()} API initialized")
+        except ImportError:
+            self._clients[platform] = None
+            stats.update({'healthy': False, 'last_error': f"{package} not installed", 'failed_at': time.monotonic()})
+            print(f"⚠️  {package} not installed. Run: pip install {package}")
+        except Exception as e:
+            self._clients[platform] = None
+            stats.update({'healthy': False, 'last_error': str(e), 'failed_at': time.monotonic()})
+            print(f"⚠️  {platform.capitalize()} API error: {e}")
+
+    def get(self, platform):
+        """
+        Shared client for a platform, or None when real scraping is unavailable
+        A client marked unhealthy is rebuilt here, at most once per rebuild interval
+        """
+        if not self.enabled or platform not in self.PLATFORMS or not self._configured(platform):
+            return None
+
+        with self._lock:
+            stats = self._stats.get(platform)
+            if stats is None:
+                self._build(platform)
+            elif not stats['healthy'] and time.monotonic() - (stats['failed_at'] or 0) >= self.rebuild_interval:
+                self._build(platform)
+
+            client = self._clients.get(platform)
+            if client is not None:
+                self._stats[platform]['reuse_count'] += 1
+            return client
+
+    def mark_unhealthy(self, platform, error):
+        """Report a client failure (see is_client_failure) so the next get() rebuilds the client"""
+        with self._lock:
+            stats = self._stats.get(platform)
+            if stats is None:
+                return
+            stats.update({'healthy': False, 'last_error': str(error), 'failed_at': time.monotonic()})
+
+    def stats(self):
+        """Initialization time, reuse counts and health per platform"""
+        with self._lock:
+            result = {}
+            for platform in self.PLATFORMS:
+                stats = self._stats.get(platform)
+                entry = {'configured': self.enabled and self._configured(platform)}
+                if stats:
+                    entry.update({key: value for key, value in stats.items() if key != 'failed_at'})
+                result[platform] = entry
+            return {'enabled': self.enabled, 'mock_base_url': self.mock_base_url, 'clients': result}
+
+
+# Shared by every ScraperService in this process
+platform_clients = PlatformClientRegistry()
@@ -0,0 +1,178 @@
+"""
+Post Cache Service
+Local columnar on-disk cache of each case's latest posts
+Files are memory-mapped on read and keyed by the case evidence hash
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from flask import current_app
+from models.case import Case
+from models.case_post import CasePost
+from utils.post_batch import PostBatch
+
+_MAGIC = b'SFTPOST1'
+_HEADER_LEN = struct.Struct('<I')
+_FORMAT_VERSION = 2
+
+
+def _pad(length):
+    """Bytes needed to keep the next section 8-byte aligned"""
+    return (-length) % 8
+
+
+class PostCache:
+    """
+    Columnar cache of case posts
+    Layout: magic, JSON header, int64 columns, string offsets, string buffer, 16-bit row flags
+    """
+
+    def __init__(self, cache_folder=None):
+        self.cache_folder = cache_folder
+
+    def _folder(self):
+        if not self.cache_folder:
+            self.cache_folder = current_app.config.get('POST_CACHE_FOLDER', os.path.join('cache', 'posts'))
+        os.makedirs(self.cache_folder, exist_ok=True)
+        return self.cache_folder
+
+    def _path(self, case_id):
+        return os.path.join(self._folder(), f"{case_id}.posts")
+
+    def write(self, case_id, evidence_hash, posts):
+        """Write a case's posts (list of dicts or PostBatch) to the cache"""
+        batch = posts if isinstance(posts, PostBatch) else PostBatch.from_dicts(posts)
+        buffers = batch.buffers()
+
+        header = json.dumps({
+            'version': _FORMAT_VERSION,
+            'evidence_hash': evidence_hash,
+            'byteorder': sys.byteorder,
+            'count': len(batch),
+            'columns': list(PostBatch.INT_FIELDS),
+            'offsets_len': len(buffers['offsets']),
+            'strings_len': len(buffers['strings'])
+        }).encode('utf-8')
+
+        final_path = self._path(case_id)
+        temp_path = f"{final_path}.{os.getpid()}.tmp"
+
+        with open(temp_path, 'wb') as f:
+            prefix = _MAGIC + _HEADER_LEN.pack(len(header)) + header
+            f.write(prefix + b'\0' * _pad(len(prefix)))
+            for name in PostBatch.INT_FIELDS:
+                f.write(memoryview(buffers['columns'][name]).cast('B'))
+            f.write(memoryview(buffers['offsets']).cast('B'))
+            f.write(buffers['strings'])
+            f.write(memoryview(buffers['flags']).cast('B'))
+
+        # Readers never see a partially written file
+        os.replace(temp_path, final_path)
+        return final_path
+
+    def load(self, case_id, evidence_hash):
+        """
+        Memory-map the cached posts for a case
+        Returns None when there is no cache entry or it belongs to other evidence
+        """
+        path = self._path(case_id)
+        try:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError: empty file cannot be mapped
+            return None
+
+        view = memoryview(mapped)
+        if view[:len(_MAGIC)] != _MAGIC:
+            return None
+
+        position = len(_MAGIC)
+        (header_len,) = _HEADER_LEN.unpack_from(view, position)
+        position += _HEADER_LEN.size
+        header = json.loads(bytes(view[position:position + header_len]))
+        position += header_len
+        position += _pad(position)
+
+        if (header.get('version') != _FORMAT_VERSION
+                or header.get('evidence_hash') != evidence_hash
+                or header.get('byteorder') != sys.byteorder):
+            return None
+
+        count = header['count']
+        columns = {}
+        for name in header['columns']:
+            columns[name] = view[position:position + count * 8].cast('q')
+            position += count * 8
+
+        offsets_len = header['offsets_len']
+        offsets = view[position:position + offsets_len * 8].cast('q')
+        position += offsets_len * 8
+
+        strings = view[position:position + header['strings_len']]
+        position += header['strings_len']
+
+        flags = view[position:position + count * 2].cast('H')
+
+        return PostBatch(columns=columns, offsets=offsets, strings=strings, flags=flags)
+
+    def get_case_posts(self, case):
+        """
+        Return the latest snapshot's posts for a case, preferring the cache
+        The case may have been loaded without posts; they are only fetched on a miss
+        """
+        case_id = case['_id']
+        posts = self.load(case_id, case.get('evidence_hash'))
+        if posts is not None:
+            return posts
+
+        full_case = Case.find_by_id(case_id)
+        if not full_case or not full_case.get('data_collected'):
+            return []
+        latest = full_case['data_collected'][-1]
+        if latest.get('snapshot_id'):
+            # Full-history snapshots keep their posts in a separate collection
+            posts = PostBatch.from_dicts(CasePost.iter_snapshot_posts(case_id, latest['snapshot_id']))
+        else:
+            posts = latest.get('posts', [])
+
+        if full_case.get('evidence_hash'):
+            try:
+                self.write(case_id, full_case['evidence_hash'], posts)
+            except OSError as e:
+                print(f"⚠️  Post cache write failed for case {case_id}: {e}")
+        return posts
+
+    def iter_case_posts(self, case):
+        """
+        Iterate the latest snapshot's posts without materializing them
+        Reads the memory-mapped cache when it matches the evidence, otherwise streams from MongoDB
+        """
+        case_id = case['_id']
+        posts = self.load(case_id, case.get('evidence_hash'))
+        if posts is not None:
+            yield from posts
+            return
+
+        snapshots = case.get('data_collected') or []
+        if not snapshots:
+            return
+        latest = snapshots[-1]
+        if latest.get('snapshot_id'):
+            yield from CasePost.iter_snapshot_posts(case_id, latest['snapshot_id'])
+            return
+
+        # Inline snapshots are bounded by the case document size
+        full_case = Case.find_by_id(case_id)
+        if full_case and full_case.get('data_collected'):
+            yield from full_case['data_collected'][-1].get('posts', [])
+
+    def invalidate(self, case_id):
+        """Drop the cache entry for a case"""
+        try:
+            os.remove(self._path(case_id))
+        except FileNotFoundError:
+            pass
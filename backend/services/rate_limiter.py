@@ -0,0 +1,330 @@
+"""
+Rate Limiter Service
+Per-platform, per-credential token buckets for real scraping API calls
+Queues callers until budget is available and retries throttled calls with jittered backoff
+"""
+
+import hashlib
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+
+def credential_key(secret):
+    """Short fingerprint of an API credential (rate limits are per credential)"""
+    return hashlib.sha256((secret or 'anonymous').encode('utf-8')).hexdigest()[:12]
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a call cannot get rate-limit budget before its deadline"""
+
+    def __init__(self, platform, retry_after):
+        self.platform = platform
+        self.retry_after = max(0, round(retry_after, 2))
+        super().__init__(f"{platform} rate limit budget exhausted, retry after {self.retry_after}s")
+
+
+class DeadlineScope:
+    """Deadline shared by the rate-limit waits of one budgeted call, and whether one is in progress"""
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.waiting = False
+
+
+class TokenBucket:
+    """Token bucket with a FIFO wait queue"""
+
+    def __init__(self, platform, requests, period):
+        self.platform = platform
+        self.capacity = float(requests)
+        self.rate = float(requests) / float(period)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.condition = threading.Condition()
+        self.waiters = deque()
+        self.throttled = 0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _wait_time(self, now):
+        """Seconds until one token is available (caller holds the lock)"""
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def acquire(self, deadline=None):
+        """Wait in line for one token; raises RateLimitTimeout if the deadline would pass"""
+        waiter = object()
+        with self.condition:
+            self.waiters.append(waiter)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self._wait_time(now)
+                    # Callers behind the head of the queue also wait for everyone ahead of them
+                    position = self.waiters.index(waiter)
+                    expected = wait + position / self.rate
+
+                    # Checked first so a caller past its deadline never spends a token
+                    if deadline is not None and now + expected > deadline:
+                        raise RateLimitTimeout(self.platform, expected)
+
+                    if position == 0 and wait <= 0:
+                        self.tokens -= 1
+                        return
+
+                    self.condition.wait(timeout=wait if position == 0 else expected)
+            finally:
+                self.waiters.remove(waiter)
+                self.condition.notify_all()
+
+    def try_acquire(self):
+        """Take a token if one is free right now, without waiting or queueing; returns whether it did"""
+        with self.condition:
+            now = time.monotonic()
+            self._refill(now)
+            if self.waiters or now < self.blocked_until or self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def wait_time(self):
+        """Seconds until try_acquire() can succeed (ignoring callers already queued)"""
+        with self.condition:
+            return self._wait_time(time.monotonic())
+
+    def block_for(self, seconds):
+        """Stop handing out tokens for the given number of seconds (Retry-After)"""
+        with self.condition:
+            self.throttled += 1
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = min(self.tokens, 0)
+
+    def update_remaining(self, remaining, reset_in=None):
+        """Align the local budget with the platform's reported remaining quota"""
+        with self.condition:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining <= 0 and reset_in:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + reset_in)
+
+    def stats(self):
+        with self.condition:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                'budget': round(self.tokens, 2),
+                'capacity': self.capacity,
+                'refill_per_second': round(self.rate, 4),
+                'queue_depth': len(self.waiters),
+                'blocked_for_seconds': round(max(0.0, self.blocked_until - now), 2),
+                'throttled_responses': self.throttled
+            }
+
+
+def _header(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            value = headers.get(name.lower())
+        if value is not None:
+            return value
+    return None
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Registry of token buckets keyed by (platform, credential)"""
+
+    DEFAULT_LIMITS = {
+        'twitter': {'requests': 900, 'period': 900},
+        'instagram': {'requests': 200, 'period': 3600},
+        'reddit': {'requests': 100, 'period': 60}
+    }
+
+    def __init__(self):
+        self.limits = dict(self.DEFAULT_LIMITS)
+        self.max_attempts = 4
+        self.base_delay = 1.0
+        self.max_delay = 60.0
+        self.deadline_seconds = 60.0
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def init_app(self, app):
+        """Load limits and retry settings from the Flask config"""
+        self.limits.update(app.config.get('SCRAPE_RATE_LIMITS', {}))
+        self.max_attempts = app.config.get('SCRAPE_RETRY_MAX_ATTEMPTS', self.max_attempts)
+        self.base_delay = app.config.get('SCRAPE_RETRY_BASE_DELAY', self.base_delay)
+        self.max_delay = app.config.get('SCRAPE_RETRY_MAX_DELAY', self.max_delay)
+        self.deadline_seconds = app.config.get('SCRAPE_DEADLINE_SECONDS', self.deadline_seconds)
+
+    def bucket(self, platform, credential='default'):
+        key = (platform, credential)
+        with self._lock:
+            if key not in self._buckets:
+                limit = self.limits.get(platform, {'requests': 60, 'period': 60})
+                self._buckets[key] = TokenBucket(platform, limit['requests'], limit['period'])
+            return self._buckets[key]
+
+    def default_deadline(self):
+        return time.monotonic() + self.deadline_seconds
+
+    @contextmanager
+    def deadline_scope(self, scope):
+        """
+        Bound every call made on this thread inside the block by scope.deadline (monotonic seconds)
+        Used for latency-budgeted calls, so a wait that cannot finish in time fails right away
+        """
+        previous = getattr(self._local, 'scope', None)
+        if previous is not None and previous.deadline < scope.deadline:
+            scope.deadline = previous.deadline
+        self._local.scope = scope
+        try:
+            yield scope
+        finally:
+            self._local.scope = previous
+
+    def _effective_deadline(self, deadline):
+        """The earlier of an explicit deadline and the thread's scoped one (None if neither)"""
+        scope = getattr(self._local, 'scope', None)
+        if scope is not None and (deadline is None or scope.deadline < deadline):
+            return scope.deadline
+        return deadline
+
+    @contextmanager
+    def _waiting(self):
+        """Mark the thread's deadline scope as waiting on the limiter, not on the platform"""
+        scope = getattr(self._local, 'scope', None)
+        if scope is None:
+            yield
+            return
+        scope.waiting = True
+        try:
+            yield
+        finally:
+            scope.waiting = False
+
+    def acquire(self, platform, credential='default', deadline=None):
+        """Block until the platform/credential has budget for one request"""
+        with self._waiting():
+            self.bucket(platform, credential).acquire(self._effective_deadline(deadline))
+
+    def observe_headers(self, platform, credential, headers):
+        """
+        Feed rate-limit headers from a platform response into the bucket
+        Returns the Retry-After delay in seconds, if the response carried one
+        """
+        if not headers:
+            return None
+        bucket = self.bucket(platform, credential)
+
+        retry_after = parse_retry_after(_header(headers, 'Retry-After'))
+        if retry_after is not None:
+            bucket.block_for(retry_after)
+
+        remaining = _header(headers, 'x-rate-limit-remaining', 'x-ratelimit-remaining')
+        reset = _header(headers, 'x-rate-limit-reset', 'x-ratelimit-reset')
+        if remaining is not None:
+            try:
+                reset_in = float(reset) if reset is not None else None
+                # Twitter reports reset as an epoch timestamp, Reddit as seconds remaining
+                if reset_in is not None and reset_in > 1e9:
+                    reset_in = max(0.0, reset_in - time.time())
+                bucket.update_remaining(float(remaining), reset_in)
+            except ValueError:
+                pass
+
+        return retry_after
+
+    def _is_retryable(self, exc):
+        """
+        Return (retryable, throttled, retry_after) for an exception raised by an SDK call
+        throttled is True only for 429s; 5xx and network errors are retryable outages
+        """
+        response = getattr(exc, 'response', None)
+        status = getattr(response, 'status_code', None) or getattr(response, 'status', None)
+        headers = getattr(response, 'headers', None)
+
+        if status == 429:
+            return True, True, parse_retry_after(_header(headers or {}, 'Retry-After'))
+        if status is not None and 500 <= status < 600:
+            return True, False, None
+        if status is None and isinstance(exc, (ConnectionError, TimeoutError)):
+            return True, False, None
+        # requests / prawcore wrap network failures in their own exception types
+        if status is None and type(exc).__name__ in ('ConnectionError', 'Timeout', 'ReadTimeout', 'RequestException'):
+            return True, False, None
+        return False, False, None
+
+    def call(self, platform, fn, *args, credential='default', deadline=None, **kwargs):
+        """
+        Run an API call under the platform's rate limit
+        Throttled and transient failures are retried with jittered exponential backoff
+        """
+        deadline = self._effective_deadline(deadline)
+        if deadline is None:
+            deadline = self.default_deadline()
+
+        attempt = 0
+        while True:
+            self.acquire(platform, credential, deadline)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                retryable, throttled, retry_after = self._is_retryable(e)
+                if not retryable or attempt >= self.max_attempts:
+                    raise
+
+                headers = getattr(getattr(e, 'response', None), 'headers', None)
+                retry_after = self.observe_headers(platform, credential, headers) or retry_after
+
+                backoff = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+                delay = max(retry_after or 0, random.uniform(backoff / 2, backoff))
+                if time.monotonic() + delay > deadline:
+                    if throttled:
+                        raise RateLimitTimeout(platform, delay)
+                    # An outage, not throttling: let the breaker and fallback see the real error
+                    raise
+
+                print(f"⚠️  {platform} call failed ({e}), retrying in {delay:.1f}s")
+                with self._waiting():
+                    time.sleep(delay)
+
+    def stats(self):
+        """Current budget and queue depth per platform and credential"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {
+            f"{platform}:{credential}": bucket.stats()
+            for (platform, credential), bucket in buckets.items()
+        }
+
+
+# Process-wide rate limiter shared by all scraper instances
+rate_limiter = RateLimiter()
@@ -0,0 +1,62 @@
+"""
+Reddit Post Counter
+Counts a user's submissions from the same newest-first stream used to collect posts
+Counts are cached per user and only the new submissions are counted on later scrapes
+"""
+
+from models.post_count import PostCount
+
+class RedditPostCounter:
+    """Incremental submission counter for one Reddit user"""
+    
+    def __init__(self, username, metadata, cap=1000):
+        self.username = username
+        self.metadata = metadata
+        self.cap = cap
+        self.cached = PostCount.find('reddit', username)
+        self.newest_id = None
+        self.new_count = 0
+        self.complete = False
+        
+        # Until counting finishes, report the previous count (if any)
+        if self.cached:
+            self._apply(self.cached['count'], self.cached['capped'])
+        else:
+            self._apply(0, True)
+    
+    def _apply(self, count, capped):
+        self.metadata['total_posts'] = count
+        self.metadata['total_posts_capped'] = capped
+        self.metadata['total_posts_estimate'] = f"≥{count}" if capped else str(count)
+    
+    def _finish(self, count, capped):
+        self.complete = True
+        self._apply(count, capped)
+        if self.newest_id is not None:
+            PostCount.save('reddit', self.username, count, self.newest_id, capped)
+    
+    def observe(self, submission_id):
+        """Feed the next submission id of the newest-first listing"""
+        if self.complete:
+            return
+        if self.newest_id is None:
+            self.newest_id = submission_id
+        
+        if self.cached and submission_id == self.cached.get('newest_id'):
+            # Everything older was counted last time
+            self._finish(self.new_count + self.cached['count'], self.cached['capped'])
+            return
+        
+        self.new_count += 1
+        if self.new_count >= self.cap:
+            self._finish(self.new_count, True)
+    
+    def partial(self):
+        """Report what has been counted so far as a lower bound while counting continues elsewhere"""
+        if not self.complete:
+            self._apply(max(self.new_count, self.cached['count'] if self.cached else 0), True)
+    
+    def exhausted(self):
+        """The listing ended, so the count is exact"""
+        if not self.complete:
+            self._finish(self.new_count, False)
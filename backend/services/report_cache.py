@@ -0,0 +1,134 @@
+"""
+Report Cache
+Content-addressed cache of rendered (unencrypted) report PDFs
+Regenerating an unchanged report only re-encrypts the cached rendering for the new password
+Renderings are kept in process memory only, never on disk
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from services.report_theme import REPORT_TEMPLATE_VERSION
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Approximate size of a rendering: fixed sections plus each appendix table row (compressed)
+REPORT_BASE_BYTES = 64 * 1024
+REPORT_ROW_BYTES = 64
+
+
+def report_content_key(case_data):
+    """
+    Key of everything a report is rendered from: evidence hash, analysis results,
+    the case fields shown in the report and the report template version
+    """
+    snapshots = case_data.get('data_collected') or []
+    latest = snapshots[-1] if snapshots else {}
+    analysis_version = hashlib.sha256(
+        json.dumps(case_data.get('analysis_results') or {}, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+    content = {
+        'template_version': REPORT_TEMPLATE_VERSION,
+        'evidence_hash': case_data.get('evidence_hash'),
+        'snapshot_id': latest.get('snapshot_id'),
+        'analysis_version': analysis_version,
+        'case': [
+            str(case_data['_id']), case_data.get('target_username'), case_data.get('platform'),
+            case_data.get('status'), str(case_data.get('created_at')),
+            case_data.get('risk_level'), case_data.get('risk_score')
+        ]
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    """Size-bounded LRU of rendered report PDFs with hit/miss counters"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        # One report may use at most a quarter of the cache so a huge case cannot flush everything
+        self.max_entry_bytes = max_bytes // 4
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def may_fit(self, estimated_bytes):
+        """Whether a rendering of about this size would be accepted by put"""
+        return self.enabled and estimated_bytes <= self.max_entry_bytes
+
+    def get(self, key):
+        """(rendering, rendered_at) for a content key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, data, rendered_at):
+        """
+        Store a rendering and the time printed on it, evicting the least recently used ones
+        to stay within max_bytes
+        """
+        if len(data) > self.max_entry_bytes:
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+            self._entries[key] = (data, rendered_at)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Counters and size of the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'rejected': self.rejected
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache():
+    """Process-wide report cache, sized by REPORT_CACHE_MAX_BYTES (0 disables it)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = current_app.config if has_app_context() else {}
+                _cache = ReportCache(config.get('REPORT_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+    return _cache
@@ -0,0 +1,327 @@
+"""
+Report Charts
+Sentiment breakdown, risk component and posting timeline charts drawn with reportlab graphics
+Drawings are cached by a hash of the data they show, so regenerating a report for an unchanged case
+reuses them instead of laying the charts out again; render times are tracked per chart
+"""
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import date, timedelta
+from flask import current_app, has_app_context
+from reportlab.graphics.charts.barcharts import HorizontalBarChart, VerticalBarChart
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from utils.post_batch import timestamp_to_micros
+
+# Bump whenever a chart's look changes; cached drawings are keyed on it
+CHART_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 256
+
+CHART_SENTIMENT = 'sentiment'
+CHART_RISK = 'risk_components'
+CHART_TIMELINE = 'timeline'
+
+WIDTH = 6.5 * inch
+HEIGHT = 2.4 * inch
+
+# Timeline buckets get coarser as the posting period grows, to keep the chart readable
+MAX_TIMELINE_BARS = 90
+_MICROS_PER_DAY = 86400 * 1000000
+_EPOCH = date(1970, 1, 1)
+
+SENTIMENT_COLORS = {
+    'positive': colors.HexColor('#00ff88'),
+    'negative': colors.HexColor('#ff4d4d'),
+    'neutral': colors.HexColor('#8c8c8c')
+}
+BAR_COLOR = colors.HexColor('#00d4ff')
+
+
+def sentiment_data(analysis):
+    """Positive/negative/neutral percentages, or None without sentiment results"""
+    sentiment = analysis.get('sentiment') or {}
+    if not sentiment.get('detailed_sentiments') and 'positive_percentage' not in sentiment:
+        return None
+    return [
+        [label, sentiment.get(f'{label}_percentage', 0) or 0]
+        for label in ('positive', 'negative', 'neutral')
+    ]
+
+
+def risk_component_data(analysis):
+    """
+    Points each detector adds to the risk score, against its maximum
+    Mirrors AnalysisService._calculate_risk_score
+    """
+    if not analysis:
+        return None
+    cyberbullying = analysis.get('cyberbullying') or {}
+    fraud = analysis.get('fraud_detection') or {}
+    fake_profile = analysis.get('fake_profile') or {}
+    sentiment = analysis.get('sentiment') or {}
+    return [
+        ['Cyberbullying', round(min((cyberbullying.get('confidence') or 0) * 0.4, 40), 2) if cyberbullying.get('detected') else 0, 40],
+        ['Fraud/Scam', round(min((fraud.get('confidence') or 0) * 0.3, 30), 2) if fraud.get('detected') else 0, 30],
+        ['Fake Profile', round(min((fake_profile.get('fake_score') or 0) * 0.2, 20), 2), 20],
+        [
+            'Negative Sentiment',
+            round(min((sentiment.get('negative_percentage') or 0) * 0.1, 10), 2) if sentiment.get('overall') == 'negative' else 0,
+            10
+        ]
+    ]
+
+
+def timeline_data(posts):
+    """
+    Posts per day, week or month (whichever keeps the bar count readable) as [[label, count], ...]
+    posts may be any iterable; only a count per day is kept
+    """
+    days = Counter()
+    for post in posts:
+        value = post.get('timestamp')
+        if not value:
+            continue
+        try:
+            days[timestamp_to_micros(value)[0] // _MICROS_PER_DAY] += 1
+        except (TypeError, ValueError):
+            continue
+    if not days:
+        return None
+
+    first, last = min(days), max(days)
+    if last - first < MAX_TIMELINE_BARS:
+        bucket = lambda day: _EPOCH + timedelta(days=day)
+        label = lambda start: start.strftime('%m-%d')
+    elif (last - first) // 7 < MAX_TIMELINE_BARS:
+        bucket = lambda day: _EPOCH + timedelta(days=day - (day + 3) % 7)  # Monday of the week
+        label = lambda start: start.strftime('%m-%d')
+    else:
+        bucket = lambda day: (_EPOCH + timedelta(days=day)).replace(day=1)
+        label = lambda start: start.strftime('%Y-%m')
+
+    counts = Counter()
+    for day, count in days.items():
+        counts[bucket(day)] += count
+    return [[label(start), counts[start]] for start in sorted(counts)]
+
+
+def _title(text, theme):
+    return String(0, HEIGHT - 12, text, fontName=theme.fonts['bold'], fontSize=10)
+
+
+def _draw_sentiment(data, theme):
+    drawing = Drawing(WIDTH, HEIGHT)
+    drawing.add(_title('Sentiment Breakdown (% of posts)', theme))
+    shown = [(label, value) for label, value in data if value]
+    if not shown:
+        return drawing
+    pie = Pie()
+    pie.x, pie.y = 0.4 * inch, 0.15 * inch
+    pie.width = pie.height = HEIGHT - 0.55 * inch
+    pie.data = [value for _, value in shown]
+    pie.labels = [f"{label.title()} {value}%" for label, value in shown]
+    pie.simpleLabels = 1
+    pie.slices.fontName = theme.fonts['body']
+    pie.slices.fontSize = 8
+    pie.slices.strokeColor = colors.white
+    for index, (label, _) in enumerate(shown):
+        pie.slices[index].fillColor = SENTIMENT_COLORS[label]
+    drawing.add(pie)
+    return drawing
+
+
+def _draw_risk_components(data, theme):
+    drawing = Drawing(WIDTH, HEIGHT)
+    drawing.add(_title('Risk Score Components (points / maximum)', theme))
+    chart = HorizontalBarChart()
+    chart.x, chart.y = 1.4 * inch, 0.3 * inch
+    chart.width, chart.height = WIDTH - 1.8 * inch, HEIGHT - 0.7 * inch
+    # Maximum first so the scored bar is drawn over it
+    chart.data = [[maximum for _, _, maximum in data], [points for _, points, _ in data]]
+    chart.bars[0].fillColor = colors.HexColor('#e6e6e6')
+    chart.bars[1].fillColor = colors.HexColor('#ff4d4d')
+    chart.bars.strokeColor = None
+    chart.groupSpacing = 6
+    chart.barSpacing = -chart.barWidth  # overlap the two series
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueMax = 40
+    chart.valueAxis.valueStep = 10
+    chart.valueAxis.labels.fontName = theme.fonts['body']
+    chart.valueAxis.labels.fontSize = 7
+    chart.categoryAxis.categoryNames = [label for label, _, _ in data]
+    chart.categoryAxis.labels.fontName = theme.fonts['body']
+    chart.categoryAxis.labels.fontSize = 8
+    chart.categoryAxis.labels.boxAnchor = 'e'
+    chart.categoryAxis.labels.dx = -4
+    drawing.add(chart)
+    return drawing
+
+
+def _draw_timeline(data, theme):
+    drawing = Drawing(WIDTH, HEIGHT)
+    drawing.add(_title('Posting Timeline (posts per period)', theme))
+    chart = VerticalBarChart()
+    chart.x, chart.y = 0.45 * inch, 0.45 * inch
+    chart.width, chart.height = WIDTH - 0.6 * inch, HEIGHT - 0.85 * inch
+    chart.data = [[count for _, count in data]]
+    chart.bars[0].fillColor = BAR_COLOR
+    chart.bars.strokeColor = None
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontName = theme.fonts['body']
+    chart.valueAxis.labels.fontSize = 7
+    # Label about a dozen bars so the labels never overlap
+    every = max(1, len(data) // 12)
+    chart.categoryAxis.categoryNames = [label if index % every == 0 else '' for index, (label, _) in enumerate(data)]
+    chart.categoryAxis.labels.fontName = theme.fonts['body']
+    chart.categoryAxis.labels.fontSize = 7
+    chart.categoryAxis.labels.angle = 30
+    chart.categoryAxis.labels.boxAnchor = 'ne'
+    drawing.add(chart)
+    return drawing
+
+
+_DRAWERS = {
+    CHART_SENTIMENT: _draw_sentiment,
+    CHART_RISK: _draw_risk_components,
+    CHART_TIMELINE: _draw_timeline
+}
+
+
+def chart_key(kind, data, theme):
+    """Hash of a chart's kind, data and fonts"""
+    content = {'version': CHART_VERSION, 'kind': kind, 'data': data, 'fonts': theme.fonts}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class ChartCache:
+    """
+    Entry-bounded LRU of chart drawings, expanded to plain shapes so the chart layout is never redone
+    Tracks hits, misses and render times per chart kind
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def _kind_stats(self, kind):
+        return self._stats.setdefault(kind, {'hits': 0, 'misses': 0, 'renders': 0, 'render_ms_total': 0.0, 'render_ms_last': None})
+
+    def get(self, kind, key):
+        """Copy of a cached drawing, or None (a copy, since the flowable is laid out per document)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            stats = self._kind_stats(kind)
+            drawing = self._entries.get(key)
+            if drawing is None:
+                stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            stats['hits'] += 1
+            return copy.copy(drawing)
+
+    def render(self, kind, data, theme, key):
+        """Draw a chart, timing it, and cache the drawing under key"""
+        started = time.perf_counter()
+        drawing = _DRAWERS[kind](data, theme).expandUserNodes()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            stats = self._kind_stats(kind)
+            stats['renders'] += 1
+            stats['render_ms_total'] += elapsed_ms
+            stats['render_ms_last'] = round(elapsed_ms, 3)
+            if self.enabled:
+                self._entries[key] = drawing
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return copy.copy(drawing)
+
+    def drawing(self, kind, data, theme, key=None):
+        """
+        Drawing of a chart, from the cache when the same data was drawn before
+        key overrides the data hash (e.g. the evidence hash for the timeline)
+        """
+        key = key or chart_key(kind, data, theme)
+        return self.get(kind, key) or self.render(kind, data, theme, key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Entry count plus per-chart hits, misses and render times"""
+        with self._lock:
+            charts = {}
+            for kind, stats in self._stats.items():
+                renders = stats['renders']
+                charts[kind] = {
+                    'hits': stats['hits'],
+                    'misses': stats['misses'],
+                    'renders': renders,
+                    'render_ms_avg': round(stats['render_ms_total'] / renders, 3) if renders else None,
+                    'render_ms_last': stats['render_ms_last']
+                }
+            return {'entries': len(self._entries), 'max_entries': self.max_entries, 'charts': charts}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_chart_cache():
+    """Process-wide chart cache, sized by REPORT_CHART_CACHE_ENTRIES (0 disables it)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = current_app.config if has_app_context() else {}
+                _cache = ChartCache(config.get('REPORT_CHART_CACHE_ENTRIES', DEFAULT_MAX_ENTRIES))
+    return _cache
+
+
+def report_charts(case_data, posts, theme, cache=None):
+    """
+    Chart drawings of a report keyed by section: 'sentiment', 'risk_components', 'timeline' (missing when no data)
+    posts is a re-iterable of the reported posts, or a callable returning a fresh iterable;
+    for a case's own latest snapshot the timeline is keyed by the evidence hash, so a cached
+    timeline needs no pass over the posts at all
+    """
+    cache = cache or get_chart_cache()
+    analysis = case_data.get('analysis_results') or {}
+    charts = {}
+
+    for kind, data in ((CHART_SENTIMENT, sentiment_data(analysis)), (CHART_RISK, risk_component_data(analysis))):
+        if data:
+            charts[kind] = cache.drawing(kind, data, theme)
+
+    evidence_hash = case_data.get('evidence_hash')
+    if callable(posts) and evidence_hash:
+        key = chart_key(CHART_TIMELINE, {'evidence_hash': evidence_hash}, theme)
+        timeline = cache.get(CHART_TIMELINE, key)
+        if timeline is None:
+            data = timeline_data(posts())
+            timeline = cache.render(CHART_TIMELINE, data, theme, key) if data else None
+    elif posts is not None:
+        data = timeline_data(posts() if callable(posts) else posts)
+        timeline = cache.drawing(CHART_TIMELINE, data, theme) if data else None
+    else:
+        timeline = None
+    if timeline is not None:
+        charts[CHART_TIMELINE] = timeline
+    return charts
@@ -0,0 +1,219 @@
+"""
+Report Download Service
+Serves report files with strong ETags, single byte ranges and per-chunk integrity checks
+Can hand the transfer to the kernel (sendfile) or the front-end server (X-Accel-Redirect / X-Sendfile)
+"""
+
+import hashlib
+import os
+from itertools import chain
+from flask import Response, current_app, request, stream_with_context
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from werkzeug.datastructures import ContentRange
+from werkzeug.wsgi import wrap_file
+from models.audit_log import AuditLog
+
+MODE_VERIFY = 'verify'
+MODE_SENDFILE = 'sendfile'
+MODE_X_ACCEL_REDIRECT = 'x-accel-redirect'
+MODE_X_SENDFILE = 'x-sendfile'
+MODES = (MODE_VERIFY, MODE_SENDFILE, MODE_X_ACCEL_REDIRECT, MODE_X_SENDFILE)
+
+READ_SIZE = 64 * 1024
+
+DOWNLOAD_TOKEN_SALT = 'report-download'
+
+
+class IntegrityError(Exception):
+    """Report file no longer matches the hashes recorded when it was written"""
+
+
+class DownloadTokenError(Exception):
+    """Download token is forged, expired or issued for another report"""
+
+
+class RangeNotSatisfiable(Exception):
+    """Requested byte range lies outside the file"""
+
+    def __init__(self, size):
+        super().__init__(f"Range not satisfiable (file is {size} bytes)")
+        self.size = size
+
+
+def _token_serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt=DOWNLOAD_TOKEN_SALT)
+
+
+def issue_download_token(report_id, user_id):
+    """Signed token letting user_id GET one report until REPORT_DOWNLOAD_TOKEN_TTL runs out"""
+    return _token_serializer().dumps({'report_id': report_id, 'user_id': user_id})
+
+
+def verify_download_token(token, report_id):
+    """User ID a valid download token for this report was issued to"""
+    try:
+        claims = _token_serializer().loads(
+            token or '', max_age=current_app.config.get('REPORT_DOWNLOAD_TOKEN_TTL', 900)
+        )
+    except BadSignature as e:
+        # SignatureExpired is a BadSignature too
+        raise DownloadTokenError(f"Invalid or expired download token: {e}")
+    if claims.get('report_id') != report_id:
+        raise DownloadTokenError('Download token was issued for another report')
+    return claims['user_id']
+
+
+class ReportDownload:
+    """
+    One report file served for one request
+    verify mode reads the requested chunks and checks each against its recorded hash before sending it;
+    the other modes skip reading the file in Python and are only used while the file's size and mtime
+    still match what was recorded when it was written (otherwise the verified path is used)
+    """
+
+    def __init__(self, report, mode=None):
+        self.report = report
+        self.path = report['file_path']
+        self.etag = report['file_hash']
+        self.integrity = report.get('integrity') or {}
+        self.mode = mode or current_app.config.get('REPORT_DOWNLOAD_MODE', MODE_VERIFY)
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown REPORT_DOWNLOAD_MODE {self.mode}")
+        self.stat = os.stat(self.path)
+        self.size = self.stat.st_size
+
+    def not_modified(self):
+        """True when the client already holds this exact file (If-None-Match)"""
+        return bool(request.if_none_match) and request.if_none_match.contains(self.etag)
+
+    def byte_range(self):
+        """
+        (start, end) inclusive for a single satisfiable Range, None for the whole file
+        Ranges are ignored when If-Range names another version, when several ranges are asked for,
+        and for old reports without chunk hashes (those can only be verified as a whole)
+        """
+        requested = request.range
+        if not requested or not self.integrity.get('chunk_hashes'):
+            return None
+        if_range = request.if_range
+        if if_range and (if_range.etag or if_range.date) and if_range.etag != self.etag:
+            return None
+        if len(requested.ranges) != 1:
+            return None
+        resolved = requested.range_for_length(self.size)
+        if resolved is None:
+            raise RangeNotSatisfiable(self.size)
+        start, stop = resolved
+        return start, stop - 1
+
+    def untouched(self):
+        """Size and mtime are still those recorded when the report was written"""
+        return (
+            self.integrity.get('size') == self.size
+            and self.integrity.get('mtime_ns') == self.stat.st_mtime_ns
+        )
+
+    def response(self, download_name, byte_range=None):
+        """Build the 200/206 response; raises IntegrityError if the first chunk is already corrupt"""
+        mode = self.mode if self.untouched() else MODE_VERIFY
+        start, end = byte_range if byte_range else (0, self.size - 1)
+        length = end - start + 1 if self.size else 0
+
+        headers = {
+            'Content-Type': 'application/pdf',
+            'Content-Disposition': f'attachment; filename="{download_name}"',
+            'Accept-Ranges': 'bytes',
+            # Reports are sensitive: never stored by shared caches, always revalidated
+            'Cache-Control': 'private, no-cache'
+        }
+
+        if mode in (MODE_X_ACCEL_REDIRECT, MODE_X_SENDFILE):
+            # The front-end server sends the file and applies Range itself
+            response = Response(status=200, headers=headers)
+            if mode == MODE_X_ACCEL_REDIRECT:
+                prefix = current_app.config.get('REPORT_ACCEL_REDIRECT_PREFIX', '/protected-reports').rstrip('/')
+                response.headers['X-Accel-Redirect'] = f"{prefix}/{os.path.basename(self.path)}"
+            else:
+                response.headers['X-Sendfile'] = os.path.abspath(self.path)
+            response.set_etag(self.etag)
+            return response
+
+        if mode == MODE_SENDFILE and end == self.size - 1:
+            # The WSGI server's file wrapper (e.g. gunicorn) sends from the current offset with sendfile(2);
+            # only used for ranges reaching the end of the file, since the wrapper's fallback reads to EOF
+            f = open(self.path, 'rb')
+            f.seek(start)
+            body = wrap_file(request.environ, f, READ_SIZE)
+            response = Response(body, status=206 if byte_range else 200, headers=headers, direct_passthrough=True)
+        elif mode == MODE_SENDFILE:
+            response = Response(self._read(start, end), status=206, headers=headers, direct_passthrough=True)
+        else:
+            chunks = self._verified(start, end) if self.integrity.get('chunk_hashes') else self._verified_whole()
+            # Check the first chunk before any header goes out, so small reports fail cleanly
+            first = next(chunks, b'')
+            body = stream_with_context(self._log_tampering(chain([first], chunks)))
+            response = Response(body, status=206 if byte_range else 200, headers=headers, direct_passthrough=True)
+
+        response.content_length = length
+        if byte_range:
+            response.content_range = ContentRange('bytes', start, end + 1, self.size)
+        response.set_etag(self.etag)
+        return response
+
+    def _read(self, start, end):
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                data = f.read(min(READ_SIZE, remaining))
+                if not data:
+                    return
+                remaining -= len(data)
+                yield data
+
+    def _verified(self, start, end):
+        """Yield bytes start..end, reading whole chunks and checking each hash before its bytes are sent"""
+        chunk_size = self.integrity['chunk_size']
+        chunk_hashes = self.integrity['chunk_hashes']
+        first, last = start // chunk_size, end // chunk_size
+        with open(self.path, 'rb') as f:
+            f.seek(first * chunk_size)
+            for index in range(first, last + 1):
+                data = f.read(chunk_size)
+                if index >= len(chunk_hashes) or hashlib.sha256(data).hexdigest() != chunk_hashes[index]:
+                    raise IntegrityError(f"Report {self.report['_id']} chunk {index} does not match its hash")
+                offset = index * chunk_size
+                low = start - offset if index == first else 0
+                high = end + 1 - offset if index == last else len(data)
+                yield data[low:high]
+
+    def _verified_whole(self):
+        """
+        Reports written before chunk hashes existed: stream the file and compare the full hash at the end
+        A mismatch aborts the transfer, so the client never receives a complete copy of a tampered file
+        """
+        sha256 = hashlib.sha256()
+        with open(self.path, 'rb') as f:
+            for data in iter(lambda: f.read(READ_SIZE), b''):
+                sha256.update(data)
+                if f.tell() == self.size and sha256.hexdigest() != self.etag:
+                    raise IntegrityError(f"Report {self.report['_id']} does not match its hash")
+                yield data
+
+    def _log_tampering(self, chunks):
+        try:
+            yield from chunks
+        except IntegrityError as e:
+            record_integrity_failure(self.report, str(e))
+            raise
+
+
+def record_integrity_failure(report, error):
+    """Audit and report a file that failed verification"""
+    print(f"🚨 {error}")
+    AuditLog.log(
+        user_id=request.current_user['_id'] if hasattr(request, 'current_user') else None,
+        action=AuditLog.ACTION_INTEGRITY_FAILURE,
+        details={'report_id': report['_id'], 'case_id': report.get('case_id'), 'error': error},
+        ip_address=request.remote_addr
+    )
@@ -0,0 +1,240 @@
+"""
+Report Engine
+Streams report flowables from generators so large evidence appendices never sit in memory as a whole
+and writes them compactly: compressed page streams, shared page resources, plain-text table cells
+"""
+
+import zlib
+from itertools import islice
+from xml.sax.saxutils import escape
+from flask import current_app, has_app_context
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFName, PDFResourceDictionary, PDFStream, PDFZCompress
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from reportlab.platypus import LongTable, Paragraph, PageBreak, Spacer
+from reportlab.lib.units import inch
+
+DEFAULT_CHUNK_ROWS = 200
+DEFAULT_COMPRESSION_LEVEL = 9
+MAX_CELL_CHARS = 2000
+
+# Left plus right padding of a table cell (reportlab's default of 6 points each)
+CELL_PADDING = 12
+
+
+class LazyStory:
+    """
+    List-like view over a flowable generator for reportlab's doc.build()
+    build() only ever touches the front of the story (index, delete, re-insert split parts),
+    so a small look-ahead buffer is enough and flowables are created as pages fill up
+    Keep it small: each buffered flowable may be a whole chunk of table rows
+    """
+
+    def __init__(self, flowables, lookahead=2):
+        self._source = iter(flowables)
+        self._buffer = []
+        self.lookahead = lookahead
+
+    def _fill(self, count):
+        while self._source is not None and len(self._buffer) < count:
+            try:
+                self._buffer.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        # Never more than the buffered look-ahead; zero only once the generator is exhausted
+        self._fill(self.lookahead)
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop if index.stop is not None else self.lookahead)
+        else:
+            self._fill(index + 1)
+        return self._buffer[index]
+
+    def __setitem__(self, index, value):
+        self._buffer[index] = value
+
+    def __delitem__(self, index):
+        del self._buffer[index]
+
+    def insert(self, index, value):
+        self._buffer.insert(index, value)
+
+
+def _compression_level():
+    if has_app_context():
+        return current_app.config.get('REPORT_COMPRESSION_LEVEL', DEFAULT_COMPRESSION_LEVEL)
+    return DEFAULT_COMPRESSION_LEVEL
+
+
+class StreamingCanvas(canvas.Canvas):
+    """
+    Canvas that compresses each page's content stream as soon as the page is finished
+    reportlab otherwise keeps every page's drawing commands as text until the document is saved,
+    which makes memory grow several times faster with the page count
+    Pages with identical resources (fonts, procsets) share one resource dictionary object
+    instead of an inline copy each, and default page entries are left out
+    This mirrors reportlab's own PDFPage.check_format, so reportlab is pinned exactly in requirements.txt
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # zlib level 1 (fastest) to 9 (smallest), REPORT_COMPRESSION_LEVEL
+        self._compression_level = _compression_level()
+        self._shared_resources = {}
+
+    def showPage(self):
+        super().showPage()
+        page = self._doc.Pages.pages[-1]
+        if page.stream and not page.Contents:
+            data = page.stream.encode('utf8') if isinstance(page.stream, str) else page.stream
+            contents = PDFStream(content=zlib.compress(data, self._compression_level))
+            # A preset Filter tells reportlab the content is already encoded
+            contents.dictionary['Filter'] = PDFArray([PDFName(PDFZCompress.pdfname)])
+            contents.__Comment__ = "page stream"
+            page.Contents = contents
+            page.stream = None
+
+        if not page.Resources:
+            page.Resources = self._share_resources(page)
+        # Rotate 0 and an empty transition are the defaults; omit them from every page
+        if not page.Rotate:
+            page.Rotate = None
+        if page.Trans is not None and not page.Trans.dict:
+            page.Trans = None
+
+    def _share_resources(self, page):
+        """The page's resource dictionary (as PDFPage.check_format builds it), stored once per distinct content"""
+        resources = PDFResourceDictionary()
+        resources.basicFonts()
+        if page.hasImages:
+            resources.allProcs()
+        else:
+            resources.basicProcs()
+        if page.XObjects:
+            resources.XObject = page.XObjects
+        if page.ExtGState:
+            resources.ExtGState = page.ExtGState
+        resources.setShading(page._shadingUsed)
+        resources.setColorSpace(page._colorsUsed)
+
+        key = resources.format(self._doc)
+        reference = self._shared_resources.get(key)
+        if reference is None:
+            reference = self._doc.Reference(resources)
+            self._shared_resources[key] = reference
+        return reference
+
+
+def _chunk_rows():
+    if has_app_context():
+        return current_app.config.get('REPORT_TABLE_CHUNK_ROWS', DEFAULT_CHUNK_ROWS)
+    return DEFAULT_CHUNK_ROWS
+
+
+def cell(text, style, width=None):
+    """
+    Wrapped, escaped table cell; very long texts are cut to keep rows on one page
+    Text that fits on one line of a column width is returned as a plain string, which the table
+    draws directly: no paragraph layout and a far shorter page stream
+    """
+    text = '' if text is None else str(text)
+    if (width and len(text) <= MAX_CELL_CHARS and '\n' not in text
+            and stringWidth(text, style.fontName, style.fontSize) <= width - CELL_PADDING):
+        return text
+    if len(text) > MAX_CELL_CHARS:
+        text = text[:MAX_CELL_CHARS] + ' …'
+    return Paragraph(escape(text), style)
+
+
+def chunked_table(header, rows, col_widths, style, chunk_rows=None):
+    """
+    Yield LongTables of chunk_rows rows each, every one repeating the header on each page
+    Only one chunk of rows is materialized at a time
+    """
+    chunk_rows = chunk_rows or _chunk_rows()
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        yield LongTable([header] + chunk, colWidths=col_widths, repeatRows=1, style=style)
+
+
+def _post_rows(posts, theme):
+    widths = theme.post_col_widths
+    for number, post in enumerate(posts, start=1):
+        yield [
+            number,
+            cell(post.get('post_id'), theme.cell, widths[1]),
+            cell(post.get('timestamp'), theme.cell, widths[2]),
+            cell(post.get('content'), theme.cell, widths[3]),
+            f"{post.get('likes', 0) or 0}/{post.get('comments', 0) or 0}/{post.get('shares', 0) or 0}"
+        ]
+
+
+def _incident_rows(incidents, theme):
+    widths = theme.incident_col_widths
+    for incident in incidents:
+        yield [
+            cell(incident.get('post_id'), theme.cell, widths[0]),
+            (incident.get('severity') or '').upper(),
+            cell(', '.join(incident.get('matched_keywords', [])), theme.cell, widths[2]),
+            cell(incident.get('content'), theme.cell, widths[3])
+        ]
+
+
+def _suspicious_rows(suspicious_posts, theme):
+    widths = theme.incident_col_widths
+    for post in suspicious_posts:
+        yield [
+            cell(post.get('post_id'), theme.cell, widths[0]),
+            (post.get('risk_level') or '').upper(),
+            cell(', '.join(post.get('patterns', [])), theme.cell, widths[2]),
+            cell(post.get('content'), theme.cell, widths[3])
+        ]
+
+
+def evidence_appendix(analysis, posts, theme):
+    """
+    Flowables of the evidence appendix: flagged incidents, suspicious posts and every collected post
+    posts may be any iterable (e.g. a database cursor); it is consumed once, page by page
+    """
+    yield PageBreak()
+    yield Paragraph("EVIDENCE APPENDIX", theme.heading)
+
+    incidents = (analysis.get('cyberbullying') or {}).get('incidents') or []
+    if incidents:
+        yield Paragraph("A.1 CYBERBULLYING INCIDENTS", theme.subheading)
+        yield from chunked_table(
+            ['Post ID', 'Severity', 'Keywords', 'Content'],
+            _incident_rows(incidents, theme),
+            theme.incident_col_widths, theme.appendix_table
+        )
+        yield Spacer(1, 0.2*inch)
+
+    suspicious_posts = (analysis.get('fraud_detection') or {}).get('suspicious_posts') or []
+    if suspicious_posts:
+        yield Paragraph("A.2 SUSPICIOUS POSTS (FRAUD/SCAM)", theme.subheading)
+        yield from chunked_table(
+            ['Post ID', 'Risk', 'Patterns', 'Content'],
+            _suspicious_rows(suspicious_posts, theme),
+            theme.incident_col_widths, theme.appendix_table
+        )
+        yield Spacer(1, 0.2*inch)
+
+    yield Paragraph("A.3 COLLECTED POSTS", theme.subheading)
+    tables = chunked_table(
+        ['#', 'Post ID', 'Timestamp', 'Content', 'Engagement'],
+        _post_rows(posts, theme),
+        theme.post_col_widths, theme.appendix_table
+    )
+    first = next(tables, None)
+    if first is None:
+        yield Paragraph("No posts collected.", theme.normal)
+        return
+    yield first
+    yield from tables
@@ -4,25 +4,61 @@ Creates encrypted PDF forensic reports
 """
 
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from datetime import datetime
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+from reportlab.lib.pdfencrypt import StandardEncryption
 from PyPDF2 import PdfReader, PdfWriter
-import hashlib
+from datetime import datetime
+import io
 import os
+import tempfile
+import uuid
+from itertools import chain
 from flask import current_app
+from services.post_cache import PostCache
+from services.report_cache import REPORT_BASE_BYTES, REPORT_ROW_BYTES, get_report_cache, report_content_key
+from services.report_charts import CHART_RISK, CHART_SENTIMENT, CHART_TIMELINE, get_chart_cache, report_charts
+from services.report_engine import LazyStory, StreamingCanvas, evidence_appendix
+from services.report_theme import get_theme
+from utils.hash_utils import ChunkedHasher, hash_password
+
+# Strengths a cached rendering can be re-encrypted with (PyPDF2 only writes RC4)
+RC4_STRENGTHS = (40, 128)
+
+
+class _HashingFile:
+    """Write-through file wrapper that computes the SHA-256 (whole file and per chunk) of everything written"""
+
+    def __init__(self, f):
+        self.file = f
+        self.name = f.name
+        self.hasher = ChunkedHasher()
+
+    def write(self, data):
+        self.hasher.update(data)
+        return self.file.write(data)
+
+    def tell(self):
+        return self.file.tell()
+
+    def flush(self):
+        self.file.flush()
+
 
 class ReportService:
     """Service for generating forensic PDF reports"""
     
-    def __init__(self):
+    def __init__(self, theme=None, cache=None, chart_cache=None):
         self.report_folder = None
+        self.theme = theme
+        self.cache = cache
+        self.chart_cache = chart_cache
     
-    def generate_pdf_report(self, case_data, encryption_password):
-        """Generate an encrypted PDF forensic report"""
+    def generate_pdf_report(self, case_data, encryption_password, posts=None):
+        """
+        Generate an encrypted PDF forensic report
+        posts (any iterable) feeds the evidence appendix; by default the case's latest snapshot is streamed
+        """
         
         # Set report folder from config
         if not self.report_folder:
@@ -30,35 +66,70 @@ class ReportService:
         
         os.makedirs(self.report_folder, exist_ok=True)
         
-        # Generate unique filename
+        # Generate unique filename (cached reports take milliseconds, so the timestamp alone can repeat)
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        filename = f"forensic_report_{case_data['_id']}_{timestamp}.pdf"
-        temp_filepath = os.path.join(self.report_folder, f"temp_{filename}")
+        filename = f"forensic_report_{case_data['_id']}_{timestamp}_{uuid.uuid4().hex[:8]}.pdf"
         final_filepath = os.path.join(self.report_folder, filename)
         
-        # Create PDF document
-        doc = SimpleDocTemplate(temp_filepath, pagesize=letter)
+        # Unchanged reports are rendered once and only re-encrypted for each new password;
+        # explicitly passed posts are not part of the content key, so those reports bypass the cache
+        content_key = report_content_key(case_data)
+        cache = self.cache or get_report_cache()
+        strength = current_app.config.get('REPORT_ENCRYPTION_STRENGTH', 128)
+        cache_hit = False
+        rendered_at = datetime.utcnow()
+        rendering = None
+        if cache.enabled and posts is None and strength in RC4_STRENGTHS:
+            entry = cache.get(content_key)
+            cache_hit = entry is not None
+            if cache_hit:
+                # The PDF shows when its content was rendered, so the record keeps that time too
+                rendering, rendered_at = entry
+            elif cache.may_fit(self._estimated_size(case_data)):
+                # Only renderings that can actually be cached are held in memory and re-encrypted
+                rendering = self._render(self._build_story(case_data, posts, rendered_at))
+                cache.put(content_key, rendering, rendered_at)
+        if rendering is not None:
+            file_hash, integrity = self._encrypt_rendering(rendering, final_filepath, encryption_password, strength)
+        else:
+            # Build and encrypt the PDF in one pass, hashing it as it is written
+            file_hash, integrity = self._write_encrypted(
+                self._build_story(case_data, posts, rendered_at), final_filepath, encryption_password
+            )
+        
+        # Generate encryption password hash (for verification)
+        encryption_hash = hash_password(encryption_password)
+        
+        return {
+            'file_path': final_filepath,
+            'file_hash': file_hash,
+            'integrity': integrity,
+            'encryption_hash': encryption_hash,
+            'content_key': content_key,
+            'rendered_at': rendered_at,
+            'cache_hit': cache_hit
+        }
+    
+    def _build_story(self, case_data, posts=None, rendered_at=None):
+        """
+        Flowables of the report; the evidence appendix is produced lazily
+        rendered_at is printed on the report (a cached rendering is reissued with its original time)
+        """
         story = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#00d4ff'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
         
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#00ff88'),
-            spaceAfter=12,
-            spaceBefore=12
-        )
+        # Styles are shared by every report in the process
+        theme = self.theme or get_theme()
+        styles = theme.styles
+        title_style = theme.title
+        heading_style = theme.heading
+        
+        # Charts are drawn once per distinct data; the timeline needs a pass over the posts,
+        # so one-shot iterators of explicitly passed posts get none
+        if posts is None:
+            timeline_posts = lambda: PostCache().iter_case_posts(case_data)
+        else:
+            timeline_posts = None if iter(posts) is posts else posts
+        charts = report_charts(case_data, timeline_posts, theme, cache=self.chart_cache or get_chart_cache())
         
         # Title
         story.append(Paragraph("FORENSIC INVESTIGATION REPORT", title_style))
@@ -73,18 +144,9 @@ class ReportService:
             ['Platform:', case_data['platform']],
             ['Status:', case_data['status'].upper()],
             ['Created Date:', case_data['created_at']],
-            ['Report Generated:', datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')]
+            ['Report Rendered:', (rendered_at or datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S UTC')]
         ]
-        case_table = Table(case_info, colWidths=[2*inch, 4*inch])
-        case_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#1a1a1a')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#00d4ff'))
-        ]))
+        case_table = Table(case_info, colWidths=theme.info_col_widths, style=theme.info_table)
         story.append(case_table)
         story.append(Spacer(1, 0.3*inch))
         
@@ -95,17 +157,11 @@ class ReportService:
             ['Risk Level:', case_data.get('risk_level', 'UNKNOWN').upper()],
             ['Risk Score:', f"{case_data.get('risk_score', 0)}/100"]
         ]
-        risk_table = Table(risk_info, colWidths=[2*inch, 4*inch])
-        risk_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#1a1a1a')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.red if case_data.get('risk_score', 0) > 50 else colors.green)
-        ]))
+        risk_table = Table(risk_info, colWidths=theme.info_col_widths, style=theme.risk_table(case_data.get('risk_score', 0)))
         story.append(risk_table)
+        if CHART_RISK in charts:
+            story.append(Spacer(1, 0.2*inch))
+            story.append(charts[CHART_RISK])
         story.append(Spacer(1, 0.3*inch))
         
         # Sentiment Analysis
@@ -119,6 +175,8 @@ class ReportService:
             Neutral: {sentiment.get('neutral_percentage', 0)}%
             """
             story.append(Paragraph(sentiment_text, styles['Normal']))
+            if CHART_SENTIMENT in charts:
+                story.append(charts[CHART_SENTIMENT])
             story.append(Spacer(1, 0.2*inch))
         
         # Cyberbullying Detection
@@ -165,71 +223,109 @@ class ReportService:
                     story.append(Paragraph(f"• {factor}", styles['Normal']))
             story.append(Spacer(1, 0.2*inch))
         
+        # Posting Timeline
+        if CHART_TIMELINE in charts:
+            story.append(Paragraph("POSTING TIMELINE", heading_style))
+            story.append(charts[CHART_TIMELINE])
+            story.append(Spacer(1, 0.3*inch))
+        
         # Evidence Integrity
         story.append(Paragraph("EVIDENCE INTEGRITY", heading_style))
         evidence_hash = case_data.get('evidence_hash', 'NOT_AVAILABLE')
         story.append(Paragraph(f"SHA-256 Hash:", styles['Normal']))
-        story.append(Paragraph(f"<font name='Courier' size='8'>{evidence_hash}</font>", styles['Normal']))
+        story.append(Paragraph(f"<font name='{theme.fonts['mono']}' size='8'>{evidence_hash}</font>", styles['Normal']))
         story.append(Spacer(1, 0.3*inch))
         
-        # Footer
-        story.append(PageBreak())
-        story.append(Paragraph("LEGAL NOTICE", heading_style))
-        legal_text = """
-        This report contains confidential information collected as part of an official forensic investigation.
-        Unauthorized access, distribution, or use of this document is strictly prohibited and may result in legal action.
-        All data was collected in compliance with applicable laws and regulations.
-        Evidence integrity is verified using SHA-256 cryptographic hash.
-        """
-        story.append(Paragraph(legal_text, styles['Normal']))
-        
-        # Build PDF
-        doc.build(story)
-        
-        # Encrypt PDF
-        self._encrypt_pdf(temp_filepath, final_filepath, encryption_password)
-        
-        # Remove temporary file
-        os.remove(temp_filepath)
-        
-        # Generate file hash
-        file_hash = self._generate_file_hash(final_filepath)
-        
-        # Generate encryption password hash (for verification)
-        encryption_hash = hashlib.sha256(encryption_password.encode()).hexdigest()
+        # Evidence appendix is generated page by page, so its size does not matter
+        if posts is None:
+            posts = PostCache().iter_case_posts(case_data)
+        appendix = evidence_appendix(analysis, posts, theme)
         
-        return {
-            'file_path': final_filepath,
-            'file_hash': file_hash,
-            'encryption_hash': encryption_hash
-        }
+        # Footer
+        return LazyStory(chain(story, appendix, theme.legal_notice()))
+    
+    def _estimated_size(self, case_data):
+        """Rough size of a case's rendering, from the number of appendix rows it will print"""
+        snapshots = case_data.get('data_collected') or []
+        latest = snapshots[-1] if snapshots else {}
+        analysis = case_data.get('analysis_results') or {}
+        if 'posts_stored' in latest:
+            rows = latest['posts_stored']
+        elif 'posts' in latest:
+            rows = len(latest['posts'])
+        else:
+            # Inline posts were left out of the query; the columnar cache knows their count
+            cached = PostCache().load(case_data['_id'], case_data.get('evidence_hash'))
+            rows = len(cached) if cached is not None else 0
+        rows += (
+            len((analysis.get('cyberbullying') or {}).get('incidents') or [])
+            + len((analysis.get('fraud_detection') or {}).get('suspicious_posts') or [])
+        )
+        return REPORT_BASE_BYTES + rows * REPORT_ROW_BYTES
     
-    def _encrypt_pdf(self, input_path, output_path, password):
-        """Encrypt PDF with password"""
+    def _render(self, story):
+        """Render the story into an unencrypted PDF held in memory"""
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter)
+        doc.build(story, canvasmaker=StreamingCanvas)
+        return buffer.getvalue()
+    
+    def _encrypt_rendering(self, rendering, final_filepath, password, strength):
+        """Encrypt a cached rendering for a password and publish it atomically"""
+        reader = PdfReader(io.BytesIO(rendering))
+        writer = PdfWriter()
+        writer.append_pages_from_reader(reader)
+        writer.add_metadata(reader.metadata)
+        writer.encrypt(password, password, use_128bit=strength == 128)
+        return self._publish(final_filepath, writer.write)
+    
+    def _write_encrypted(self, story, final_filepath, password):
+        """
+        Render the story straight into an encrypted PDF and publish it atomically
+        Plaintext never reaches the disk. Returns (SHA-256, integrity record) like _publish.
+        """
+        strength = current_app.config.get('REPORT_ENCRYPTION_STRENGTH', 128)
         try:
-            pdf_reader = PdfReader(input_path)
-            pdf_writer = PdfWriter()
-            
-            # Copy all pages
-            for page in pdf_reader.pages:
-                pdf_writer.add_page(page)
-            
-            # Encrypt with password (uses AES-256 by default in PyPDF2)
-            pdf_writer.encrypt(user_password=password, owner_password=password)
-            
-            # Write encrypted PDF
-            with open(output_path, 'wb') as output_file:
-                pdf_writer.write(output_file)
-                
-        except Exception as e:
+            encryption = StandardEncryption(password, ownerPassword=password, strength=strength)
+        except ValueError as e:
+            # AES-256 needs the optional pyaes package
             raise Exception(f"PDF encryption failed: {str(e)}")
-    
-    def _generate_file_hash(self, filepath):
-        """Generate SHA-256 hash of file"""
-        sha256_hash = hashlib.sha256()
         
-        with open(filepath, 'rb') as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
+        def build(f):
+            doc = SimpleDocTemplate(f, pagesize=letter, encrypt=encryption)
+            doc.build(story, canvasmaker=StreamingCanvas)
+        return self._publish(final_filepath, build)
+    
+    def _publish(self, final_filepath, write):
+        """
+        Call write(file) on a temporary file next to the report, hashing everything written;
+        the file is renamed into place only once complete
+        Returns (SHA-256 of the file, integrity record: chunk hashes plus the size and mtime
+        it was published with, so downloads can tell whether it was touched since)
+        """
+        fd, temp_filepath = tempfile.mkstemp(
+            prefix='.tmp_', suffix='.pdf', dir=os.path.dirname(final_filepath) or '.'
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                hashing_file = _HashingFile(f)
+                write(hashing_file)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_filepath, final_filepath)
+        except BaseException:
+            try:
+                os.remove(temp_filepath)
+            except FileNotFoundError:
+                pass
+            raise
         
-        return sha256_hash.hexdigest()
+        stat = os.stat(final_filepath)
+        hasher = hashing_file.hasher
+        integrity = {
+            'chunk_size': hasher.chunk_size,
+            'chunk_hashes': hasher.finish(),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns
+        }
+        return hasher.hexdigest(), integrity
@@ -0,0 +1,142 @@
+"""
+Report Theme
+Paragraph styles, table styles, fonts and static pages of the forensic report
+Built once per process and shared by every report
+"""
+
+import copy
+import threading
+from flask import current_app, has_app_context
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Paragraph, TableStyle, PageBreak
+
+# Bump whenever the report layout or wording changes; cached reports are keyed on it
+REPORT_TEMPLATE_VERSION = 5
+
+LEGAL_NOTICE = """
+This report contains confidential information collected as part of an official forensic investigation.
+Unauthorized access, distribution, or use of this document is strictly prohibited and may result in legal action.
+All data was collected in compliance with applicable laws and regulations.
+Evidence integrity is verified using SHA-256 cryptographic hash.
+"""
+
+
+class ReportTheme:
+    """Immutable report styling; flowables handed out are copies so builds never share layout state"""
+
+    def __init__(self, font_path=None, bold_font_path=None):
+        self.fonts = self._register_fonts(font_path, bold_font_path)
+
+        self.styles = getSampleStyleSheet()
+        for name in ('Normal', 'Heading1', 'Heading2'):
+            self.styles[name].fontName = self.fonts['bold'] if name != 'Normal' else self.fonts['body']
+
+        self.title = ParagraphStyle(
+            'CustomTitle',
+            parent=self.styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#00d4ff'),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        )
+        self.heading = ParagraphStyle(
+            'CustomHeading',
+            parent=self.styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#00ff88'),
+            spaceAfter=12,
+            spaceBefore=12
+        )
+        self.subheading = ParagraphStyle(
+            'CustomSubheading',
+            parent=self.styles['Heading3'],
+            fontName=self.fonts['bold'],
+            spaceBefore=6,
+            spaceAfter=6
+        )
+        self.normal = self.styles['Normal']
+        self.cell = ParagraphStyle(
+            'AppendixCell',
+            parent=self.normal,
+            fontSize=7,
+            leading=8.5
+        )
+
+        self.info_col_widths = [2*inch, 4*inch]
+        self.info_table = self._info_table_style(colors.HexColor('#00d4ff'))
+        self.risk_table_high = self._info_table_style(colors.red)
+        self.risk_table_low = self._info_table_style(colors.green)
+
+        # Evidence appendix tables (6.5in of usable width on letter paper)
+        self.post_col_widths = [0.45*inch, 1.1*inch, 1.25*inch, 2.7*inch, 1.0*inch]
+        self.incident_col_widths = [1.1*inch, 0.7*inch, 1.2*inch, 3.5*inch]
+        self.appendix_table = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a1a1a')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('FONTNAME', (0, 0), (-1, 0), self.fonts['bold']),
+            ('FONTNAME', (0, 1), (-1, -1), self.fonts['body']),
+            ('FONTSIZE', (0, 0), (-1, -1), 7),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#00d4ff'))
+        ])
+
+        self._legal_notice = [
+            PageBreak(),
+            Paragraph("LEGAL NOTICE", self.heading),
+            Paragraph(LEGAL_NOTICE, self.normal)
+        ]
+
+    @staticmethod
+    def _register_fonts(font_path, bold_font_path):
+        """Register optional TrueType fonts (e.g. for non-Latin usernames); built-in Helvetica otherwise"""
+        fonts = {'body': 'Helvetica', 'bold': 'Helvetica-Bold', 'mono': 'Courier'}
+        for key, name, path in (('body', 'ReportBody', font_path), ('bold', 'ReportBold', bold_font_path or font_path)):
+            if not path:
+                continue
+            if name not in pdfmetrics.getRegisteredFontNames():
+                pdfmetrics.registerFont(TTFont(name, path))
+            fonts[key] = name
+        return fonts
+
+    def _info_table_style(self, grid_color):
+        return TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#1a1a1a')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), self.fonts['body']),
+            ('FONTNAME', (0, 0), (0, -1), self.fonts['bold']),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 1, grid_color)
+        ])
+
+    def risk_table(self, risk_score):
+        """Risk table style; the grid turns red above a score of 50"""
+        return self.risk_table_high if risk_score > 50 else self.risk_table_low
+
+    def legal_notice(self):
+        """Legal notice page; the paragraphs are parsed once and copied per report"""
+        return [copy.copy(flowable) for flowable in self._legal_notice]
+
+
+_theme = None
+_theme_lock = threading.Lock()
+
+
+def get_theme():
+    """Process-wide report theme, built on first use"""
+    global _theme
+    if _theme is None:
+        with _theme_lock:
+            if _theme is None:
+                config = current_app.config if has_app_context() else {}
+                _theme = ReportTheme(
+                    font_path=config.get('REPORT_FONT_PATH'),
+                    bold_font_path=config.get('REPORT_FONT_BOLD_PATH')
+                )
+    return _theme
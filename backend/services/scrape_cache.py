@@ -0,0 +1,168 @@
+"""
+Scrape Cache Service
+TTL cache of scrape results shared across cases and worker processes on a host
+Concurrent scrapes of the same target are coalesced into one upstream call
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: requests are still coalesced within a process, just not across processes
+    fcntl = None
+
+# Threads of this process coalesce on one of a fixed set of locks picked by the key's hash,
+# so memory stays bounded however many distinct targets are scraped
+LOCK_STRIPES = 256
+
+
+class ScrapeCache:
+    """On-disk TTL cache with single-flight request coalescing"""
+
+    # Striped locks for threads of this process (keys that share a stripe simply fetch one after the other)
+    _locks = tuple(threading.Lock() for _ in range(LOCK_STRIPES))
+
+    def __init__(self, cache_folder=None, ttl=None):
+        self.cache_folder = cache_folder
+        self.ttl = ttl
+
+    def _folder(self):
+        if not self.cache_folder:
+            self.cache_folder = current_app.config.get('SCRAPE_CACHE_FOLDER', os.path.join('cache', 'scrapes'))
+        os.makedirs(self.cache_folder, exist_ok=True)
+        return self.cache_folder
+
+    def _ttl(self):
+        if self.ttl is None:
+            self.ttl = current_app.config.get('SCRAPE_CACHE_TTL', 900)
+        return self.ttl
+
+    @staticmethod
+    def normalize_username(username):
+        """Usernames are case-insensitive on every supported platform"""
+        return username.strip().lstrip('@').lower()
+
+    @staticmethod
+    def make_key(platform, username, params=None):
+        """Cache key for (platform, normalized username, scrape parameters)"""
+        material = json.dumps(
+            [platform.lower(), ScrapeCache.normalize_username(username), params or {}],
+            sort_keys=True
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self._folder(), f"{key}.json")
+
+    def get(self, key):
+        """Return a live cache entry or None"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if entry.get('expires_at', 0) <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry
+
+    def set(self, key, data, platform, username, params=None):
+        """Store a scrape result for the configured TTL"""
+        now = time.time()
+        entry = {
+            'key': key,
+            'platform': platform.lower(),
+            'username': self.normalize_username(username),
+            'params': params or {},
+            'cached_at': now,
+            'expires_at': now + self._ttl(),
+            'data': data
+        }
+
+        path = self._entry_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, default=str)
+        os.replace(temp_path, path)
+        return entry
+
+    def _thread_lock(self, key):
+        # Keys are SHA-256 hex digests, so any prefix is evenly distributed
+        return self._locks[int(key[:8], 16) % LOCK_STRIPES]
+
+    def _served(self, entry, hit):
+        """Copy of a cached result annotated with how it was served"""
+        data = json.loads(json.dumps(entry['data'], default=str))
+        provenance = dict(data.get('provenance') or {})
+        provenance.update({
+            'served_from_cache': hit,
+            'cache_key': entry['key'],
+            'cached_at': datetime.utcfromtimestamp(entry['cached_at']).isoformat()
+        })
+        data['provenance'] = provenance
+        return data
+
+    def get_or_fetch(self, platform, username, fetch, params=None, cacheable=None):
+        """
+        Return a cached result or call fetch(platform, username) exactly once per key
+        cacheable(data) decides whether a fresh result may be stored
+        Returns (data, hit)
+        """
+        key = self.make_key(platform, username, params)
+
+        entry = self.get(key)
+        if entry:
+            return self._served(entry, True), True
+
+        with self._thread_lock(key):
+            lock_file = None
+            try:
+                if fcntl is not None:
+                    lock_file = open(os.path.join(self._folder(), f"{key}.lock"), 'a')
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+                # Another thread or worker may have fetched while we waited
+                entry = self.get(key)
+                if entry:
+                    return self._served(entry, True), True
+
+                data = fetch(platform, username)
+                if cacheable is not None and not cacheable(data):
+                    return data, False
+
+                entry = self.set(key, data, platform, username, params)
+                return self._served(entry, False), False
+            finally:
+                if lock_file is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    lock_file.close()
+
+    def purge_expired(self):
+        """Remove expired entries; returns the number removed"""
+        removed = 0
+        now = time.time()
+        for name in os.listdir(self._folder()):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_folder, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    expires_at = json.load(f).get('expires_at', 0)
+                if expires_at <= now:
+                    os.remove(path)
+                    removed += 1
+            except (OSError, ValueError):
+                continue
+        return removed
@@ -0,0 +1,116 @@
+"""
+Async Scrape Engine
+Collects many (platform, username) targets concurrently
+Blocking platform SDKs run in bounded per-platform thread pools
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, has_app_context
+
+
+class AsyncScrapeEngine:
+    """asyncio scraping engine with per-platform concurrency limits"""
+
+    def __init__(self, fetch=None, platform_limits=None, default_limit=None, app=None):
+        """
+        fetch is a blocking callable (platform, username) -> scraped data;
+        it defaults to ScraperService.scrape_profile and can be pointed at mock servers
+        """
+        if app is None and has_app_context():
+            app = current_app._get_current_object()
+        self.app = app
+
+        config = app.config if app is not None else {}
+        self.platform_limits = dict(config.get('SCRAPE_CONCURRENCY', {}))
+        self.platform_limits.update(platform_limits or {})
+        self.default_limit = default_limit or config.get('SCRAPE_CONCURRENCY_DEFAULT', 4)
+
+        self.fetch = fetch or self._default_fetch
+        self._local = threading.local()
+        self._executors = {}
+        self._semaphores = {}
+
+    def _default_fetch(self, platform, username):
+        # One ScraperService per worker thread so API clients are reused between targets
+        scraper = getattr(self._local, 'scraper', None)
+        if scraper is None:
+            from services.scraper_service import ScraperService
+            scraper = self._local.scraper = ScraperService()
+        return scraper.scrape_profile(platform, username)
+
+    def _limit(self, platform):
+        return self.platform_limits.get(platform, self.default_limit)
+
+    def _executor(self, platform):
+        if platform not in self._executors:
+            self._executors[platform] = ThreadPoolExecutor(
+                max_workers=self._limit(platform),
+                thread_name_prefix=f"scrape-{platform}"
+            )
+        return self._executors[platform]
+
+    def _call(self, platform, username):
+        if self.app is None:
+            return self.fetch(platform, username)
+        with self.app.app_context():
+            return self.fetch(platform, username)
+
+    async def scrape_target(self, target):
+        """Scrape one target dict ({'platform', 'username', ...extra keys})"""
+        platform = target['platform'].lower()
+        semaphore = self._semaphores.setdefault(platform, asyncio.Semaphore(self._limit(platform)))
+        result = dict(target)
+
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                loop = asyncio.get_running_loop()
+                result['data'] = await loop.run_in_executor(
+                    self._executor(platform), self._call, platform, target['username']
+                )
+                result['status'] = 'ok'
+            except Exception as e:
+                result['status'] = 'error'
+                result['error'] = str(e)
+            result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+        return result
+
+    async def stream(self, targets):
+        """Async generator yielding each target's result as soon as it finishes"""
+        self._semaphores = {}
+        tasks = [asyncio.ensure_future(self.scrape_target(target)) for target in targets]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def gather(self, targets):
+        """Scrape all targets and return results in completion order"""
+        return [result async for result in self.stream(targets)]
+
+    def iter_results(self, targets):
+        """Synchronous bridge over stream(), for WSGI streaming responses and scripts"""
+        loop = asyncio.new_event_loop()
+        results = self.stream(targets)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(results.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(results.aclose())
+            loop.close()
+            self.shutdown()
+
+    def shutdown(self):
+        """Release the worker thread pools"""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors = {}
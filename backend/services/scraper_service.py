@@ -5,8 +5,18 @@ Supports both simulated mode (default) and real API integration (optional)
 """
 
 import random
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime, timedelta, timezone
 from flask import current_app
+from services.platform_clients import CREDENTIAL_KEYS, is_client_failure, platform_clients
+from services.circuit_breaker import circuit_breakers, CircuitOpen, LatencyBudgetExceeded
+from services.rate_limiter import credential_key, rate_limiter, RateLimitTimeout
+from services.scrape_cache import ScrapeCache
+from services.reddit_post_counter import RedditPostCounter
+
+# Usernames whose Reddit submissions are being counted on a background thread
+_background_counts = set()
+_background_counts_lock = threading.Lock()
 
 class ScraperService:
     """Service for scraping social media data"""
@@ -17,181 +27,428 @@ class ScraperService:
         self.twitter_client = None
         self.instagram_loader = None
         self.reddit_client = None
+        self.page_size = 100
     
-    def _initialize_apis(self):
-        """Initialize API clients if credentials are available"""
-        try:
-            self.use_real_scraping = current_app.config.get('USE_REAL_SCRAPING', False)
-            
-            if self.use_real_scraping:
-                # Try to import and initialize Twitter API
-                if current_app.config.get('TWITTER_BEARER_TOKEN'):
-                    try:
-                        import tweepy
-                        self.twitter_client = tweepy.Client(
-                            bearer_token=current_app.config['TWITTER_BEARER_TOKEN']
-                        )
-                        print("✅ Twitter API initialized")
-                    except ImportError:
-                        print("⚠️  tweepy not installed. Run: pip install tweepy")
-                    except Exception as e:
-                        print(f"⚠️  Twitter API error: {e}")
-                
-                # Try to import and initialize Instagram API
-                if current_app.config.get('INSTAGRAM_ACCESS_TOKEN'):
-                    try:
-                        import instaloader
-                        self.instagram_loader = instaloader.Instaloader()
-                        print("✅ Instagram API initialized")
-                    except ImportError:
-                        print("⚠️  instaloader not installed. Run: pip install instaloader")
-                    except Exception as e:
-                        print(f"⚠️  Instagram API error: {e}")
-                
-                # Try to import and initialize Reddit API
-                if current_app.config.get('REDDIT_CLIENT_ID'):
-                    try:
-                        import praw
-                        self.reddit_client = praw.Reddit(
-                            client_id=current_app.config['REDDIT_CLIENT_ID'],
-                            client_secret=current_app.config['REDDIT_CLIENT_SECRET'],
-                            user_agent=current_app.config.get('REDDIT_USER_AGENT', 'ForensicTool/1.0')
-                        )
-                        print("✅ Reddit API initialized")
-                    except ImportError:
-                        print("⚠️  praw not installed. Run: pip install praw")
-                    except Exception as e:
-                        print(f"⚠️  Reddit API error: {e}")
-        except Exception as e:
-            print(f"⚠️  API initialization error: {e}")
+    def _initialize_apis(self, platform):
+        """Attach the shared API client for a platform from the process-wide registry"""
+        self.use_real_scraping = platform_clients.enabled
+        if not self.use_real_scraping:
+            return
+        if platform == 'twitter':
+            self.twitter_client = platform_clients.get('twitter')
+        elif platform == 'instagram':
+            self.instagram_loader = platform_clients.get('instagram')
+        elif platform == 'reddit':
+            self.reddit_client = platform_clients.get('reddit')
     
-    def scrape_profile(self, platform, username):
+    def scrape_profile(self, platform, username, use_cache=True):
         """
         Scrape user profile data
-        Uses real APIs if available, otherwise falls back to simulated data
+        Uses real APIs if available, otherwise falls back to simulated data.
+        Results are shared through the scrape cache unless use_cache is False.
         """
         
         if platform.lower() not in self.supported_platforms:
             raise ValueError(f"Platform {platform} not supported")
         
-        # Initialize APIs on first use
-        if self.use_real_scraping is False:
-            self._initialize_apis()
+        if not use_cache or not current_app.config.get('SCRAPE_CACHE_ENABLED', True):
+            return self._scrape_live(platform, username)
+        
+        data, _ = ScrapeCache().get_or_fetch(
+            platform,
+            username,
+            self._scrape_live,
+            params={'mode': 'profile', 'max_posts': 20},
+            # Never pin a fallback result in the cache
+            cacheable=lambda result: not result['provenance'].get('fallback_reason')
+        )
+        return data
+    
+    def _scrape_live(self, platform, username):
+        """Scrape from the platform (or simulate), recording where the data came from"""
+        
+        # Clients are built once per process; this only picks up the shared one
+        self._initialize_apis(platform.lower())
+        
+        provenance = {'fetch_source': 'simulated'}
         
         # Try real scraping first
-        if self.use_real_scraping:
+        if self._has_client(platform.lower()):
+            real_scrapers = {
+                'twitter': self._scrape_twitter_real,
+                'instagram': self._scrape_instagram_real,
+                'reddit': self._scrape_reddit_real
+            }
             try:
-                if platform.lower() == 'twitter' and self.twitter_client:
-                    return self._scrape_twitter_real(username)
-                elif platform.lower() == 'instagram' and self.instagram_loader:
-                    return self._scrape_instagram_real(username)
-                elif platform.lower() == 'reddit' and self.reddit_client:
-                    return self._scrape_reddit_real(username)
+                # Fails fast while the platform is down and gives up after the latency budget
+                data = circuit_breakers.call(platform.lower(), real_scrapers[platform.lower()], username)
+                data['provenance'] = {'fetch_source': f"{platform.lower()}_api"}
+                return data
+            except RateLimitTimeout:
+                # Never substitute simulated data just because the platform is throttling us
+                raise
             except Exception as e:
-                print(f"⚠️  Real scraping failed for {platform}: {e}, falling back to simulated mode")
+                provenance = self._fallback_provenance(platform.lower(), e)
         
         # Fall back to simulated data
-        return self._scrape_simulated(platform, username)
-        # Fall back to simulated data
-        return self._scrape_simulated(platform, username)
+        data = self._scrape_simulated(platform, username)
+        data['provenance'] = provenance
+        return data
     
-    def _scrape_twitter_real(self, username):
-        """Scrape real Twitter data using API"""
+    def _has_client(self, platform):
+        """Whether real scraping is enabled and a client is available for the platform"""
+        if not self.use_real_scraping:
+            return False
+        clients = {
+            'twitter': self.twitter_client,
+            'instagram': self.instagram_loader,
+            'reddit': self.reddit_client
+        }
+        return clients.get(platform) is not None
+    
+    def _fallback_provenance(self, platform, error):
+        """Log a failed real scrape and record why simulated data is served instead"""
+        if isinstance(error, CircuitOpen):
+            decision = 'circuit_open'
+        elif isinstance(error, LatencyBudgetExceeded):
+            decision = 'latency_budget_exceeded'
+        else:
+            decision = 'api_error'
+            # Only a broken client is rebuilt, not one that was asked for a missing or private account
+            if is_client_failure(error):
+                platform_clients.mark_unhealthy(platform, error)
+        
+        print(f"⚠️  Real scraping failed for {platform}: {error}, falling back to simulated mode")
+        return {
+            'fetch_source': 'simulated',
+            'fallback_reason': str(error),
+            'fallback_decision': decision,
+            'circuit_state': circuit_breakers.breaker(platform).current_state()
+        }
+    
+    def scrape_history(self, platform, username, max_posts=None, since=None, until=None, cursor=None):
+        """
+        Open a paginated scrape of a target's full post history
+        Returns (snapshot header, iterator of (posts page, next cursor)); a None cursor means done.
+        Pass a saved cursor to resume an interrupted scrape; a resume never falls back to simulated
+        pages, since they would be appended to (and hashed with) the posts already stored.
+        """
+        platform = platform.lower()
+        if platform not in self.supported_platforms:
+            raise ValueError(f"Platform {platform} not supported")
+        
+        self._initialize_apis(platform)
+        self.page_size = current_app.config.get('SCRAPE_PAGE_SIZE', self.page_size)
+        
+        provenance = {'fetch_source': 'simulated'}
+        if self._has_client(platform):
+            try:
+                # Only the profile lookup runs under the latency budget; pages are read later
+                header, pages = circuit_breakers.call(
+                    platform, self._open_history_real, platform, username, max_posts, since, until, cursor
+                )
+                header['provenance'] = {'fetch_source': f"{platform}_api"}
+                return header, pages
+            except RateLimitTimeout:
+                raise
+            except Exception as e:
+                if cursor is not None:
+                    raise
+                provenance = self._fallback_provenance(platform, e)
+        elif cursor is not None and not str(cursor).isdigit():
+            raise RuntimeError(f"Cannot resume a {platform} API scrape while real scraping is unavailable")
+        
+        header = self._simulated_header(platform, username)
+        header['provenance'] = provenance
+        return header, self._iter_simulated_pages(platform, username, max_posts, since, until, cursor)
+    
+    def _open_history_real(self, platform, username, max_posts, since, until, cursor):
+        """Fetch the profile header and open the platform's page iterator"""
+        if platform == 'twitter':
+            header, user_data = self._twitter_header(username)
+            return header, self._iter_twitter_pages(user_data, max_posts, since, until, cursor)
+        if platform == 'instagram':
+            header, profile = self._instagram_header(username)
+            return header, self._iter_instagram_pages(profile, max_posts, since, until, cursor)
+        header, redditor = self._reddit_header(username)
+        counter = None if cursor or since or until else self._reddit_counter(username, header)
+        return header, self._iter_reddit_pages(redditor, max_posts, since, until, cursor, counter=counter)
+    
+    def scrape_delta(self, platform, username, high_water_mark, max_posts=None):
+        """
+        Scrape only posts newer than a previous snapshot
+        high_water_mark is {'post_id', 'timestamp'} of the newest post already collected
+        """
+        platform = platform.lower()
+        if platform not in self.supported_platforms:
+            raise ValueError(f"Platform {platform} not supported")
+        
+        self._initialize_apis(platform)
+        self.page_size = current_app.config.get('SCRAPE_PAGE_SIZE', self.page_size)
+        
+        stop_at = dict(high_water_mark or {})
+        if stop_at.get('timestamp'):
+            # Compare as naive UTC, the same way the page iterators see post dates
+            timestamp = datetime.fromisoformat(stop_at['timestamp'])
+            if timestamp.tzinfo is not None:
+                timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+            stop_at['timestamp'] = timestamp
+        
+        provenance = {'fetch_source': 'simulated'}
+        if self._has_client(platform):
+            try:
+                # A delta can span many pages, so it only gets the breaker, not the latency budget
+                data = circuit_breakers.call(
+                    platform, self._scrape_delta_real, platform, username, max_posts, stop_at, budget=0
+                )
+                data['provenance'] = {'fetch_source': f"{platform}_api"}
+                return data
+            except RateLimitTimeout:
+                raise
+            except Exception as e:
+                provenance = self._fallback_provenance(platform, e)
+        
+        data = self._simulated_header(platform, username)
+        data['posts'] = self._generate_delta_posts(username, platform, stop_at.get('timestamp'))
+        data['provenance'] = provenance
+        return data
+    
+    def _scrape_delta_real(self, platform, username, max_posts, stop_at):
+        """Profile header plus the posts newer than stop_at"""
+        if platform == 'twitter':
+            data, user_data = self._twitter_header(username)
+            data['posts'] = self._collect_posts(self._iter_twitter_pages(user_data, max_posts, stop_at=stop_at))
+        elif platform == 'instagram':
+            data, profile = self._instagram_header(username)
+            data['posts'] = self._collect_posts(self._iter_instagram_pages(profile, max_posts, stop_at=stop_at))
+        else:
+            data, redditor = self._reddit_header(username)
+            counter = self._reddit_counter(username, data)
+            data['posts'] = self._collect_posts(self._iter_reddit_pages(redditor, max_posts, stop_at=stop_at, counter=counter))
+        return data
+    
+    def _credential_key(self, platform):
+        """Short fingerprint of the credential used for a platform (rate limits are per credential)"""
+        return credential_key(current_app.config.get(CREDENTIAL_KEYS.get(platform, '')))
+    
+    def _limited(self, platform, fn, *args, **kwargs):
+        """Run a platform SDK call through the shared rate limiter"""
+        credential = self._credential_key(platform)
         try:
-            # Get user by username
-            user = self.twitter_client.get_user(username=username, user_fields=['created_at', 'description', 'location', 'public_metrics', 'verified'])
-            user_data = user.data
-            
-            # Get user tweets
-            tweets = self.twitter_client.get_users_tweets(
+            return rate_limiter.call(platform, fn, *args, credential=credential, **kwargs)
+        finally:
+            # PRAW tracks Reddit's rate-limit headers for us
+            if platform == 'reddit' and self.reddit_client is not None:
+                limits = getattr(self.reddit_client.auth, 'limits', None) or {}
+                if limits.get('remaining') is not None and limits.get('reset_timestamp'):
+                    rate_limiter.observe_headers(platform, credential, {
+                        'x-ratelimit-remaining': limits['remaining'],
+                        'x-ratelimit-reset': limits['reset_timestamp']
+                    })
+    
+    def _twitter_post(self, tweet):
+        """Map a tweepy Tweet to the post dict format"""
+        return {
+            'post_id': tweet.id,
+            'content': tweet.text,
+            'timestamp': tweet.created_at.isoformat() if tweet.created_at else datetime.utcnow().isoformat(),
+            'likes': tweet.public_metrics['like_count'],
+            'comments': tweet.public_metrics['reply_count'],
+            'shares': tweet.public_metrics['retweet_count'],
+            'hashtags': [tag['tag'] for tag in (tweet.entities or {}).get('hashtags', [])] if hasattr(tweet, 'entities') else []
+        }
+    
+    def _twitter_header(self, username):
+        """Fetch a Twitter profile; returns (snapshot header, user object)"""
+        user = self._limited('twitter', self.twitter_client.get_user, username=username, user_fields=['created_at', 'description', 'location', 'public_metrics', 'verified'])
+        user_data = user.data
+        
+        header = {
+            'username': username,
+            'platform': 'twitter',
+            'scraped_at': datetime.utcnow().isoformat(),
+            'profile': {
+                'display_name': user_data.name,
+                'bio': user_data.description or '',
+                'location': user_data.location or 'Unknown',
+                'verified': user_data.verified or False,
+                'joined_date': user_data.created_at.isoformat() if user_data.created_at else None
+            },
+            'metadata': {
+                'total_posts': user_data.public_metrics['tweet_count'],
+                'followers': user_data.public_metrics['followers_count'],
+                'following': user_data.public_metrics['following_count'],
+                'account_age_days': (datetime.utcnow() - user_data.created_at.replace(tzinfo=None)).days if user_data.created_at else 0
+            }
+        }
+        return header, user_data
+    
+    def _iter_twitter_pages(self, user_data, max_posts=None, since=None, until=None, cursor=None, stop_at=None):
+        """
+        Follow Twitter pagination tokens; yields (posts, next_cursor)
+        stop_at (a high-water mark) maps onto the API's since_id filter
+        """
+        collected = 0
+        pagination_token = cursor
+        
+        while max_posts is None or collected < max_posts:
+            page_size = self.page_size if max_posts is None else min(self.page_size, max_posts - collected)
+            tweets = self._limited(
+                'twitter',
+                self.twitter_client.get_users_tweets,
                 id=user_data.id,
-                max_results=20,
+                # The API only accepts page sizes between 5 and 100
+                max_results=max(5, min(100, page_size)),
+                pagination_token=pagination_token,
+                start_time=since,
+                end_time=until,
+                since_id=stop_at['post_id'] if stop_at and stop_at.get('post_id') else None,
                 tweet_fields=['created_at', 'public_metrics', 'entities']
             )
             
-            posts = []
-            if tweets.data:
-                for tweet in tweets.data:
-                    posts.append({
-                        'post_id': tweet.id,
-                        'content': tweet.text,
-                        'timestamp': tweet.created_at.isoformat() if tweet.created_at else datetime.utcnow().isoformat(),
-                        'likes': tweet.public_metrics['like_count'],
-                        'comments': tweet.public_metrics['reply_count'],
-                        'shares': tweet.public_metrics['retweet_count'],
-                        'hashtags': [tag['tag'] for tag in tweet.entities.get('hashtags', [])] if hasattr(tweet, 'entities') else []
-                    })
+            posts = [self._twitter_post(tweet) for tweet in (tweets.data or [])][:page_size]
+            pagination_token = (tweets.meta or {}).get('next_token')
+            collected += len(posts)
             
-            return {
-                'username': username,
-                'platform': 'twitter',
-                'scraped_at': datetime.utcnow().isoformat(),
-                'profile': {
-                    'display_name': user_data.name,
-                    'bio': user_data.description or '',
-                    'location': user_data.location or 'Unknown',
-                    'verified': user_data.verified or False,
-                    'joined_date': user_data.created_at.isoformat() if user_data.created_at else None
-                },
-                'posts': posts,
-                'metadata': {
-                    'total_posts': user_data.public_metrics['tweet_count'],
-                    'followers': user_data.public_metrics['followers_count'],
-                    'following': user_data.public_metrics['following_count'],
-                    'account_age_days': (datetime.utcnow() - user_data.created_at).days if user_data.created_at else 0
-                }
+            yield posts, pagination_token
+            if not pagination_token or not posts:
+                break
+    
+    def _instagram_header(self, username):
+        """Fetch an Instagram profile; returns (snapshot header, profile object)"""
+        import instaloader
+        profile = self._limited('instagram', instaloader.Profile.from_username, self.instagram_loader.context, username)
+        
+        header = {
+            'username': username,
+            'platform': 'instagram',
+            'scraped_at': datetime.utcnow().isoformat(),
+            'profile': {
+                'display_name': profile.full_name or username,
+                'bio': profile.biography or '',
+                'location': 'Unknown',
+                'verified': profile.is_verified,
+                'joined_date': None
+            },
+            'metadata': {
+                'total_posts': profile.mediacount,
+                'followers': profile.followers,
+                'following': profile.followees,
+                'account_age_days': 0
             }
-        except Exception as e:
-            raise Exception(f"Twitter scraping failed: {str(e)}")
+        }
+        return header, profile
     
-    def _scrape_instagram_real(self, username):
-        """Scrape real Instagram data using Instaloader"""
-        try:
-            profile = instaloader.Profile.from_username(self.instagram_loader.context, username)
+    def _iter_instagram_pages(self, profile, max_posts=None, since=None, until=None, cursor=None, stop_at=None):
+        """
+        Walk an Instagram profile's posts; yields (posts, next_cursor)
+        The cursor is Instaloader's frozen NodeIterator state
+        """
+        from instaloader import FrozenNodeIterator
+        
+        post_iterator = profile.get_posts()
+        if cursor:
+            post_iterator.thaw(FrozenNodeIterator(**cursor))
+        
+        collected = 0
+        posts = []
+        exhausted = False
+        while max_posts is None or collected < max_posts:
+            # Instaloader requests a new page every 12 posts; meter those requests
+            if len(posts) % 12 == 0:
+                post = self._limited('instagram', next, post_iterator, None)
+            else:
+                post = next(post_iterator, None)
             
-            posts = []
-            for post in profile.get_posts():
-                if len(posts) >= 20:
-                    break
-                posts.append({
-                    'post_id': post.shortcode,
-                    'content': post.caption or '',
-                    'timestamp': post.date.isoformat(),
-                    'likes': post.likes,
-                    'comments': post.comments,
-                    'shares': 0,
-                    'hashtags': post.caption_hashtags if post.caption else []
-                })
+            if post is None:
+                exhausted = True
+                break
+            # Posts arrive newest first
+            if until and post.date_utc > until:
+                continue
+            if since and post.date_utc < since:
+                exhausted = True
+                break
+            if self._reached_high_water_mark(stop_at, post.shortcode, post.date_utc):
+                exhausted = True
+                break
+            
+            posts.append({
+                'post_id': post.shortcode,
+                'content': post.caption or '',
+                'timestamp': post.date.isoformat(),
+                'likes': post.likes,
+                'comments': post.comments,
+                'shares': 0,
+                'hashtags': post.caption_hashtags if post.caption else []
+            })
+            collected += 1
             
-            return {
-                'username': username,
-                'platform': 'instagram',
-                'scraped_at': datetime.utcnow().isoformat(),
-                'profile': {
-                    'display_name': profile.full_name or username,
-                    'bio': profile.biography or '',
-                    'location': 'Unknown',
-                    'verified': profile.is_verified,
-                    'joined_date': None
-                },
-                'posts': posts,
-                'metadata': {
-                    'total_posts': profile.mediacount,
-                    'followers': profile.followers,
-                    'following': profile.followees,
-                    'account_age_days': 0
-                }
+            if len(posts) >= self.page_size:
+                yield posts, post_iterator.freeze()._asdict()
+                posts = []
+        
+        yield posts, None if exhausted else post_iterator.freeze()._asdict()
+    
+    def _reddit_header(self, username):
+        """Fetch a Reddit profile; returns (snapshot header, redditor object)"""
+        redditor = self.reddit_client.redditor(username)
+        # PRAW objects are lazy; force the profile fetch under the rate limiter
+        self._limited('reddit', getattr, redditor, 'created_utc')
+        
+        header = {
+            'username': username,
+            'platform': 'reddit',
+            'scraped_at': datetime.utcnow().isoformat(),
+            'profile': {
+                'display_name': redditor.name,
+                'bio': '',
+                'location': 'Unknown',
+                'verified': redditor.is_gold or redditor.is_mod,
+                'joined_date': datetime.fromtimestamp(redditor.created_utc).isoformat()
+            },
+            'metadata': {
+                # Filled in by RedditPostCounter from the submission stream
+                'total_posts': None,
+                'followers': 0,
+                'following': 0,
+                'account_age_days': (datetime.utcnow() - datetime.fromtimestamp(redditor.created_utc)).days
             }
-        except Exception as e:
-            raise Exception(f"Instagram scraping failed: {str(e)}")
+        }
+        return header, redditor
     
-    def _scrape_reddit_real(self, username):
-        """Scrape real Reddit data using PRAW"""
-        try:
-            redditor = self.reddit_client.redditor(username)
+    def _reddit_counter(self, username, header):
+        """Submission counter that updates the snapshot metadata as the stream is read"""
+        cap = current_app.config.get('REDDIT_COUNT_CAP', 1000)
+        return RedditPostCounter(username, header['metadata'], cap)
+    
+    def _iter_reddit_pages(self, redditor, max_posts=None, since=None, until=None, cursor=None, stop_at=None, counter=None):
+        """
+        Follow Reddit 'after' fullnames; yields (posts, next_cursor)
+        A counter started at the newest submission sees every id the stream reads
+        """
+        collected = 0
+        after = cursor
+        
+        while max_posts is None or collected < max_posts:
+            page_size = self.page_size if max_posts is None else min(self.page_size, max_posts - collected)
+            params = {'after': after} if after else {}
+            submissions = self._limited('reddit', list, redditor.submissions.new(limit=min(100, page_size), params=params))
             
             posts = []
-            for submission in redditor.submissions.new(limit=20):
+            reached_since = False
+            for submission in submissions:
+                if counter:
+                    counter.observe(submission.id)
+                created = datetime.utcfromtimestamp(submission.created_utc)
+                if until and created > until:
+                    continue
+                if since and created < since:
+                    reached_since = True
+                    break
+                if self._reached_high_water_mark(stop_at, submission.id, created):
+                    reached_since = True
+                    break
                 posts.append({
                     'post_id': submission.id,
                     'content': submission.title + '\\n' + (submission.selftext or ''),
@@ -204,36 +461,117 @@ class ScraperService:
                     'awards': submission.total_awards_received
                 })
             
-            return {
-                'username': username,
-                'platform': 'reddit',
-                'scraped_at': datetime.utcnow().isoformat(),
-                'profile': {
-                    'display_name': redditor.name,
-                    'bio': '',
-                    'location': 'Unknown',
-                    'verified': redditor.is_gold or redditor.is_mod,
-                    'joined_date': datetime.fromtimestamp(redditor.created_utc).isoformat()
-                },
-                'posts': posts,
-                'metadata': {
-                    'total_posts': len(list(redditor.submissions.new(limit=None))),
-                    'followers': 0,
-                    'following': 0,
-                    'account_age_days': (datetime.utcnow() - datetime.fromtimestamp(redditor.created_utc)).days
-                }
-            }
+            listing_ended = len(submissions) < min(100, page_size)
+            if counter and listing_ended and not reached_since:
+                counter.exhausted()
+            done = reached_since or listing_ended
+            after = None if done else submissions[-1].fullname
+            collected += len(posts)
+            
+            yield posts, after
+            if after is None:
+                break
+    
+    def _reached_high_water_mark(self, stop_at, post_id, created_utc):
+        """True once a newest-first listing reaches posts that were already collected"""
+        if not stop_at:
+            return False
+        if stop_at.get('post_id') is not None and str(stop_at['post_id']) == str(post_id):
+            return True
+        return stop_at.get('timestamp') is not None and created_utc < stop_at['timestamp']
+    
+    def _collect_posts(self, pages):
+        """Flatten the pages of a page iterator into one list"""
+        posts = []
+        for page, _ in pages:
+            posts.extend(page)
+        return posts
+    
+    def _scrape_twitter_real(self, username):
+        """Scrape real Twitter data using API"""
+        try:
+            header, user_data = self._twitter_header(username)
+            header['posts'] = self._collect_posts(self._iter_twitter_pages(user_data, max_posts=20))
+            return header
+        except RateLimitTimeout:
+            raise
+        except Exception as e:
+            raise Exception(f"Twitter scraping failed: {str(e)}")
+    
+    def _scrape_instagram_real(self, username):
+        """Scrape real Instagram data using Instaloader"""
+        try:
+            header, profile = self._instagram_header(username)
+            header['posts'] = self._collect_posts(self._iter_instagram_pages(profile, max_posts=20))
+            return header
+        except RateLimitTimeout:
+            raise
+        except Exception as e:
+            raise Exception(f"Instagram scraping failed: {str(e)}")
+    
+    def _scrape_reddit_real(self, username):
+        """
+        Scrape real Reddit data using PRAW
+        Only the latest 20 posts are read under the latency budget; until the submission count is
+        settled it is reported as a lower bound ("≥N") and finished on a background thread
+        """
+        try:
+            header, redditor = self._reddit_header(username)
+            counter = self._reddit_counter(username, header)
+            
+            posts = []
+            cursor = None
+            for page, cursor in self._iter_reddit_pages(redditor, max_posts=20, counter=counter):
+                posts.extend(page)
+            
+            if not counter.complete:
+                counter.partial()
+                if cursor is not None:
+                    self._finish_reddit_count(redditor, counter, cursor)
+            
+            header['posts'] = posts
+            return header
+        except RateLimitTimeout:
+            raise
         except Exception as e:
             raise Exception(f"Reddit scraping failed: {str(e)}")
     
-    def _scrape_simulated(self, platform, username):
-        """Generate simulated profile data (original behavior)"""
-        profile_data = {
+    def _finish_reddit_count(self, redditor, counter, cursor):
+        """
+        Keep counting the submission stream from cursor outside the latency budget
+        The result is cached in PostCount, so the next scrape of the user reports it
+        """
+        key = counter.username.lower()
+        with _background_counts_lock:
+            if key in _background_counts:
+                return
+            _background_counts.add(key)
+        
+        app = current_app._get_current_object()
+        # The snapshot header has already been returned; its metadata keeps the partial count
+        counter.metadata = {}
+        
+        def run():
+            try:
+                with app.app_context():
+                    for _ in self._iter_reddit_pages(redditor, cursor=cursor, counter=counter):
+                        if counter.complete:
+                            break
+            except Exception as e:
+                print(f"⚠️  Background Reddit post count failed for {counter.username}: {e}")
+            finally:
+                with _background_counts_lock:
+                    _background_counts.discard(key)
+        
+        threading.Thread(target=run, name=f"reddit-count-{key}", daemon=True).start()
+    
+    def _simulated_header(self, platform, username):
+        """Generate a simulated snapshot header (profile and metadata, no posts)"""
+        return {
             'username': username,
             'platform': platform,
             'scraped_at': datetime.utcnow().isoformat(),
             'profile': self._generate_profile_data(username, platform),
-            'posts': self._generate_posts_data(username, platform),
             'metadata': {
                 'total_posts': random.randint(10, 500),
                 'followers': random.randint(100, 10000),
@@ -241,6 +579,46 @@ class ScraperService:
                 'account_age_days': random.randint(30, 3650)
             }
         }
+    
+    def _iter_simulated_pages(self, platform, username, max_posts=None, since=None, until=None, cursor=None):
+        """Page through a simulated post history; the cursor is the post offset"""
+        offset = int(cursor) if str(cursor or '').isdigit() else 0
+        end = offset + (max_posts if max_posts is not None else random.randint(5, 15))
+        
+        while offset < end:
+            count = min(self.page_size, end - offset)
+            posts = []
+            while len(posts) < count:
+                posts.extend(self._generate_posts_data(username, platform))
+            posts = posts[:count]
+            
+            if since or until:
+                posts = [
+                    post for post in posts
+                    if (not since or datetime.fromisoformat(post['timestamp']) >= since)
+                    and (not until or datetime.fromisoformat(post['timestamp']) <= until)
+                ]
+            
+            offset += count
+            yield posts, str(offset) if offset < end else None
+    
+    def _generate_delta_posts(self, username, platform, newer_than=None):
+        """Generate a few simulated posts dated after the previous snapshot"""
+        posts = self._generate_posts_data(username, platform)[:random.randint(0, 5)]
+        start = newer_than or (datetime.utcnow() - timedelta(days=1))
+        span = max(1, int((datetime.utcnow() - start).total_seconds()))
+        
+        for post in posts:
+            post['post_id'] = f"{post['post_id']}_{random.randint(1000, 9999)}"
+            post['timestamp'] = (start + timedelta(seconds=random.randint(1, span))).isoformat()
+        
+        posts.sort(key=lambda post: post['timestamp'], reverse=True)
+        return posts
+    
+    def _scrape_simulated(self, platform, username):
+        """Generate simulated profile data (original behavior)"""
+        profile_data = self._simulated_header(platform, username)
+        profile_data['posts'] = self._generate_posts_data(username, platform)
         
         return profile_data
     
@@ -255,9 +633,12 @@ class ScraperService:
             'joined_date': (datetime.utcnow() - timedelta(days=random.randint(30, 1000))).isoformat()
         }
     
-    def _generate_posts_data(self, username, platform):
-        """Generate simulated posts data"""
-        posts = []
+    def _generate_posts_data(self, username, platform, batch=None):
+        """
+        Generate simulated posts data
+        Appends into a PostBatch when one is given, otherwise returns a list of dicts
+        """
+        posts = batch if batch is not None else []
         
         # Sample post templates for different risk levels
         safe_posts = [
@@ -0,0 +1,77 @@
+"""
+Snapshot Service
+Persists scrape snapshots together with their evidence hash and post cache
+"""
+
+from models.case import Case
+from models.case_post import CasePost
+from services.post_cache import PostCache
+from utils.hash_utils import generate_evidence_hash, generate_stream_evidence_hash
+from utils.post_batch import PostBatch, timestamp_to_micros
+
+class SnapshotService:
+    """Service for storing scraped snapshots on a case"""
+
+    @staticmethod
+    def high_water_mark(posts, current=None):
+        """Newest post ({'post_id', 'timestamp'}) among posts and an existing mark"""
+        newest = current
+        newest_micros = timestamp_to_micros(current['timestamp'])[0] if current and current.get('timestamp') else None
+
+        for post in posts:
+            if not post.get('timestamp'):
+                continue
+            micros = timestamp_to_micros(post['timestamp'])[0]
+            if newest_micros is None or micros > newest_micros:
+                newest = {'post_id': post.get('post_id'), 'timestamp': post['timestamp']}
+                newest_micros = micros
+
+        return newest
+
+    @staticmethod
+    def store(case_id, scraped_data):
+        """Store a snapshot whose posts are inline; returns the evidence hash"""
+        if scraped_data.get('posts'):
+            scraped_data['high_water_mark'] = SnapshotService.high_water_mark(scraped_data['posts'])
+
+        Case.add_collected_data(case_id, scraped_data)
+
+        evidence_hash = generate_evidence_hash(scraped_data)
+        Case.update_evidence_hash(case_id, evidence_hash)
+
+        # Keep a columnar copy of the posts for later analytics
+        try:
+            PostCache().write(case_id, evidence_hash, scraped_data['posts'])
+        except OSError as e:
+            print(f"⚠️  Post cache write failed for case {case_id}: {e}")
+
+        return evidence_hash
+
+    @staticmethod
+    def store_snapshot(case_id, snapshot):
+        """Store either kind of snapshot; paged ones carry a snapshot_id"""
+        if snapshot.get('snapshot_id'):
+            return SnapshotService.store_paged(case_id, snapshot)
+        return SnapshotService.store(case_id, snapshot)
+
+    @staticmethod
+    def store_paged(case_id, snapshot):
+        """
+        Store a snapshot whose posts are already in the case_posts collection
+        The evidence hash streams the stored posts back from a cursor
+        """
+        snapshot_id = snapshot['snapshot_id']
+        evidence_hash = generate_stream_evidence_hash(
+            snapshot, CasePost.iter_snapshot_posts(case_id, snapshot_id)
+        )
+
+        Case.add_collected_data(case_id, snapshot)
+        Case.update_evidence_hash(case_id, evidence_hash)
+
+        try:
+            batch = PostBatch.from_dicts(CasePost.iter_snapshot_posts(case_id, snapshot_id))
+            PostCache().write(case_id, evidence_hash, batch)
+        except OSError as e:
+            print(f"⚠️  Post cache write failed for case {case_id}: {e}")
+
+        return evidence_hash
@@ -0,0 +1,322 @@
+"""
+Synthetic Data Service
+Seeded, vectorized generator of large synthetic post corpora for load tests and benchmarks
+Posts have the same shape as simulated scrapes; NumPy is required (pip install numpy)
+"""
+
+import json
+import os
+from array import array
+from datetime import datetime
+from services.post_cache import PostCache
+from utils.post_batch import PostBatch, FLAG_NO_SUBREDDIT, FLAG_NO_AWARDS, encode_hashtags
+
+# Content templates per category, matching the simulated scraper
+TEMPLATES = {
+    'safe': [
+        "Just had an amazing day!",
+        "Check out this new product",
+        "Happy to share my thoughts",
+        "Great experience today",
+        "Sharing my experience",
+        "Working on new projects",
+        "TIL something interesting today",
+        "AMA: I work in tech"
+    ],
+    'fraud': [
+        "Click here for free money!",
+        "I can double your investment in 24 hours",
+        "You won a prize! Click this link",
+        "Get rich quick with this method",
+        "Follow for follow!",
+        "Upvote this for free karma!"
+    ],
+    'cyberbullying': [
+        "You're so stupid",
+        "Nobody likes you",
+        "You should just quit",
+        "Everyone is laughing at you"
+    ]
+}
+
+# Appended to templates so posts are not all exact duplicates of each other
+TOPICS = [
+    'today', 'tonight', 'again', 'honestly', 'lol', 'seriously', 'finally', 'right now',
+    'this week', 'at work', 'at school', 'online', 'on stream', 'in the group chat',
+    'for real', 'no joke', 'btw', 'fyi', 'guys', 'everyone'
+]
+
+SUBREDDITS = ['technology', 'askreddit', 'pics', 'news', 'science']
+
+DEFAULT_MIX = {'safe': 0.7, 'fraud': 0.2, 'cyberbullying': 0.1}
+
+TIMESTAMP_DISTRIBUTIONS = ('uniform', 'recent', 'bursty')
+
+# Fixed reference time so a seed always produces the same corpus
+DEFAULT_END = datetime(2024, 1, 1)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("numpy is required for synthetic data generation. Run: pip install numpy")
+    return numpy
+
+
+class SyntheticDataGenerator:
+    """
+    Deterministic corpus generator
+    The output depends only on the constructor arguments and the chunk size
+    """
+
+    def __init__(self, seed=0, platform='twitter', mix=None, duplicate_rate=0.0,
+                 timestamp_distribution='uniform', span_days=90, end=None, accounts=1000):
+        np = _numpy()
+        if timestamp_distribution not in TIMESTAMP_DISTRIBUTIONS:
+            raise ValueError(f"timestamp_distribution must be one of {', '.join(TIMESTAMP_DISTRIBUTIONS)}")
+        if not 0 <= duplicate_rate < 1:
+            raise ValueError("duplicate_rate must be in [0, 1)")
+
+        mix = mix or DEFAULT_MIX
+        unknown = set(mix) - set(TEMPLATES)
+        if unknown:
+            raise ValueError(f"Unknown content categories: {', '.join(sorted(unknown))}")
+
+        self.np = np
+        self.seed = seed
+        self.platform = platform.lower()
+        self.categories = list(TEMPLATES)
+        weights = np.array([float(mix.get(name, 0)) for name in self.categories])
+        if weights.sum() <= 0:
+            raise ValueError("mix needs at least one positive weight")
+        self.mix = weights / weights.sum()
+        self.duplicate_rate = duplicate_rate
+        self.timestamp_distribution = timestamp_distribution
+        self.span_us = int(span_days * 86400 * 1_000_000)
+        self.end_us = int(((end or DEFAULT_END) - datetime(1970, 1, 1)).total_seconds() * 1_000_000)
+        self.num_accounts = accounts
+
+        self._build_pools()
+        self._build_accounts()
+
+    def _build_pools(self):
+        """Every template x topic combination, pre-encoded for fast row assembly"""
+        np = self.np
+        contents, hashtags, starts, sizes = [], [], [], []
+        for name in self.categories:
+            starts.append(len(contents))
+            for template in TEMPLATES[name]:
+                for topic in TOPICS:
+                    content = f"{template} {topic}"
+                    contents.append(content)
+                    hashtags.append([f"#{word}" for word in content.split()[:2]])
+            sizes.append(len(contents) - starts[-1])
+
+        self.pool_content = np.array(contents, dtype=object)
+        self.pool_hashtags = np.array([None] * len(hashtags), dtype=object)
+        self.pool_hashtags[:] = hashtags
+        self.pool_content_json = np.array([json.dumps(c) for c in contents], dtype=object)
+        self.pool_hashtags_json = np.array([json.dumps(h) for h in hashtags], dtype=object)
+        self.pool_start = np.array(starts, dtype=np.int64)
+        self.pool_size = np.array(sizes, dtype=np.int64)
+
+    def _build_accounts(self):
+        """Authors with heavy-tailed follower counts"""
+        np = self.np
+        rng = np.random.default_rng([self.seed, 0])
+        n = self.num_accounts
+        self.account_followers = rng.lognormal(mean=6.0, sigma=2.0, size=n).astype(np.int64)
+        self.account_following = rng.lognormal(mean=5.0, sigma=1.0, size=n).astype(np.int64)
+        self.account_verified = rng.random(n) < 0.02
+        self.account_engagement = np.clip(rng.lognormal(mean=-4.5, sigma=0.7, size=n), 0.0005, 0.5)
+        self.account_age_days = rng.integers(30, 5000, size=n)
+
+    def accounts(self):
+        """Follower metadata for every synthetic author"""
+        return [
+            {
+                'username': f"synthetic_{self.platform}_{i}",
+                'followers': int(self.account_followers[i]),
+                'following': int(self.account_following[i]),
+                'verified': bool(self.account_verified[i]),
+                'account_age_days': int(self.account_age_days[i])
+            }
+            for i in range(self.num_accounts)
+        ]
+
+    def _timestamps(self, rng, n):
+        np = self.np
+        if self.timestamp_distribution == 'uniform':
+            ago = rng.integers(0, self.span_us, size=n)
+        elif self.timestamp_distribution == 'recent':
+            ago = np.minimum(rng.exponential(self.span_us / 6, size=n), self.span_us - 1).astype(np.int64)
+        else:
+            # A handful of activity bursts, each lasting a few hours
+            centers = rng.integers(0, self.span_us, size=max(1, self.span_us // (86400 * 1_000_000 * 7)))
+            ago = centers[rng.integers(0, len(centers), size=n)] + rng.normal(0, 3 * 3600 * 1_000_000, size=n).astype(np.int64)
+            ago = np.clip(ago, 0, self.span_us - 1)
+        return self.end_us - ago
+
+    def generate_chunk(self, start, n, rng):
+        """Sample n posts as NumPy columns; post sequence numbers begin at start"""
+        np = self.np
+        category = rng.choice(len(self.categories), size=n, p=self.mix)
+        content_index = self.pool_start[category] + rng.integers(0, 1 << 31, size=n) % self.pool_size[category]
+
+        if self.duplicate_rate:
+            # Copy-paste posts reuse the text of another post in the chunk
+            duplicate = rng.random(n) < self.duplicate_rate
+            originals = np.flatnonzero(~duplicate)
+            if len(originals):
+                source = originals[rng.integers(0, len(originals), size=int(duplicate.sum()))]
+                content_index[duplicate] = content_index[source]
+                category[duplicate] = category[source]
+
+        author = rng.integers(0, self.num_accounts, size=n)
+        expected_likes = self.account_followers[author] * self.account_engagement[author]
+        likes = rng.poisson(expected_likes)
+        comments = rng.poisson(likes * 0.1)
+        if self.platform == 'reddit':
+            shares = np.zeros(n, dtype=np.int64)
+            awards = rng.poisson(likes / 2000.0)
+            subreddit = rng.integers(0, len(SUBREDDITS), size=n)
+        else:
+            shares = rng.poisson(likes * 0.05)
+            awards = None
+            subreddit = None
+
+        return {
+            'seq': np.arange(start, start + n, dtype=np.int64),
+            'category': category,
+            'content_index': content_index,
+            'author': author,
+            'timestamp': self._timestamps(rng, n),
+            'likes': likes.astype(np.int64),
+            'comments': comments.astype(np.int64),
+            'shares': shares.astype(np.int64),
+            'awards': None if awards is None else awards.astype(np.int64),
+            'subreddit': subreddit
+        }
+
+    def iter_chunks(self, total, chunk_size=100000):
+        """Yield column chunks covering total posts"""
+        np = self.np
+        seeds = np.random.SeedSequence([self.seed, 1])
+        start = 0
+        while start < total:
+            n = min(chunk_size, total - start)
+            rng = np.random.default_rng(seeds.spawn(1)[0])
+            yield self.generate_chunk(start, n, rng)
+            start += n
+
+    def _post_ids(self, chunk):
+        prefix = f"syn{self.seed}_{self.platform}_"
+        return [f"{prefix}{seq}" for seq in chunk['seq'].tolist()]
+
+    def _iso_timestamps(self, chunk):
+        np = self.np
+        return np.datetime_as_string(chunk['timestamp'].astype('datetime64[us]'), unit='us').tolist()
+
+    def iter_posts(self, total, chunk_size=100000):
+        """Yield post dicts shaped like simulated scrape posts"""
+        reddit = self.platform == 'reddit'
+        for chunk in self.iter_chunks(total, chunk_size):
+            rows = zip(
+                self._post_ids(chunk),
+                self.pool_content[chunk['content_index']].tolist(),
+                self._iso_timestamps(chunk),
+                chunk['likes'].tolist(),
+                chunk['comments'].tolist(),
+                chunk['shares'].tolist(),
+                chunk['awards'].tolist() if reddit else [None] * len(chunk['seq']),
+                chunk['subreddit'].tolist() if reddit else [None] * len(chunk['seq']),
+                chunk['author'].tolist()
+            )
+            for post_id, content, timestamp, likes, comments, shares, awards, subreddit, author in rows:
+                yield {
+                    'post_id': post_id,
+                    'content': content,
+                    'timestamp': timestamp,
+                    'likes': likes,
+                    'comments': comments,
+                    'shares': shares,
+                    'hashtags': [] if reddit else [f"#{word}" for word in content.split()[:2]],
+                    'subreddit': f"r/{SUBREDDITS[subreddit]}" if reddit else None,
+                    'awards': awards,
+                    'author': f"synthetic_{self.platform}_{author}"
+                }
+
+    def write_jsonl(self, path, total, chunk_size=100000):
+        """Stream posts to a JSON Lines file; returns the number written"""
+        reddit = self.platform == 'reddit'
+        written = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for chunk in self.iter_chunks(total, chunk_size):
+                # Content and hashtags come pre-encoded from the pools
+                content_json = self.pool_content_json[chunk['content_index']].tolist()
+                hashtags_json = ['[]'] * len(content_json) if reddit else self.pool_hashtags_json[chunk['content_index']].tolist()
+                if reddit:
+                    extra = [
+                        f'"r/{SUBREDDITS[s]}", "awards": {a}'
+                        for s, a in zip(chunk['subreddit'].tolist(), chunk['awards'].tolist())
+                    ]
+                else:
+                    extra = ['null, "awards": null'] * len(content_json)
+
+                f.writelines(
+                    f'{{"post_id": "{post_id}", "content": {content}, "timestamp": "{timestamp}", '
+                    f'"likes": {likes}, "comments": {comments}, "shares": {shares}, "hashtags": {hashtags}, '
+                    f'"subreddit": {reddit_fields}, "author": "synthetic_{self.platform}_{author}"}}\n'
+                    for post_id, content, timestamp, likes, comments, shares, hashtags, reddit_fields, author in zip(
+                        self._post_ids(chunk), content_json, self._iso_timestamps(chunk),
+                        chunk['likes'].tolist(), chunk['comments'].tolist(), chunk['shares'].tolist(),
+                        hashtags_json, extra, chunk['author'].tolist()
+                    )
+                )
+                written += len(content_json)
+        return written
+
+    def to_post_batch(self, total, chunk_size=100000):
+        """Build a PostBatch straight from the column chunks"""
+        np = self.np
+        reddit = self.platform == 'reddit'
+        columns = {name: array('q') for name in PostBatch.INT_FIELDS}
+        offsets = array('q', [0])
+        strings = bytearray()
+        flags = array('H')
+        row_flags = 0 if reddit else FLAG_NO_SUBREDDIT | FLAG_NO_AWARDS
+
+        for chunk in self.iter_chunks(total, chunk_size):
+            n = len(chunk['seq'])
+            for name in PostBatch.INT_FIELDS:
+                values = chunk[name] if chunk.get(name) is not None else np.zeros(n, dtype=np.int64)
+                columns[name].frombytes(np.ascontiguousarray(values, dtype=np.int64).tobytes())
+
+            contents = self.pool_content[chunk['content_index']].tolist()
+            if reddit:
+                subreddits = [f"r/{SUBREDDITS[s]}" for s in chunk['subreddit'].tolist()]
+                hashtags = [''] * n
+            else:
+                subreddits = [''] * n
+                hashtags = [encode_hashtags(h) for h in self.pool_hashtags[chunk['content_index']].tolist()]
+
+            # String slots are interleaved per row: post_id, content, subreddit, hashtags, timestamp_text
+            # (timestamp_text stays empty: rows render their micros in the canonical isoformat form)
+            encoded = [
+                value.encode('utf-8')
+                for row in zip(self._post_ids(chunk), contents, subreddits, hashtags, [''] * n)
+                for value in row
+            ]
+            lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+            offsets.frombytes((np.cumsum(lengths) + offsets[-1]).tobytes())
+            strings += b''.join(encoded)
+            flags.extend(array('H', [row_flags]) * n)
+
+        return PostBatch(columns=columns, offsets=offsets, strings=strings, flags=flags)
+
+    def write_columnar(self, folder, name, total, chunk_size=100000):
+        """Write posts in the post cache's memory-mappable format; returns the file path"""
+        os.makedirs(folder, exist_ok=True)
+        batch = self.to_post_batch(total, chunk_size)
+        return PostCache(cache_folder=folder).write(name, f"synthetic-{self.seed}", batch)
@@ -0,0 +1,208 @@
+"""
+Watchlist Scheduler
+Keeps watched cases fresh by queueing delta rescrapes (followed by analysis) as they fall due
+One process holds the whole schedule in a heap; workers from job_worker.py do the scraping
+"""
+
+import heapq
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from models.case import Case
+from models.job import Job
+from models.watchlist import Watchlist
+from services.job_service import JobService
+from services.rate_limiter import TokenBucket
+
+# Lower runs first when several entries are due at once
+RISK_PRIORITY = {
+    Case.RISK_CRITICAL: 0,
+    Case.RISK_HIGH: 1,
+    Case.RISK_MEDIUM: 2,
+    Case.RISK_LOW: 3
+}
+UNKNOWN_RISK_PRIORITY = 4
+
+
+class WatchlistScheduler:
+    """
+    Priority scheduler over the watchlist
+    Heap items are (next due, risk priority, version, case id); an entry's version changes
+    whenever it is rescheduled, so stale heap items are skipped instead of searched for
+    """
+
+    def __init__(self, app):
+        self.app = app
+        config = app.config
+        self.jitter = config.get('WATCHLIST_JITTER', 0.1)
+        self.sync_interval = config.get('WATCHLIST_SYNC_INTERVAL', 30)
+        self.tick_seconds = config.get('WATCHLIST_TICK_SECONDS', 1.0)
+        self.max_dispatch = config.get('WATCHLIST_MAX_DISPATCH_PER_TICK', 500)
+        self.stop_event = threading.Event()
+        self.heap = []
+        self.entries = {}
+        self.version = 0
+        self.last_sync = None
+        self.counters = {'dispatched': 0, 'deferred_rate_limit': 0, 'skipped_pending': 0}
+
+        # Scheduled rescrapes only get a share of each platform's API budget,
+        # leaving the rest for investigators' own scrapes
+        share = config.get('WATCHLIST_RATE_SHARE', 0.5)
+        calls = config.get('WATCHLIST_CALLS_PER_RESCRAPE', 2)
+        self.buckets = {
+            platform: TokenBucket(platform, max(1, limit['requests'] * share / calls), limit['period'])
+            for platform, limit in config.get('SCRAPE_RATE_LIMITS', {}).items()
+        }
+
+    def _priority(self, entry):
+        return RISK_PRIORITY.get(entry.get('risk_level'), UNKNOWN_RISK_PRIORITY)
+
+    def _push(self, case_id, due):
+        """(Re)schedule an entry; due is a unix timestamp"""
+        entry = self.entries[case_id]
+        self.version += 1
+        entry['version'] = self.version
+        entry['due'] = due
+        heapq.heappush(self.heap, (due, self._priority(entry), self.version, case_id))
+
+    def _jittered(self, seconds):
+        return seconds * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _load(self, entry, now):
+        case_id = entry['case_id']
+        if not entry.get('active'):
+            self.entries.pop(case_id, None)
+            return
+        due = entry['next_due_at'].replace(tzinfo=timezone.utc).timestamp() if entry.get('next_due_at') else now
+        if due < now:
+            # Overdue entries (e.g. after downtime) are spread over one jitter window instead of all firing at once
+            due = now + random.uniform(0, self.jitter * entry['interval_seconds'])
+        self.entries[case_id] = {
+            'user_id': entry['user_id'],
+            'platform': entry['platform'],
+            'interval_seconds': entry['interval_seconds'],
+            'risk_level': entry.get('risk_level'),
+            'last_job_id': entry.get('last_job_id')
+        }
+        self._push(case_id, due)
+
+    def sync(self):
+        """Load the whole watchlist on the first call, afterwards only entries changed since the last sync"""
+        started = datetime.utcnow()
+        now = time.time()
+        if self.last_sync is None:
+            changed = Watchlist.iter_schedule()
+        else:
+            # Overlap a little so writes racing the previous sync are not missed
+            changed = Watchlist.iter_schedule(changed_since=self.last_sync - timedelta(seconds=1))
+        for entry in changed:
+            self._load(entry, now)
+        if len(self.heap) > 2 * len(self.entries) + 1024:
+            self._compact()
+        self.last_sync = started
+
+    def _compact(self):
+        """Drop stale heap items left behind by rescheduled or removed entries"""
+        self.heap = [
+            item for item in self.heap
+            if item[3] in self.entries and self.entries[item[3]]['version'] == item[2]
+        ]
+        heapq.heapify(self.heap)
+
+    def _pop_due(self, now):
+        """
+        Pop up to max_dispatch live entries that are due, most urgent first
+        Everything due is considered so critical cases are not stuck behind a backlog of low-risk ones
+        """
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            item = heapq.heappop(self.heap)
+            entry = self.entries.get(item[3])
+            if entry is None or entry['version'] != item[2]:
+                continue
+            due.append(item)
+        due.sort(key=lambda item: (item[1], item[0]))
+
+        # The rest stay due and are picked up by the next tick
+        for item in due[self.max_dispatch:]:
+            heapq.heappush(self.heap, item)
+        return [item[3] for item in due[:self.max_dispatch]]
+
+    def tick(self):
+        """Queue jobs for every due entry the rate budget allows; returns the number queued"""
+        now = time.time()
+        due = self._pop_due(now)
+        if not due:
+            return 0
+
+        pending = Job.find_unfinished([
+            self.entries[case_id]['last_job_id'] for case_id in due if self.entries[case_id].get('last_job_id')
+        ])
+        dispatched = 0
+        scheduled = []
+        for case_id in due:
+            entry = self.entries[case_id]
+
+            if entry.get('last_job_id') in pending:
+                # The previous rescrape is still queued or running; check again next interval
+                self.counters['skipped_pending'] += 1
+                scheduled.append(self._reschedule(case_id, now + self._jittered(entry['interval_seconds'])))
+                continue
+
+            bucket = self.buckets.get(entry['platform'])
+            if bucket is not None and not bucket.try_acquire():
+                self.counters['deferred_rate_limit'] += 1
+                self._push(case_id, now + bucket.wait_time() + random.uniform(0, self.tick_seconds))
+                continue
+
+            # Only the case owner can watch a case, so the entry's user owns the job
+            job_id = JobService.enqueue(
+                Job.TYPE_SCRAPE, case_id, entry['user_id'],
+                payload={'delta': True, 'chain': [Job.TYPE_ANALYZE], 'watchlist': True}
+            )
+            entry['last_job_id'] = job_id
+            scheduled.append(self._reschedule(case_id, now + self._jittered(entry['interval_seconds']), job_id))
+            dispatched += 1
+
+        Watchlist.mark_scheduled(scheduled)
+        self.counters['dispatched'] += dispatched
+        return dispatched
+
+    def _reschedule(self, case_id, due, job_id=None):
+        """Push the entry's next run; returns the (case id, next due, job id) to persist"""
+        self._push(case_id, due)
+        return case_id, datetime.utcfromtimestamp(due), job_id
+
+    def stats(self):
+        return dict(
+            self.counters,
+            watched=len(self.entries),
+            heap_size=len(self.heap),
+            next_due_in=round(self.heap[0][0] - time.time(), 2) if self.heap else None,
+            rate_budget={platform: bucket.stats()['budget'] for platform, bucket in self.buckets.items()}
+        )
+
+    def run(self):
+        """Sync and dispatch until stop() is called"""
+        with self.app.app_context():
+            self.sync()
+            print(f"✅ Watchlist scheduler started with {len(self.entries)} watched cases")
+            next_sync = time.monotonic() + self.sync_interval
+            while not self.stop_event.is_set():
+                try:
+                    if time.monotonic() >= next_sync:
+                        self.sync()
+                        next_sync = time.monotonic() + self.sync_interval
+                    if self.tick():
+                        # More may be due right away; don't sleep a full tick
+                        continue
+                except Exception as e:
+                    print(f"⚠️  Watchlist scheduler error: {e}")
+                wait = self.tick_seconds
+                if self.heap:
+                    wait = min(wait, max(0.0, self.heap[0][0] - time.time()))
+                self.stop_event.wait(wait)
+
+    def stop(self):
+        self.stop_event.set()
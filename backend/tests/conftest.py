@@ -0,0 +1,44 @@
+"""
+Test fixtures
+Tests run against an in-memory MongoDB (mongomock), so no database server is needed
+
+    pip install pytest mongomock
+    python -m pytest tests
+"""
+
+import pytest
+from database import db
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """Fresh in-memory database behind db.get_collection"""
+    mongomock = pytest.importorskip('mongomock')
+    database = mongomock.MongoClient()['forensic_test']
+    monkeypatch.setattr(db, 'get_collection', lambda name: database[name])
+    return database
+
+
+@pytest.fixture
+def app(mongo, tmp_path):
+    from app import create_app
+    app = create_app()
+    app.config.update(
+        TESTING=True,
+        REPORT_FOLDER=str(tmp_path / 'reports'),
+        POST_CACHE_FOLDER=str(tmp_path / 'post_cache')
+    )
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def investigator(mongo):
+    """An approved investigator's user ID"""
+    from models.user import User
+    return str(mongo[User.COLLECTION].insert_one({
+        'email': 'investigator@agency.gov',
+        'full_name': 'Test Investigator',
+        'role': 'investigator',
+        'status': User.STATUS_APPROVED
+    }).inserted_id)
@@ -0,0 +1,49 @@
+"""Which errors count against a platform's circuit breaker"""
+
+import pytest
+from services.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CircuitOpen
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = _Response(status_code)
+
+
+def _fail(error):
+    def call():
+        try:
+            raise error
+        except Exception as e:
+            # Scrapers wrap SDK errors like this
+            raise Exception(f"scraping failed: {e}")
+    return call
+
+
+@pytest.fixture
+def registry():
+    registry = CircuitBreakerRegistry()
+    registry.failure_threshold = 3
+    return registry
+
+
+@pytest.mark.parametrize('error', [HTTPError(404), HTTPError(403), ValueError('user not found')])
+def test_account_errors_do_not_open_the_breaker(registry, error):
+    for _ in range(10):
+        with pytest.raises(Exception):
+            registry.call('twitter', _fail(error), budget=0)
+    assert registry.breaker('twitter').current_state() == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize('error', [HTTPError(503), ConnectionResetError('reset'), TimeoutError('timed out')])
+def test_platform_failures_open_the_breaker(registry, error):
+    for _ in range(3):
+        with pytest.raises(Exception):
+            registry.call('twitter', _fail(error), budget=0)
+    with pytest.raises(CircuitOpen):
+        registry.call('twitter', lambda: 'ok', budget=0)
@@ -0,0 +1,27 @@
+"""Delta rescrapes merge into paged snapshots"""
+
+from models.case import Case
+from models.case_post import CasePost
+from services.delta_scrape_service import DeltaScrapeService
+from services.scraper_service import ScraperService
+from services.snapshot_service import SnapshotService
+
+
+def test_delta_on_inline_base_is_stored_paged(app, mongo, investigator):
+    case_id = Case.create(investigator, 'target', 'twitter')
+    base = ScraperService().scrape_profile('twitter', 'target', use_cache=False)
+    base_ids = [post['post_id'] for post in base['posts']]
+    SnapshotService.store(case_id, base)
+
+    for _ in range(3):
+        snapshot, evidence_hash = DeltaScrapeService().scrape_case_delta(Case.find_by_id(case_id))
+        assert evidence_hash
+
+    case = Case.find_by_id(case_id)
+    latest = case['data_collected'][-1]
+    # Only the first snapshot keeps its posts inline
+    assert [len(item.get('posts') or []) for item in case['data_collected']] == [len(base_ids), 0, 0, 0]
+    stored = [post['post_id'] for post in CasePost.iter_snapshot_posts(case_id, latest['snapshot_id'])]
+    assert len(stored) == latest['posts_stored']
+    assert stored[-len(base_ids):] == base_ids
+    assert case['evidence_hash'] == evidence_hash
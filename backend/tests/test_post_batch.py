@@ -0,0 +1,44 @@
+"""PostBatch and the post cache convert back to exactly the posts they were built from"""
+
+import pytest
+from services.post_cache import PostCache
+from utils.hash_utils import generate_evidence_hash
+from utils.post_batch import PostBatch
+
+POSTS = [
+    {'post_id': 1234567890123, 'content': 'utc', 'timestamp': '2024-03-01T10:00:00+00:00',
+     'likes': 5, 'comments': 0, 'shares': 1, 'hashtags': ['a', 'b']},
+    {'post_id': 'ist', 'content': 'offset', 'timestamp': '2024-03-01T15:30:00.250000+05:30',
+     'likes': 0, 'comments': 2, 'shares': 0, 'hashtags': ['']},
+    {'post_id': 'zulu', 'content': 'z suffix', 'timestamp': '2024-03-01T10:00:00Z',
+     'likes': None, 'comments': None, 'shares': None, 'hashtags': []},
+    {'post_id': 'naive', 'content': '', 'timestamp': '2024-03-01T10:00:00.500000',
+     'likes': 3, 'comments': 4, 'shares': 5, 'hashtags': ['x\x1fy', '', 'ünï']},
+    {'post_id': 'reddit', 'content': 'r', 'timestamp': None, 'likes': 1, 'comments': 1, 'shares': 0,
+     'hashtags': [], 'subreddit': 'r/test', 'awards': None},
+    {'post_id': 'reddit-2', 'content': 'r', 'timestamp': '2024-03-01T10:00:00-08:00', 'likes': 0,
+     'comments': 0, 'shares': 0, 'hashtags': [], 'subreddit': None, 'awards': 2}
+]
+
+
+def test_round_trip_keeps_every_value():
+    assert PostBatch.from_dicts(POSTS).to_dicts() == POSTS
+
+
+@pytest.mark.parametrize('field, value', [
+    ('timestamp', '2024-03-01T15:30:00.250000+05:30'),
+    ('hashtags', ['']),
+    ('likes', None)
+])
+def test_round_trip_edge_cases(field, value):
+    post = dict(POSTS[0], **{field: value})
+    assert PostBatch.from_dicts([post])[0][field] == value
+
+
+def test_evidence_hash_survives_the_post_cache(tmp_path):
+    cache = PostCache(cache_folder=str(tmp_path))
+    cache.write('case', 'hash', POSTS)
+    loaded = cache.load('case', 'hash')
+    assert loaded.readonly
+    assert loaded.to_dicts() == POSTS
+    assert generate_evidence_hash({'posts': loaded.to_dicts()}) == generate_evidence_hash({'posts': POSTS})
@@ -0,0 +1,56 @@
+"""Rate limiter retries and rate-limit header handling"""
+
+import time
+import pytest
+from services.platform_clients import PlatformClientRegistry
+from services.rate_limiter import RateLimiter, RateLimitTimeout
+
+
+class _Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = _Response(status_code, headers)
+
+
+@pytest.fixture
+def limiter():
+    limiter = RateLimiter()
+    limiter.base_delay = 5
+    return limiter
+
+
+def _failing(error):
+    def call():
+        raise error
+    return call
+
+
+def test_outage_past_deadline_raises_the_original_error(limiter):
+    with pytest.raises(HTTPError) as raised:
+        limiter.call('twitter', _failing(HTTPError(503)), deadline=time.monotonic() + 1)
+    assert raised.value.response.status_code == 503
+
+
+def test_throttling_past_deadline_raises_rate_limit_timeout(limiter):
+    error = HTTPError(429, {'Retry-After': '30'})
+    with pytest.raises(RateLimitTimeout):
+        limiter.call('twitter', _failing(error), deadline=time.monotonic() + 1)
+
+
+def test_success_headers_shrink_the_bucket(limiter, monkeypatch):
+    import services.platform_clients as platform_clients
+    monkeypatch.setattr(platform_clients, 'rate_limiter', limiter)
+    registry = PlatformClientRegistry()
+    registry._config = {'TWITTER_BEARER_TOKEN': 'token'}
+
+    observe = registry._observe_rate_limits('twitter')
+    observe(_Response(200, {'x-rate-limit-remaining': '3', 'x-rate-limit-reset': '60'}))
+
+    credential = platform_clients.credential_key('token')
+    assert limiter.bucket('twitter', credential).stats()['budget'] <= 3
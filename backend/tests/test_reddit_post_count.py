@@ -0,0 +1,65 @@
+"""Reddit profile scrapes return after the first posts and finish the submission count in the background"""
+
+import threading
+from types import SimpleNamespace
+from models.post_count import PostCount
+from services.scraper_service import ScraperService
+
+SUBMISSIONS = 250
+
+
+class FakeSubmissions:
+    """Newest-first listing of SUBMISSIONS submissions paged by 'after' fullnames"""
+
+    def __init__(self):
+        self.items = [
+            SimpleNamespace(
+                id=f"s{i}", fullname=f"t3_s{i}", created_utc=1700000000 - i * 60, title=f"post {i}",
+                selftext='', score=i, num_comments=0, total_awards_received=0,
+                subreddit=SimpleNamespace(display_name='test')
+            )
+            for i in range(SUBMISSIONS)
+        ]
+        self.requested = 0
+
+    def new(self, limit, params):
+        start = 0
+        if params.get('after'):
+            start = next(i for i, item in enumerate(self.items) if item.fullname == params['after']) + 1
+        page = self.items[start:start + limit]
+        self.requested += len(page)
+        return page
+
+
+def _service(submissions):
+    redditor = SimpleNamespace(name='target', created_utc=1500000000, is_gold=False, is_mod=False,
+                               submissions=submissions)
+    service = ScraperService()
+    service.reddit_client = SimpleNamespace(redditor=lambda username: redditor, auth=SimpleNamespace(limits={}))
+    return service
+
+
+def _wait_for_background_counts():
+    for thread in threading.enumerate():
+        if thread.name.startswith('reddit-count-'):
+            thread.join(timeout=10)
+
+
+def test_profile_scrape_reports_partial_count_and_finishes_it_later(app):
+    submissions = FakeSubmissions()
+    data = _service(submissions)._scrape_reddit_real('target')
+
+    assert len(data['posts']) == 20
+    assert data['metadata']['total_posts_estimate'] == '≥20'
+    assert data['metadata']['total_posts_capped']
+
+    _wait_for_background_counts()
+    assert submissions.requested == SUBMISSIONS
+    cached = PostCount.find('reddit', 'target')
+    assert cached['count'] == SUBMISSIONS and not cached['capped']
+    # The returned snapshot keeps the partial count it was stored with
+    assert data['metadata']['total_posts'] == 20
+
+    # The next scrape reads the cached total
+    again = _service(FakeSubmissions())._scrape_reddit_real('target')
+    assert again['metadata']['total_posts_estimate'] == str(SUBMISSIONS)
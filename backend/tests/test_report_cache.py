@@ -0,0 +1,38 @@
+"""Only reports small enough to be cached are rendered in memory"""
+
+import pytest
+from PyPDF2 import PdfReader
+from models.case import Case
+from services.report_cache import REPORT_BASE_BYTES, REPORT_ROW_BYTES, ReportCache
+from services.report_service import ReportService
+from services.snapshot_service import SnapshotService
+
+
+def _case(investigator, post_count):
+    case_id = Case.create(investigator, 'target', 'twitter')
+    posts = [
+        {'post_id': str(i), 'content': f'post {i}', 'timestamp': '2024-03-01T10:00:00',
+         'likes': i, 'comments': 0, 'shares': 0, 'hashtags': []}
+        for i in range(post_count)
+    ]
+    SnapshotService.store(case_id, {'posts': posts, 'metadata': {}})
+    return Case.find_by_id(case_id, include_posts=False)
+
+
+@pytest.mark.parametrize('post_count, rendered_in_memory', [(5, True), (40, False)])
+def test_oversized_reports_are_encrypted_while_rendering(app, investigator, monkeypatch, post_count, rendered_in_memory):
+    # Entries up to the estimated size of a 10-row report are cacheable
+    cache = ReportCache(max_bytes=4 * (REPORT_BASE_BYTES + 10 * REPORT_ROW_BYTES))
+    service = ReportService(cache=cache)
+    renders = []
+    render = service._render
+    monkeypatch.setattr(service, '_render', lambda story: renders.append(story) or render(story))
+
+    report = service.generate_pdf_report(_case(investigator, post_count), 'secret')
+
+    assert bool(renders) == rendered_in_memory
+    assert cache.stats()['entries'] == int(rendered_in_memory)
+    reader = PdfReader(report['file_path'])
+    assert reader.is_encrypted
+    reader.decrypt('secret')
+    assert len(reader.pages) >= 2
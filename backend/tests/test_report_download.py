@@ -0,0 +1,58 @@
+"""Reports are fetched with GET from a signed link issued after the password check"""
+
+import pytest
+from flask_jwt_extended import create_access_token
+from models.case import Case
+from services.case_pipeline import CasePipeline
+from services.snapshot_service import SnapshotService
+
+PASSWORD = 'report-password'
+
+
+@pytest.fixture
+def report_id(app, investigator):
+    case_id = Case.create(investigator, 'target', 'twitter')
+    posts = [
+        {'post_id': str(i), 'content': f'post {i}', 'timestamp': '2024-03-01T10:00:00',
+         'likes': i, 'comments': 0, 'shares': 0, 'hashtags': []}
+        for i in range(50)
+    ]
+    SnapshotService.store(case_id, {'posts': posts, 'metadata': {}})
+    report_id, _ = CasePipeline.generate_report(Case.find_by_id(case_id, include_posts=False), investigator, PASSWORD)
+    return report_id
+
+
+def _download_url(client, report_id, investigator, password=PASSWORD):
+    headers = {'Authorization': f"Bearer {create_access_token(identity=investigator)}"}
+    return client.post(f"/api/reports/{report_id}/download", json={'decryption_password': password}, headers=headers)
+
+
+def test_get_resumes_with_a_range(app, report_id, investigator):
+    client = app.test_client()
+    issued = _download_url(client, report_id, investigator)
+    assert issued.status_code == 200
+    url = issued.get_json()['download_url']
+
+    full = client.get(url)
+    assert full.status_code == 200
+    etag = full.headers['ETag']
+    body = full.get_data()
+    assert body.startswith(b'%PDF')
+
+    resumed = client.get(url, headers={'Range': 'bytes=100-', 'If-Range': etag})
+    assert resumed.status_code == 206
+    assert resumed.headers['Content-Range'] == f"bytes 100-{len(body) - 1}/{len(body)}"
+    assert resumed.get_data() == body[100:]
+
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_get_needs_a_valid_token(app, report_id, investigator):
+    client = app.test_client()
+    assert _download_url(client, report_id, investigator, password='wrong').status_code == 403
+    assert client.get(f"/api/reports/{report_id}/download").status_code == 403
+    assert client.get(f"/api/reports/{report_id}/download?token=forged").status_code == 403
+
+    url = _download_url(client, report_id, investigator).get_json()['download_url']
+    app.config['REPORT_DOWNLOAD_TOKEN_TTL'] = -1
+    assert client.get(url).status_code == 403
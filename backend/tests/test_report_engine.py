@@ -0,0 +1,45 @@
+"""Streamed reports stay valid PDFs for the pinned reportlab version"""
+
+from datetime import datetime
+from io import BytesIO
+from PyPDF2 import PdfReader
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate
+from services.report_cache import ReportCache
+from services.report_engine import StreamingCanvas
+from services.report_service import ReportService
+
+CASE = {
+    '_id': 'case', 'target_username': 'target', 'platform': 'twitter', 'status': 'completed',
+    'created_at': '2024-03-01', 'evidence_hash': 'hash', 'analysis_results': {}
+}
+POSTS = [
+    {'post_id': str(i), 'content': f'post {i} ' * 12, 'timestamp': '2024-03-01T10:00:00',
+     'likes': i, 'comments': 0, 'shares': 0, 'hashtags': []}
+    for i in range(600)
+]
+
+
+def _render(canvasmaker):
+    service = ReportService(cache=ReportCache(max_bytes=0))
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=letter).build(service._build_story(CASE, POSTS, datetime(2024, 3, 2)), canvasmaker=canvasmaker)
+    return PdfReader(BytesIO(buffer.getvalue()))
+
+
+def _fonts(page):
+    return {font.get_object()['/BaseFont'] for font in page['/Resources']['/Font'].values()}
+
+
+def test_streamed_report_matches_plain_canvas(app):
+    streamed = _render(StreamingCanvas)
+    plain = _render(canvas.Canvas)
+
+    assert len(streamed.pages) > 10
+    assert len(streamed.pages) == len(plain.pages)
+    for streamed_page, plain_page in zip(streamed.pages, plain.pages):
+        assert {'/Helvetica', '/Helvetica-Bold', '/Courier'} <= _fonts(streamed_page)
+        assert _fonts(streamed_page) == _fonts(plain_page)
+        assert streamed_page.extract_text() == plain_page.extract_text()
+    assert 'post 599' in streamed.pages[-2].extract_text() + streamed.pages[-1].extract_text()
@@ -0,0 +1,35 @@
+"""Scrape cache single-flight coalescing with a bounded set of locks"""
+
+import threading
+import time
+from services.scrape_cache import LOCK_STRIPES, ScrapeCache
+
+
+def test_concurrent_misses_fetch_once(tmp_path):
+    cache = ScrapeCache(cache_folder=str(tmp_path), ttl=60)
+    calls = []
+
+    def fetch(platform, username):
+        calls.append(username)
+        time.sleep(0.05)
+        return {'username': username, 'posts': []}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_fetch('twitter', 'Target', fetch)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ['Target']
+    assert sorted(hit for _, hit in results) == [False] + [True] * 7
+
+
+def test_locks_do_not_grow_with_keys():
+    cache = ScrapeCache()
+    locks = {id(cache._thread_lock(ScrapeCache.make_key('reddit', f"user{i}"))) for i in range(10000)}
+    assert len(locks) == LOCK_STRIPES
+    assert len(ScrapeCache._locks) == LOCK_STRIPES
@@ -0,0 +1,53 @@
+"""Watchlist scheduler dispatch under its rate budget"""
+
+import time
+from datetime import datetime, timedelta
+from models.case import Case
+from models.job import Job
+from models.watchlist import Watchlist
+from services.rate_limiter import TokenBucket
+from services.watchlist_scheduler import WatchlistScheduler
+
+
+def _due_entry(mongo, investigator):
+    case = Case.find_by_id(Case.create(investigator, 'target', 'twitter'))
+    Watchlist.watch(case, investigator, 3600)
+    mongo[Watchlist.COLLECTION].update_one(
+        {'case_id': case['_id']}, {'$set': {'next_due_at': datetime.utcnow() - timedelta(seconds=5)}}
+    )
+    return case
+
+
+def test_due_entry_with_full_bucket_queues_rescrape(app, mongo, investigator):
+    app.config['WATCHLIST_JITTER'] = 0
+    case = _due_entry(mongo, investigator)
+    scheduler = WatchlistScheduler(app)
+    scheduler.sync()
+
+    assert scheduler.tick() == 1
+    jobs = list(mongo[Job.COLLECTION].find({'case_id': case['_id']}))
+    assert len(jobs) == 1
+    assert jobs[0]['type'] == Job.TYPE_SCRAPE
+    assert jobs[0]['payload']['delta'] is True
+    assert scheduler.counters['deferred_rate_limit'] == 0
+
+
+def test_due_entry_with_empty_bucket_is_deferred(app, mongo, investigator):
+    app.config['WATCHLIST_JITTER'] = 0
+    _due_entry(mongo, investigator)
+    scheduler = WatchlistScheduler(app)
+    scheduler.buckets['twitter'].tokens = 0
+    scheduler.sync()
+
+    assert scheduler.tick() == 0
+    assert scheduler.counters['deferred_rate_limit'] == 1
+    assert mongo[Job.COLLECTION].count_documents({}) == 0
+    assert scheduler.heap[0][0] > time.time()
+
+
+def test_try_acquire_never_waits():
+    bucket = TokenBucket('twitter', 2, 60)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert 0 < bucket.wait_time() <= 30
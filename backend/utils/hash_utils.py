@@ -6,6 +6,9 @@ Provides hashing functions for evidence integrity and password verification
 import hashlib
 import json
 
+# Report files are hashed per chunk as well, so any byte range can be verified on its own
+INTEGRITY_CHUNK_SIZE = 256 * 1024
+
 def generate_evidence_hash(data):
     """
     Generate SHA-256 hash for evidence integrity
@@ -19,6 +22,19 @@ def generate_evidence_hash(data):
     
     return sha256_hash
 
+def generate_stream_evidence_hash(header, posts):
+    """
+    Generate SHA-256 hash for a snapshot whose posts are stored separately
+    Hashes the header and then each post in order, so posts can come from a cursor
+    """
+    sha256_hash = hashlib.sha256(json.dumps(header, sort_keys=True).encode('utf-8'))
+    
+    for post in posts:
+        sha256_hash.update(b'\n')
+        sha256_hash.update(json.dumps(post, sort_keys=True).encode('utf-8'))
+    
+    return sha256_hash.hexdigest()
+
 def verify_evidence_hash(data, stored_hash):
     """Verify evidence integrity by comparing hashes"""
     current_hash = generate_evidence_hash(data)
@@ -44,3 +60,39 @@ def generate_file_hash(file_path):
         return sha256_hash.hexdigest()
     except FileNotFoundError:
         return None
+
+class ChunkedHasher:
+    """SHA-256 of a whole stream plus one SHA-256 per INTEGRITY_CHUNK_SIZE chunk"""
+    
+    def __init__(self, chunk_size=INTEGRITY_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.sha256 = hashlib.sha256()
+        self.chunk_hashes = []
+        self.size = 0
+        self._chunk = hashlib.sha256()
+        self._chunk_fill = 0
+    
+    def update(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        view = memoryview(data)
+        while view:
+            take = min(len(view), self.chunk_size - self._chunk_fill)
+            self._chunk.update(view[:take])
+            self._chunk_fill += take
+            view = view[take:]
+            if self._chunk_fill == self.chunk_size:
+                self.chunk_hashes.append(self._chunk.hexdigest())
+                self._chunk = hashlib.sha256()
+                self._chunk_fill = 0
+    
+    def hexdigest(self):
+        return self.sha256.hexdigest()
+    
+    def finish(self):
+        """Chunk hashes including the last, partial chunk"""
+        if self._chunk_fill:
+            self.chunk_hashes.append(self._chunk.hexdigest())
+            self._chunk = hashlib.sha256()
+            self._chunk_fill = 0
+        return self.chunk_hashes
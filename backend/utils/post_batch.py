@@ -0,0 +1,259 @@
+"""
+Post Batch
+Compact columnar storage for scraped posts
+Numeric fields live in typed int64 arrays and all strings share one UTF-8 buffer
+Rows convert back to exactly the post dicts they were built from, so evidence hashes match
+"""
+
+import json
+from array import array
+from collections.abc import Mapping
+from datetime import datetime, timedelta, timezone
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Per-post flag bits (16-bit row flags)
+FLAG_INT_POST_ID = 1          # post_id was an integer (Twitter IDs)
+FLAG_TZ_AWARE = 2             # timestamp carried a UTC offset
+FLAG_NO_TIMESTAMP = 4         # timestamp was missing
+FLAG_NO_SUBREDDIT = 8         # subreddit was None
+FLAG_NO_AWARDS = 16           # awards was None
+FLAG_NO_REDDIT_KEYS = 32      # subreddit/awards keys were absent altogether
+FLAG_NO_LIKES = 64            # likes was None
+FLAG_NO_COMMENTS = 128        # comments was None
+FLAG_NO_SHARES = 256          # shares was None
+FLAG_RAW_TIMESTAMP = 512      # timestamp string is kept verbatim (it does not round-trip through micros)
+
+# Count columns and the flag marking them None
+NULLABLE_COUNTS = {'likes': FLAG_NO_LIKES, 'comments': FLAG_NO_COMMENTS, 'shares': FLAG_NO_SHARES}
+
+
+def timestamp_to_micros(value):
+    """Convert an ISO-8601 string or datetime to (UTC microseconds, tz_aware)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    tz_aware = value.tzinfo is not None
+    if tz_aware:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND, tz_aware
+
+
+def encode_hashtags(hashtags):
+    """Pack a post's hashtags into one string slot (empty for no hashtags)"""
+    if not hashtags:
+        return ''
+    return json.dumps(list(hashtags), ensure_ascii=False, separators=(',', ':'))
+
+
+def decode_hashtags(value):
+    return json.loads(value) if value else []
+
+
+def micros_to_isoformat(micros, tz_aware=False):
+    """Convert UTC microseconds back to the ISO-8601 string used in post dicts"""
+    value = _EPOCH + timedelta(microseconds=micros)
+    if tz_aware:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat()
+
+
+class PostView(Mapping):
+    """Read-only dict-like view of a single row in a PostBatch"""
+
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch, index):
+        self._batch = batch
+        self._index = index
+
+    def _keys(self):
+        if self._batch.flags_at(self._index) & FLAG_NO_REDDIT_KEYS:
+            return PostBatch.BASE_FIELDS
+        return PostBatch.FIELDS
+
+    def __getitem__(self, key):
+        if key not in self._keys():
+            raise KeyError(key)
+        return self._batch.value_at(self._index, key)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def __repr__(self):
+        return f"PostView({self.to_dict()!r})"
+
+    def to_dict(self):
+        """Materialize this row as a regular post dict"""
+        return {key: self[key] for key in self._keys()}
+
+
+class PostBatch:
+    """Columnar container for posts with zero-copy row views"""
+
+    BASE_FIELDS = ('post_id', 'content', 'timestamp', 'likes', 'comments', 'shares', 'hashtags')
+    FIELDS = BASE_FIELDS + ('subreddit', 'awards')
+
+    INT_FIELDS = ('timestamp', 'likes', 'comments', 'shares', 'awards')
+    # timestamp_text is empty unless FLAG_RAW_TIMESTAMP is set
+    STRING_FIELDS = ('post_id', 'content', 'subreddit', 'hashtags', 'timestamp_text')
+
+    def __init__(self, columns=None, offsets=None, strings=None, flags=None):
+        """
+        Create an empty batch, or wrap existing buffers (e.g. memory-mapped ones)
+        Wrapped memoryview buffers make the batch read-only
+        """
+        if columns is None:
+            columns = {name: array('q') for name in self.INT_FIELDS}
+        self._columns = columns
+        # One offset per string slot boundary: row * len(STRING_FIELDS) + field
+        self._offsets = offsets if offsets is not None else array('q', [0])
+        self._strings = strings if strings is not None else bytearray()
+        self._flags = flags if flags is not None else array('H')
+
+    @classmethod
+    def from_dicts(cls, posts):
+        """Build a batch from a list of post dicts"""
+        batch = cls()
+        batch.extend(posts)
+        return batch
+
+    @property
+    def readonly(self):
+        return isinstance(self._flags, memoryview)
+
+    def append(self, post):
+        """Append a post dict to the batch"""
+        if self.readonly:
+            raise TypeError("PostBatch is backed by read-only buffers")
+
+        flags = 0
+        post_id = post.get('post_id')
+        if isinstance(post_id, int) and not isinstance(post_id, bool):
+            flags |= FLAG_INT_POST_ID
+
+        timestamp = post.get('timestamp')
+        timestamp_text = ''
+        if timestamp is None:
+            flags |= FLAG_NO_TIMESTAMP
+            micros = 0
+        else:
+            micros, tz_aware = timestamp_to_micros(timestamp)
+            if tz_aware:
+                flags |= FLAG_TZ_AWARE
+            # Other offsets, 'Z' or unusual precision would not come back from micros unchanged
+            if isinstance(timestamp, str) and micros_to_isoformat(micros, tz_aware) != timestamp:
+                flags |= FLAG_RAW_TIMESTAMP
+                timestamp_text = timestamp
+
+        if 'subreddit' not in post and 'awards' not in post:
+            flags |= FLAG_NO_REDDIT_KEYS | FLAG_NO_SUBREDDIT | FLAG_NO_AWARDS
+        else:
+            if post.get('subreddit') is None:
+                flags |= FLAG_NO_SUBREDDIT
+            if post.get('awards') is None:
+                flags |= FLAG_NO_AWARDS
+
+        columns = self._columns
+        columns['timestamp'].append(micros)
+        for field, flag in NULLABLE_COUNTS.items():
+            value = post.get(field)
+            if value is None:
+                flags |= flag
+            columns[field].append(value or 0)
+        columns['awards'].append(post.get('awards') or 0)
+
+        for value in (
+            '' if post_id is None else str(post_id),
+            post.get('content') or '',
+            post.get('subreddit') or '',
+            encode_hashtags(post.get('hashtags')),
+            timestamp_text
+        ):
+            self._strings += value.encode('utf-8')
+            self._offsets.append(len(self._strings))
+
+        self._flags.append(flags)
+
+    def extend(self, posts):
+        """Append several post dicts"""
+        for post in posts:
+            self.append(post)
+
+    def __len__(self):
+        return len(self._flags)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [PostView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PostBatch index out of range")
+        return PostView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield PostView(self, index)
+
+    def flags_at(self, index):
+        return self._flags[index]
+
+    def string_at(self, index, field):
+        """Decode one string field of a row straight from the shared buffer"""
+        slot = index * len(self.STRING_FIELDS) + self.STRING_FIELDS.index(field)
+        start, end = self._offsets[slot], self._offsets[slot + 1]
+        return str(memoryview(self._strings)[start:end], 'utf-8')
+
+    def value_at(self, index, field):
+        """Return a field value in the same shape the post dicts use"""
+        flags = self._flags[index]
+
+        if field == 'timestamp':
+            if flags & FLAG_NO_TIMESTAMP:
+                return None
+            if flags & FLAG_RAW_TIMESTAMP:
+                return self.string_at(index, 'timestamp_text')
+            return micros_to_isoformat(self._columns['timestamp'][index], bool(flags & FLAG_TZ_AWARE))
+        if field == 'post_id':
+            post_id = self.string_at(index, 'post_id')
+            return int(post_id) if flags & FLAG_INT_POST_ID else post_id
+        if field == 'hashtags':
+            return decode_hashtags(self.string_at(index, 'hashtags'))
+        if field in NULLABLE_COUNTS and flags & NULLABLE_COUNTS[field]:
+            return None
+        if field == 'subreddit':
+            return None if flags & FLAG_NO_SUBREDDIT else self.string_at(index, 'subreddit')
+        if field == 'awards':
+            return None if flags & FLAG_NO_AWARDS else self._columns['awards'][index]
+        if field in self._columns:
+            return self._columns[field][index]
+        return self.string_at(index, field)
+
+    def column(self, name):
+        """Return a numeric column (timestamps are UTC microseconds) without copying"""
+        return self._columns[name]
+
+    def to_dicts(self):
+        """Convert back to the list-of-dicts format used by the rest of the app"""
+        return [view.to_dict() for view in self]
+
+    def buffers(self):
+        """Expose the raw buffers, e.g. for writing the batch to disk"""
+        return {
+            'columns': self._columns,
+            'offsets': self._offsets,
+            'strings': self._strings,
+            'flags': self._flags
+        }
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the batch buffers"""
+        total = len(self._strings) + len(self._flags)
+        total += len(self._offsets) * 8
+        total += sum(len(column) * 8 for column in self._columns.values())
+        return total
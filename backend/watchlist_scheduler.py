@@ -0,0 +1,19 @@
+"""
+Watchlist Scheduler Script
+Queues scheduled delta rescrapes and analyses for watched cases
+Run a single instance; job_worker.py processes execute the queued jobs
+"""
+
+from app import create_app
+from services.watchlist_scheduler import WatchlistScheduler
+
+def main():
+    scheduler = WatchlistScheduler(create_app())
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        scheduler.stop()
+        print(f"ℹ️  Watchlist scheduler stopped: {scheduler.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -105,26 +105,24 @@ const CaseDetails = () => {
       // Automatically download the report
       console.log('Downloading report:', generatedReportId)
       
+      // The password check returns a short-lived link the browser downloads (and can resume) itself
       const downloadResponse = await axios.post(
         `/api/reports/${generatedReportId}/download`,
         { decryption_password: reportPassword },
         {
           headers: {
             'Authorization': `Bearer ${token}`
-          },
-          responseType: 'blob' // Important for file download
+          }
         }
       )
       
       // Create download link
-      const url = window.URL.createObjectURL(new Blob([downloadResponse.data]))
       const link = document.createElement('a')
-      link.href = url
+      link.href = downloadResponse.data.download_url
       link.setAttribute('download', `forensic_report_${caseId}.pdf`)
       document.body.appendChild(link)
       link.click()
       link.remove()
-      window.URL.revokeObjectURL(url)
       
       alert('Report generated and downloaded successfully!')
       setShowReportModal(false)